@@ -0,0 +1,7 @@
+-- Images uploaded directly to storage stay 'pending' until the images worker
+-- processes them (transcoding, blurhash) and marks them 'ready'.
+\c feeds;
+
+ALTER TABLE images ADD COLUMN IF NOT EXISTS status VARCHAR(16) NOT NULL DEFAULT 'ready';
+
+CREATE INDEX IF NOT EXISTS ix_images_pending ON images (image_id) WHERE status = 'pending';
@@ -0,0 +1,8 @@
+-- Content-hash deduplication: repeated uploads of the same file reuse
+-- the stored object and blurhash of the first one.
+\c feeds;
+
+ALTER TABLE images ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+
+CREATE INDEX IF NOT EXISTS ix_images_content_hash ON images (content_hash)
+    WHERE content_hash IS NOT NULL AND status = 'ready';
@@ -0,0 +1,6 @@
+-- Downscaled width variants of processed images: [{"width": ..., "url": ...}]
+-- ordered by width. JSON (not JSONB) keeps keys order as written, so feed JSON
+-- rendered in SQL matches the API response schema.
+\c feeds;
+
+ALTER TABLE images ADD COLUMN IF NOT EXISTS variants JSON NOT NULL DEFAULT '[]';
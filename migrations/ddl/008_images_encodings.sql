@@ -0,0 +1,5 @@
+-- Encodings of processed images in modern formats, keyed by format:
+-- {"webp": {"url": ..., "variants": [{"width": ..., "url": ...}]}}
+\c feeds;
+
+ALTER TABLE images ADD COLUMN IF NOT EXISTS encodings JSON NOT NULL DEFAULT '{}';
@@ -0,0 +1,16 @@
+-- 64-bit perceptual hash (dHash) of processed images for near-duplicate search.
+-- Multi-index hashing: one index per 16-bit chunk of the hash. A hash within
+-- Hamming distance d of the query matches at least one query chunk within
+-- d / 4 bits, candidates found by chunks are filtered by the full distance.
+\c feeds;
+
+ALTER TABLE images ADD COLUMN IF NOT EXISTS perceptual_hash BIGINT;
+
+CREATE INDEX IF NOT EXISTS ix_images_perceptual_hash_0 ON images (((perceptual_hash >> 48) & 65535))
+    WHERE perceptual_hash IS NOT NULL;
+CREATE INDEX IF NOT EXISTS ix_images_perceptual_hash_1 ON images (((perceptual_hash >> 32) & 65535))
+    WHERE perceptual_hash IS NOT NULL;
+CREATE INDEX IF NOT EXISTS ix_images_perceptual_hash_2 ON images (((perceptual_hash >> 16) & 65535))
+    WHERE perceptual_hash IS NOT NULL;
+CREATE INDEX IF NOT EXISTS ix_images_perceptual_hash_3 ON images ((perceptual_hash & 65535))
+    WHERE perceptual_hash IS NOT NULL;
@@ -0,0 +1,16 @@
+-- Statistics of the 16-bit chunks of perceptual hashes. Postgres does not use statistics
+-- of partial index expressions, so without these near-duplicate lookups are planned
+-- with the default selectivity: thousands of times more candidates than there are,
+-- and parallel workers started for every query.
+\c feeds;
+
+CREATE STATISTICS IF NOT EXISTS st_images_perceptual_hash_0 ON ((perceptual_hash >> 48) & 65535)
+    FROM images;
+CREATE STATISTICS IF NOT EXISTS st_images_perceptual_hash_1 ON ((perceptual_hash >> 32) & 65535)
+    FROM images;
+CREATE STATISTICS IF NOT EXISTS st_images_perceptual_hash_2 ON ((perceptual_hash >> 16) & 65535)
+    FROM images;
+CREATE STATISTICS IF NOT EXISTS st_images_perceptual_hash_3 ON (perceptual_hash & 65535)
+    FROM images;
+
+ANALYZE images;
@@ -0,0 +1,7 @@
+-- Images the images worker cannot process are 'failed' and will never be ready.
+-- The worker sweeps images pending for too long, oldest first: they are queued again
+-- or, once their upload can no longer be completed, marked 'failed'.
+\c feeds;
+
+CREATE INDEX IF NOT EXISTS ix_images_pending_uploaded_at ON images (uploaded_at)
+    WHERE status = 'pending';
@@ -0,0 +1,5 @@
+-- Stored files of an image change when it is processed: by the images worker or by
+-- reprocessing. processed_at versions images resized on demand, their cache keys and ETags.
+\c feeds;
+
+ALTER TABLE images ADD COLUMN IF NOT EXISTS processed_at TIMESTAMPTZ NOT NULL DEFAULT now();
@@ -5,7 +5,7 @@ import uuid
 from domain.entities import images as images_entities
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class Feed:
     """
     Feed entity
@@ -26,3 +26,24 @@ class Feed:
 
     likes_count: int = 0
     views_count: int = 0
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class FeedState:
+    """
+    Viewer dependent and frequently changing part of feed
+    """
+
+    feed_id: uuid.UUID
+    updated_at: datetime.datetime | None = None
+
+    has_followed: bool = False
+    has_liked: bool = False
+
+    likes_count: int = 0
+    views_count: int = 0
+
+    @property
+    def version(self) -> str:
+        """Feed content version: changes whenever feed text or images are updated"""
+        return self.updated_at.isoformat() if self.updated_at is not None else ""
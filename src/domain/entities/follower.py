@@ -2,7 +2,7 @@ import dataclasses
 import datetime
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class Follower:
     follower: str
     follow_for: str
@@ -3,7 +3,28 @@ import datetime
 import uuid
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
+class ImageVariant:
+    """
+    Image downscaled to width
+    """
+
+    width: int
+    url: str
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ImageEncoding:
+    """
+    Image and its variants in another format than JPEG
+    """
+
+    format: str
+    url: str
+    variants: tuple[ImageVariant, ...] = ()
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
 class Image:
     """
     Image entity
@@ -18,31 +39,56 @@ class Image:
         default_factory=datetime.datetime.now,
     )
     order: int = 0
+    content_hash: str | None = None
+    variants: tuple[ImageVariant, ...] = ()
+    encodings: tuple[ImageEncoding, ...] = ()
+    # False while uploaded image waits for processing, url is of the original then:
+    # it is never served, see in_format
+    ready: bool = True
+    # 64-bit dHash for near-duplicate search, see service.helpers.image.perceptual
+    perceptual_hash: int | None = None
+
+    def in_format(
+        self,
+        image_format: str | None,
+    ) -> tuple[str | None, tuple[ImageVariant, ...]]:
+        """
+        URL and variants in the format, JPEG ones if the image has no such encoding.
+        No URL until the image is ready: the original keeps its EXIF (GPS included)
+        and is deleted when processing fails.
+        """
+        if not self.ready:
+            return None, ()
+        for encoding in self.encodings:
+            if encoding.format == image_format:
+                return encoding.url, encoding.variants
+        return self.url, self.variants
+
+    def _with_feed_id(self, feed_id: uuid.UUID | None) -> "Image":
+        # Positional arguments in fields order. Always builds plain Image, even for subclasses
+        return Image(
+            self.image_id,
+            self.uploader,
+            self.url,
+            feed_id,
+            self.blurhash,
+            self.uploaded_at,
+            self.order,
+            self.content_hash,
+            self.variants,
+            self.encodings,
+            self.ready,
+            self.perceptual_hash,
+        )
 
     def bound_to_feed(self, feed_id: uuid.UUID) -> "Image":
         if self.feed_id is not None:
             raise ValueError("Image already bound to feed")
 
-        return Image(
-            image_id=self.image_id,
-            feed_id=feed_id,
-            uploader=self.uploader,
-            url=self.url,
-            blurhash=self.blurhash,
-            uploaded_at=self.uploaded_at,
-            order=self.order,
-        )
+        return self._with_feed_id(feed_id)
 
     def unbound_from_feed(self) -> "Image":
         if self.feed_id is None:
             raise ValueError("Image not bound to feed")
 
-        return Image(
-            image_id=self.image_id,
-            feed_id=None,
-            uploader=self.uploader,
-            url=self.url,
-            blurhash=self.blurhash,
-            uploaded_at=self.uploaded_at,
-            order=self.order,
-        )
+        return self._with_feed_id(None)
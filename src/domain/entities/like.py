@@ -3,7 +3,7 @@ import datetime
 import uuid
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class Like:
     feed_id: uuid.UUID
     account_id: str
@@ -0,0 +1,154 @@
+import collections
+import logging
+import typing
+import uuid
+
+import redis.asyncio as redis
+
+from infrastructure.cache import redis_cache_service, settings
+from service.helpers.image import formats
+from service.interfaces import cache
+
+logger = logging.getLogger(__name__)
+
+# Bumped when fragment layout changes, so fragments of the previous layout are never served
+_KEY_PREFIX = "feeds:fragment:v3:"
+_VERSION_SEPARATOR = b"\n"
+
+
+class LRUFragments:
+    """
+    In-process LRU of feed fragments: feed_id -> image format -> (version, fragment).
+    Size is counted in feeds, all image formats of a feed are evicted together.
+    """
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._items: collections.OrderedDict[
+            uuid.UUID,
+            dict[str | None, tuple[str, bytes]],
+        ] = collections.OrderedDict()
+
+    def get(
+        self,
+        feed_id: uuid.UUID,
+        version: str,
+        image_format: str | None = None,
+    ) -> bytes | None:
+        by_format = self._items.get(feed_id)
+        if by_format is None:
+            return None
+        item = by_format.get(image_format)
+        if item is None:
+            return None
+        if item[0] != version:
+            del by_format[image_format]
+            return None
+        self._items.move_to_end(feed_id)
+        return item[1]
+
+    def put(
+        self,
+        feed_id: uuid.UUID,
+        version: str,
+        fragment: bytes,
+        image_format: str | None = None,
+    ) -> None:
+        self._items.setdefault(feed_id, {})[image_format] = (version, fragment)
+        self._items.move_to_end(feed_id)
+        while len(self._items) > self._max_size:
+            self._items.popitem(last=False)
+
+    def discard(self, feed_id: uuid.UUID) -> None:
+        self._items.pop(feed_id, None)
+
+
+local_fragments = LRUFragments(
+    settings.feed_fragments_cache_settings.LOCAL_MAX_SIZE,
+)
+
+
+class RedisFeedFragmentsCache(cache.FeedFragmentsCache):
+    """
+    Two level feed fragments cache: in-process LRU in front of Redis.
+    Fragment is stored along with feed content version (feed updated_at),
+    fragment of another version is treated as missing.
+    """
+
+    def __init__(self, redis_factory: typing.Callable[[], redis.Redis]):
+        self._cache = redis_cache_service.RedisCacheService(redis_factory)
+        self._local = local_fragments
+        self._ttl_seconds = settings.feed_fragments_cache_settings.TTL_SECONDS
+
+    @staticmethod
+    def _key(feed_id: uuid.UUID, image_format: str | None = None) -> str:
+        if image_format is None:
+            return f"{_KEY_PREFIX}{feed_id}"
+        return f"{_KEY_PREFIX}{image_format}:{feed_id}"
+
+    async def get_many(
+        self,
+        versions: dict[uuid.UUID, str],
+        image_format: str | None = None,
+    ) -> dict[uuid.UUID, bytes]:
+        found: dict[uuid.UUID, bytes] = {}
+        missing: list[uuid.UUID] = []
+        for feed_id, version in versions.items():
+            fragment = self._local.get(feed_id, version, image_format)
+            if fragment is None:
+                missing.append(feed_id)
+            else:
+                found[feed_id] = fragment
+
+        if not missing:
+            return found
+
+        values = await self._cache.mget(
+            [self._key(feed_id, image_format) for feed_id in missing],
+        )
+        for feed_id, value in zip(missing, values):
+            if value is None:
+                continue
+            version, _, fragment = value.partition(_VERSION_SEPARATOR)
+            if version.decode() != versions[feed_id]:
+                continue
+            self._local.put(feed_id, versions[feed_id], fragment, image_format)
+            found[feed_id] = fragment
+        return found
+
+    async def set_many(
+        self,
+        fragments: dict[uuid.UUID, tuple[str, bytes]],
+        image_format: str | None = None,
+    ) -> None:
+        if not fragments:
+            return
+        for feed_id, (version, fragment) in fragments.items():
+            self._local.put(feed_id, version, fragment, image_format)
+        try:
+            await self._cache.mset(
+                {
+                    self._key(feed_id, image_format): version.encode()
+                    + _VERSION_SEPARATOR
+                    + fragment
+                    for feed_id, (version, fragment) in fragments.items()
+                },
+                self._ttl_seconds,
+            )
+        except Exception as e:
+            # Fragments are still served from local LRU, next miss will retry
+            logger.warning(
+                f"Failed to store {len(fragments)} feed fragments in cache: {e}",
+            )
+
+    async def invalidate(self, *feed_ids: uuid.UUID) -> None:
+        for feed_id in feed_ids:
+            self._local.discard(feed_id)
+            try:
+                for image_format in (None, *formats.EXTENSIONS):
+                    await self._cache.delete(self._key(feed_id, image_format))
+            except Exception as e:
+                # Stale fragment is still rejected by version check
+                logger.warning(
+                    f"Failed to invalidate fragments of feed {feed_id} in cache: {e}",
+                )
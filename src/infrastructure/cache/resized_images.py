@@ -0,0 +1,145 @@
+import asyncio
+import collections
+import hashlib
+import logging
+import os
+import pathlib
+import tempfile
+
+from infrastructure.cache import settings
+from service.interfaces import cache
+
+logger = logging.getLogger(__name__)
+
+
+class DiskLRU:
+    """
+    Files in a directory with in-process LRU index: file name -> size.
+    Index is rebuilt from the directory on first use, oldest modified first,
+    so files cached before restart are reused and evicted first.
+    File operations run in the default executor and never block the event loop.
+
+    max_bytes is a limit of the process, not of the directory: a worker indexes only
+    files it wrote or found on first use, so a directory shared by N workers of the host
+    holds up to N * max_bytes.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self._directory = pathlib.Path(directory)
+        self._max_bytes = max_bytes
+        self._items: collections.OrderedDict[str, int] = collections.OrderedDict()
+        self._size = 0
+        self._loaded = False
+        self._loading = asyncio.Lock()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _path(self, name: str) -> pathlib.Path:
+        return self._directory / name[:2] / name
+
+    def _scan(self) -> list[tuple[str, int]]:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        files = [
+            (path.stat().st_mtime, path.name, path.stat().st_size)
+            for path in self._directory.glob("*/*")
+            if path.is_file() and not path.name.startswith(".")
+        ]
+        return [(name, size) for _, name, size in sorted(files)]
+
+    async def _load(self) -> None:
+        async with self._loading:
+            if self._loaded:
+                return
+            for name, size in await asyncio.to_thread(self._scan):
+                self._items[name] = size
+                self._size += size
+            self._loaded = True
+        await self._evict()
+
+    def _read(self, name: str) -> bytes:
+        return self._path(name).read_bytes()
+
+    def _write(self, name: str, data: bytes) -> None:
+        path = self._path(name)
+        path.parent.mkdir(exist_ok=True)
+        # Readers never see partially written file
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent,
+            prefix=".",
+            delete=False,
+        ) as file:
+            file.write(data)
+        os.replace(file.name, path)
+
+    def _unlink(self, names: list[str]) -> None:
+        for name in names:
+            self._path(name).unlink(missing_ok=True)
+
+    async def _evict(self) -> None:
+        evicted: list[str] = []
+        while self._size > self._max_bytes and self._items:
+            name, size = self._items.popitem(last=False)
+            self._size -= size
+            evicted.append(name)
+        if evicted:
+            await asyncio.to_thread(self._unlink, evicted)
+
+    async def get(self, name: str) -> bytes | None:
+        if not self._loaded:
+            await self._load()
+        if name not in self._items:
+            return None
+        self._items.move_to_end(name)
+        try:
+            return await asyncio.to_thread(self._read, name)
+        except FileNotFoundError:
+            # Removed by another worker sharing the directory
+            self._size -= self._items.pop(name, 0)
+            return None
+
+    async def put(self, name: str, data: bytes) -> None:
+        if not self._loaded:
+            await self._load()
+        await asyncio.to_thread(self._write, name, data)
+        self._size += len(data) - self._items.get(name, 0)
+        self._items[name] = len(data)
+        self._items.move_to_end(name)
+        await self._evict()
+
+
+disk_lru = DiskLRU(
+    settings.resized_images_cache_settings.DIRECTORY,
+    settings.resized_images_cache_settings.MAX_BYTES,
+)
+
+
+class DiskResizedImagesCache(cache.ResizedImagesCache):
+    """
+    Resized images in local files, least recently used are evicted over MAX_BYTES.
+    Cache errors are logged and treated as misses: images can always be resized again.
+    """
+
+    def __init__(self) -> None:
+        self._lru = disk_lru
+
+    @staticmethod
+    def _name(key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    async def get(self, key: str) -> bytes | None:
+        try:
+            return await self._lru.get(self._name(key))
+        except OSError as e:
+            logger.error(f"Failed to read resized image {key} from cache: {e}")
+            return None
+
+    async def put(self, key: str, image: bytes) -> None:
+        try:
+            await self._lru.put(self._name(key), image)
+        except OSError as e:
+            logger.error(f"Failed to write resized image {key} to cache: {e}")
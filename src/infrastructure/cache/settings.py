@@ -10,3 +10,46 @@ class RedisSettings(pydantic_settings.BaseSettings):
 
 
 redis_settings = RedisSettings()
+
+
+class FeedFragmentsCacheSettings(pydantic_settings.BaseSettings):
+    """Serialized feed JSON fragments cache settings."""
+
+    TTL_SECONDS: int = pydantic.Field(
+        default=24 * 60 * 60,
+        description="Fragments TTL in Redis",
+    )
+    LOCAL_MAX_SIZE: int = pydantic.Field(
+        default=10_000,
+        description="Max fragments count in in-process LRU",
+    )
+
+    model_config = pydantic_settings.SettingsConfigDict(
+        env_prefix="FEED_FRAGMENTS_CACHE_",
+    )
+
+
+feed_fragments_cache_settings = FeedFragmentsCacheSettings()
+
+
+class ResizedImagesCacheSettings(pydantic_settings.BaseSettings):
+    """On-disk cache of images resized on demand settings."""
+
+    DIRECTORY: str = pydantic.Field(
+        default="/tmp/feeds-resized-images",
+        description="Cache directory, shared by API workers of the host",
+    )
+    MAX_BYTES: int = pydantic.Field(
+        default=1024 * 1024 * 1024,
+        description=(
+            "Max total size of cached images per API worker, least recently used are evicted. "
+            "The shared directory holds up to workers * MAX_BYTES"
+        ),
+    )
+
+    model_config = pydantic_settings.SettingsConfigDict(
+        env_prefix="RESIZED_IMAGES_CACHE_",
+    )
+
+
+resized_images_cache_settings = ResizedImagesCacheSettings()
@@ -3,22 +3,37 @@ import typing
 import asyncpg
 import di
 import redis.asyncio as redis
-from di import dependent
+from cqrs import container as cqrs_container
+from di import dependent, executors
 
-from infrastructure.cache import redis as redis_cache
+from infrastructure.cache import feed_fragments, redis as redis_cache, resized_images
 from infrastructure.persistent import factory as uow_factory
+from infrastructure.queues import uploaded_images
 from infrastructure.persistent.postgres import connection as postgres_connection
-from infrastructure.services import iam_service
+from infrastructure.services import iam_service, image_processor
 from infrastructure.storages import s3
-from service.interfaces import unit_of_work as unit_of_work_interface
-from service.interfaces.services import iam_service as iam_service_interface
+from service.interfaces import (
+    cache as cache_interface,
+    queues as queues_interface,
+    unit_of_work as unit_of_work_interface,
+)
+from service.interfaces.services import (
+    iam_service as iam_service_interface,
+    image_processor as image_processor_interface,
+)
 from service.interfaces.storages import images_storage as images_storage_interface
 
+_T = typing.TypeVar("_T")
+
+# Stateless services live in "app" scope and are created once per process,
+# everything else is created per "request" scope
+SCOPES = ("app", "request")
+
 container = di.Container()
 
 container.bind(
     di.bind_by_type(
-        dependent.Dependent(redis_cache.RedisClientFactory, scope="request"),
+        dependent.Dependent(redis_cache.RedisClientFactory, scope="app"),
         typing.Callable[[], redis.Redis],  # pyright: ignore[reportArgumentType]
     ),
 )
@@ -39,14 +54,120 @@ container.bind(
 
 container.bind(
     di.bind_by_type(
-        dependent.Dependent(iam_service.LocalJWTIAMService, scope="request"),
+        dependent.Dependent(iam_service.LocalJWTIAMService, scope="app"),
         iam_service_interface.IAMService,
     ),
 )
 
 container.bind(
     di.bind_by_type(
-        dependent.Dependent(s3.S3ImagesStorage, scope="request"),
+        dependent.Dependent(s3.S3ImagesStorage, scope="app"),
         images_storage_interface.ImagesStorage,
     ),
 )
+
+container.bind(
+    di.bind_by_type(
+        dependent.Dependent(feed_fragments.RedisFeedFragmentsCache, scope="app"),
+        cache_interface.FeedFragmentsCache,
+    ),
+)
+
+container.bind(
+    di.bind_by_type(
+        dependent.Dependent(resized_images.DiskResizedImagesCache, scope="app"),
+        cache_interface.ResizedImagesCache,
+    ),
+)
+
+container.bind(
+    di.bind_by_type(
+        dependent.Dependent(image_processor.ProcessPoolImageProcessor, scope="app"),
+        image_processor_interface.ImageProcessor,
+    ),
+)
+
+container.bind(
+    di.bind_by_type(
+        dependent.Dependent(uploaded_images.RedisUploadedImagesQueue, scope="app"),
+        queues_interface.UploadedImagesQueue,
+    ),
+)
+
+
+class CompiledContainer(cqrs_container.Container[di.Container]):
+    """
+    Resolves dependencies with solved graphs compiled once per type and
+    a single executor, instead of solving the graph on every resolve.
+    "app" scope is entered on first resolve and kept until close().
+    """
+
+    def __init__(self, external_container: di.Container) -> None:
+        self._external_container = external_container
+        self._executor = executors.AsyncExecutor()
+        self._solved: dict[typing.Any, typing.Any] = {}
+        self._app_scope: typing.Any = None
+        self._app_state: typing.Any = None
+        self._generation = 0
+
+    @property
+    def external_container(self) -> di.Container:
+        return self._external_container
+
+    @property
+    def generation(self) -> int:
+        """
+        Changes when instances resolved before may be stale: on close() and
+        when another container is attached
+        """
+        return self._generation
+
+    def attach_external_container(self, container: di.Container) -> None:
+        self._external_container = container
+        self._solved.clear()
+        self._generation += 1
+
+    def compile(self, *types: type) -> None:
+        """
+        Solves dependency graphs of the given types ahead of the first resolve
+        """
+        for type_ in types:
+            self._solve(type_)
+
+    def _solve(self, type_: typing.Type[_T]) -> typing.Any:
+        solved = self._solved.get(type_)
+        if solved is None:
+            solved = self._external_container.solve(
+                dependent.Dependent(type_, scope="request"),
+                scopes=SCOPES,
+            )
+            self._solved[type_] = solved
+        return solved
+
+    def _get_app_state(self) -> typing.Any:
+        if self._app_state is None:
+            # App scoped dependencies are plain classes, so the scope is entered synchronously
+            self._app_scope = self._external_container.enter_scope("app")
+            self._app_state = self._app_scope.__enter__()
+        return self._app_state
+
+    async def resolve(self, type_: typing.Type[_T]) -> _T:
+        solved = self._solve(type_)
+        async with self._external_container.enter_scope(
+            "request",
+            state=self._get_app_state(),
+        ) as state:
+            return await solved.execute_async(executor=self._executor, state=state)
+
+    def close(self) -> None:
+        """
+        Drops app scoped instances, next resolve creates them again
+        """
+        if self._app_scope is not None:
+            self._app_scope.__exit__(None, None, None)
+        self._app_scope = None
+        self._app_state = None
+        self._generation += 1
+
+
+compiled_container = CompiledContainer(container)
@@ -0,0 +1,51 @@
+"""
+Encoding of JSON columns. asyncpg passes json values as text, without a codec.
+"""
+
+import orjson
+
+from domain.entities import images as images_entity
+
+
+def dump_variants(variants: tuple[images_entity.ImageVariant, ...]) -> str:
+    # Keys order matches responses_schema.ImageVariant, json column keeps it as is
+    return orjson.dumps(
+        [{"width": variant.width, "url": variant.url} for variant in variants],
+    ).decode()
+
+
+def load_variants(value: str) -> tuple[images_entity.ImageVariant, ...]:
+    return tuple(
+        images_entity.ImageVariant(width=variant["width"], url=variant["url"])
+        for variant in orjson.loads(value)
+    )
+
+
+def dump_encodings(encodings: tuple[images_entity.ImageEncoding, ...]) -> str:
+    # Object keyed by format, so SQL can pick an encoding with encodings->'webp'
+    return orjson.dumps(
+        {
+            encoding.format: {
+                "url": encoding.url,
+                "variants": [
+                    {"width": variant.width, "url": variant.url}
+                    for variant in encoding.variants
+                ],
+            }
+            for encoding in encodings
+        },
+    ).decode()
+
+
+def load_encodings(value: str) -> tuple[images_entity.ImageEncoding, ...]:
+    return tuple(
+        images_entity.ImageEncoding(
+            format=image_format,
+            url=encoding["url"],
+            variants=tuple(
+                images_entity.ImageVariant(width=variant["width"], url=variant["url"])
+                for variant in encoding["variants"]
+            ),
+        )
+        for image_format, encoding in orjson.loads(value).items()
+    )
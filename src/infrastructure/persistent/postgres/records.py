@@ -0,0 +1,80 @@
+"""
+Read-only entities backed by asyncpg.Record.
+
+Columns are read from the record on attribute access, so mapping a row costs a
+single small object allocation. Used on read paths only: entities must not
+outlive the request and must not be passed into write paths.
+"""
+
+# Properties intentionally override dataclass fields of the base entities
+# pyright: reportIncompatibleVariableOverride=false
+
+import typing
+
+import asyncpg
+
+from domain.entities import feed as feed_entity, images as images_entity
+from infrastructure.persistent.postgres import columns
+
+
+def _column(index: int) -> typing.Any:
+    return property(lambda self: self._row[index])
+
+
+class RecordImage(images_entity.Image):
+    """
+    Image backed by row of: image_id, feed_id, uploader, url, blurhash, uploaded_at, "order",
+    variants, encodings, ready
+    """
+
+    __slots__ = ("_row",)
+
+    def __init__(self, row: asyncpg.Record):
+        object.__setattr__(self, "_row", row)
+
+    image_id = _column(0)
+    feed_id = _column(1)
+    uploader = _column(2)
+    url = _column(3)
+    blurhash = _column(4)
+    uploaded_at = _column(5)
+    order = _column(6)
+    ready = _column(9)
+    # Not selected on read paths
+    content_hash = None
+    perceptual_hash = None
+
+    @property
+    def variants(self) -> tuple[images_entity.ImageVariant, ...]:
+        return columns.load_variants(self._row[7])
+
+    @property
+    def encodings(self) -> tuple[images_entity.ImageEncoding, ...]:
+        return columns.load_encodings(self._row[8])
+
+
+class RecordFeed(feed_entity.Feed):
+    """
+    Feed backed by row of: feed_id, account_id, created_at, updated_at, text,
+    likes_count, views_count, has_followed, has_liked
+    """
+
+    __slots__ = ("_row", "_images")
+
+    def __init__(self, row: asyncpg.Record, images: list[images_entity.Image]):
+        object.__setattr__(self, "_row", row)
+        object.__setattr__(self, "_images", images)
+
+    feed_id = _column(0)
+    account_id = _column(1)
+    created_at = _column(2)
+    updated_at = _column(3)
+    text = _column(4)
+    likes_count = _column(5)
+    views_count = _column(6)
+    has_followed = _column(7)
+    has_liked = _column(8)
+
+    @property
+    def images(self) -> list[images_entity.Image]:
+        return self._images
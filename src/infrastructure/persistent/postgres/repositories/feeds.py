@@ -1,7 +1,12 @@
+import typing
 import uuid
 
+import asyncpg
+
 from domain.entities import feed as feed_entity, images as images_entity
+from infrastructure.persistent.postgres import columns, records
 from infrastructure.persistent.postgres.base import BaseRepository
+from infrastructure.persistent.settings import postgres_settings
 from service import exceptions
 from service.interfaces.repositories import feeds as feeds_interface
 
@@ -71,41 +76,208 @@ _FEED_SELECT_WITH_TOTAL = (
 )
 
 
-def _row_to_feed(row, images: list[images_entity.Image]) -> feed_entity.Feed:
-    has_followed = (
-        bool(row["has_followed"]) if row.get("has_followed") is not None else False
+def _json_timestamp(column: str) -> str:
+    """
+    Renders timestamptz the same way orjson serializes asyncpg datetimes:
+    UTC with "Z" suffix, microseconds only when non-zero.
+    """
+    return f"""(
+        to_char({column} AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS')
+        || CASE WHEN extract(microseconds FROM {column})::bigint % 1000000 = 0
+            THEN '' ELSE to_char({column} AT TIME ZONE 'UTC', '.US') END
+        || 'Z'
+    )"""
+
+
+def _json_value(expression: str) -> str:
+    """JSON text of SQL value, escaped the same way as by orjson"""
+    return f"COALESCE(to_json({expression})::text, 'null')"
+
+
+def _json_object(*pairs: tuple[str, str]) -> str:
+    """
+    Compact JSON object text with keys in the given order, the same bytes orjson writes.
+    Values are SQL expressions of JSON text. json_build_object is not used:
+    it separates keys and values with spaces.
+    """
+    members = " || ',' || ".join(f"'\"{key}\":' || {value}" for key, value in pairs)
+    return f"('{{' || {members} || '}}')"
+
+
+def _feed_json_select(
+    source: str,
+    image_format_param: str,
+    extra_columns: str = "",
+) -> str:
+    """
+    Wraps feed select (source) into query rendering responses_schema.Feed JSON per row,
+    byte for byte the same as presentation.api.serializers.feed.
+    Image URLs are taken from encoding of image_format_param (text, NULL for JPEG)
+    when the image has it, not ready images have neither URL nor variants.
+    Variants are spliced from the json columns as stored: compact orjson output,
+    json operators keep it as is.
+    """
+    image_json = _json_object(
+        (
+            "image",
+            _json_object(
+                ("uuid", _json_value("i.image_id")),
+                (
+                    "url",
+                    _json_value(
+                        "CASE WHEN i.status = 'ready' THEN "
+                        f"COALESCE(i.encodings -> {image_format_param} ->> 'url', i.url) END",
+                    ),
+                ),
+                ("blurhash", _json_value("i.blurhash")),
+                (
+                    "variants",
+                    "CASE WHEN i.status = 'ready' THEN "
+                    f"COALESCE(i.encodings -> {image_format_param} -> 'variants', i.variants)::text "
+                    "ELSE '[]' END",
+                ),
+                ("ready", _json_value("i.status = 'ready'")),
+            ),
+        ),
+        ("order", _json_value('i."order"')),
+    )
+    feed_json = _json_object(
+        ("uuid", _json_value("f.feed_id")),
+        ("account_id", _json_value("f.account_id")),
+        ("has_followed", _json_value("f.has_followed")),
+        ("created_at", _json_value(_json_timestamp("f.created_at"))),
+        ("updated_at", _json_value(_json_timestamp("f.updated_at"))),
+        ("text", _json_value("f.text")),
+        ("images", "COALESCE(img.images, '[]')"),
+        ("has_liked", _json_value("f.has_liked")),
+        ("likes_count", _json_value("f.likes_count")),
+        ("views_count", _json_value("f.views_count")),
+        ("images_count", _json_value("COALESCE(img.images_count, 0)")),
+    )
+    return f"""
+    SELECT
+        {feed_json} AS feed_json{extra_columns}
+    FROM ({source}) f
+    LEFT JOIN LATERAL (
+        SELECT
+            '[' || string_agg({image_json}, ',' ORDER BY i."order") || ']' AS images,
+            count(*)::int AS images_count
+        FROM images i
+        WHERE i.feed_id = f.feed_id
+    ) img ON true
+"""
+
+
+_FEED_JSON_SELECT_BY_IDS = _feed_json_select(_FEED_SELECT_BY_IDS, "$3::text")
+
+_FEED_JSON_SELECT_ACCOUNT_FEEDS = (
+    _feed_json_select(
+        _FEED_SELECT_WITH_TOTAL
+        + " WHERE f.account_id = $1 ORDER BY f.created_at DESC LIMIT $3 OFFSET $4",
+        "$5::text",
+        extra_columns=", f.total_count",
+    )
+    + " ORDER BY f.created_at DESC"
+)
+
+
+# Feed states: same selects without feed content (text, images)
+_FEED_STATE_COLUMNS = """
+    f.feed_id, f.updated_at, f.has_followed, f.has_liked, f.likes_count, f.views_count
+"""
+
+_FEED_STATE_SELECT_BY_IDS = (
+    "SELECT" + _FEED_STATE_COLUMNS + "FROM (" + _FEED_SELECT_BY_IDS + ") f"
+)
+
+_FEED_STATE_SELECT_ACCOUNT_FEEDS = (
+    "SELECT"
+    + _FEED_STATE_COLUMNS
+    + ", f.total_count FROM ("
+    + _FEED_SELECT_WITH_TOTAL
+    + " WHERE f.account_id = $1 ORDER BY f.created_at DESC LIMIT $3 OFFSET $4"
+    + ") f ORDER BY f.created_at DESC"
+)
+
+
+# Column positions of _FEED_SELECT, _FEED_SELECT_BY_IDS and _FEED_SELECT_WITH_TOTAL
+(
+    _FEED_ID,
+    _ACCOUNT_ID,
+    _CREATED_AT,
+    _UPDATED_AT,
+    _TEXT,
+    _LIKES_COUNT,
+    _VIEWS_COUNT,
+    _HAS_FOLLOWED,
+    _HAS_LIKED,
+    _TOTAL_COUNT,
+) = range(10)
+
+# Column positions of image selects:
+# image_id, feed_id, uploader, url, blurhash, uploaded_at, "order", variants, encodings, ready
+_IMAGE_FEED_ID = 1
+
+
+def _row_to_feed_state(row) -> feed_entity.FeedState:
+    # Columns of _FEED_STATE_COLUMNS
+    return feed_entity.FeedState(
+        feed_id=row[0],
+        updated_at=row[1],
+        has_followed=row[2],
+        has_liked=row[3],
+        likes_count=row[4],
+        views_count=row[5],
     )
-    has_liked = bool(row["has_liked"]) if row.get("has_liked") is not None else False
+
+
+def _row_to_feed(row, images: list[images_entity.Image]) -> feed_entity.Feed:
     return feed_entity.Feed(
-        feed_id=row["feed_id"],
-        account_id=row["account_id"],
-        created_at=row["created_at"],
-        updated_at=row["updated_at"],
-        text=row["text"],
+        feed_id=row[_FEED_ID],
+        account_id=row[_ACCOUNT_ID],
+        created_at=row[_CREATED_AT],
+        updated_at=row[_UPDATED_AT],
+        text=row[_TEXT],
         images=images,
-        likes_count=int(row["likes_count"])
-        if row.get("likes_count") is not None
-        else 0,
-        views_count=int(row["views_count"])
-        if row.get("views_count") is not None
-        else 0,
-        has_followed=has_followed,
-        has_liked=has_liked,
+        likes_count=row[_LIKES_COUNT],
+        views_count=row[_VIEWS_COUNT],
+        has_followed=row[_HAS_FOLLOWED],
+        has_liked=row[_HAS_LIKED],
     )
 
 
 def _row_to_image(row) -> images_entity.Image:
     return images_entity.Image(
-        image_id=row["image_id"],
-        feed_id=row["feed_id"],
-        uploader=row["uploader"],
-        url=row["url"],
-        blurhash=row["blurhash"],
-        uploaded_at=row["uploaded_at"],
-        order=row["order"],
+        image_id=row[0],
+        feed_id=row[1],
+        uploader=row[2],
+        url=row[3],
+        blurhash=row[4],
+        uploaded_at=row[5],
+        order=row[6],
+        variants=columns.load_variants(row[7]),
+        encodings=columns.load_encodings(row[8]),
+        ready=row[9],
     )
 
 
+_ImageMapper: typing.TypeAlias = typing.Callable[
+    [asyncpg.Record],
+    images_entity.Image,
+]
+_FeedMapper: typing.TypeAlias = typing.Callable[
+    [asyncpg.Record, list[images_entity.Image]],
+    feed_entity.Feed,
+]
+
+# Mappers of read paths (get_by_ids, get_account_feeds)
+_read_image: _ImageMapper = _row_to_image
+_read_feed: _FeedMapper = _row_to_feed
+if postgres_settings.LAZY_READ_ENTITIES:
+    _read_image = records.RecordImage
+    _read_feed = records.RecordFeed
+
+
 class PostgresFeedsRepository(BaseRepository, feeds_interface.IFeedsRepository):
     async def exists(self, feed_id: uuid.UUID) -> bool:
         row = await self.conn.fetchrow(
@@ -182,13 +354,16 @@ class PostgresFeedsRepository(BaseRepository, feeds_interface.IFeedsRepository):
     async def _fetch_images_by_feed_ids(
         self,
         feed_ids: list[uuid.UUID],
+        mapper: _ImageMapper = _row_to_image,
     ) -> dict[uuid.UUID, list[images_entity.Image]]:
         """Load all images for given feed_ids in one query; returns feed_id -> list[Image]."""
         if not feed_ids:
             return {}
         rows = await self.conn.fetch(
             """
-            SELECT image_id, feed_id, uploader, url, blurhash, uploaded_at, "order"
+            SELECT
+                image_id, feed_id, uploader, url, blurhash, uploaded_at, "order", variants,
+                encodings, status = 'ready'
             FROM images WHERE feed_id = ANY($1::uuid[]) ORDER BY feed_id, "order"
             """,
             feed_ids,
@@ -197,7 +372,7 @@ class PostgresFeedsRepository(BaseRepository, feeds_interface.IFeedsRepository):
             fid: [] for fid in feed_ids
         }
         for r in rows:
-            by_feed[r["feed_id"]].append(_row_to_image(r))
+            by_feed[r[_IMAGE_FEED_ID]].append(mapper(r))
         return by_feed
 
     async def get_by_id(
@@ -213,8 +388,7 @@ class PostgresFeedsRepository(BaseRepository, feeds_interface.IFeedsRepository):
         if not rows:
             return None
         images_by_feed = await self._fetch_images_by_feed_ids([feed_id])
-        images = images_by_feed.get(feed_id, [])
-        return _row_to_feed(rows[0], images)
+        return _row_to_feed(rows[0], images_by_feed[feed_id])
 
     async def get_by_ids(
         self,
@@ -229,13 +403,10 @@ class PostgresFeedsRepository(BaseRepository, feeds_interface.IFeedsRepository):
             current_account_id,
         )
         images_by_feed = await self._fetch_images_by_feed_ids(
-            [r["feed_id"] for r in rows],
+            [r[_FEED_ID] for r in rows],
+            mapper=_read_image,
         )
-        result = []
-        for row in rows:
-            images = images_by_feed.get(row["feed_id"], [])
-            result.append(_row_to_feed(row, images))
-        return result
+        return [_read_feed(row, images_by_feed[row[_FEED_ID]]) for row in rows]
 
     async def get_account_feeds(
         self,
@@ -254,15 +425,85 @@ class PostgresFeedsRepository(BaseRepository, feeds_interface.IFeedsRepository):
         )
         if not rows:
             return ([], 0)
-        total_count = int(rows[0]["total_count"])
         images_by_feed = await self._fetch_images_by_feed_ids(
-            [r["feed_id"] for r in rows],
+            [r[_FEED_ID] for r in rows],
+            mapper=_read_image,
+        )
+        return (
+            [_read_feed(row, images_by_feed[row[_FEED_ID]]) for row in rows],
+            int(rows[0][_TOTAL_COUNT]),
+        )
+
+    async def get_by_ids_json(
+        self,
+        feed_ids: list[uuid.UUID],
+        current_account_id: str | None = None,
+        image_format: str | None = None,
+    ) -> list[str]:
+        if not feed_ids:
+            return []
+        rows = await self.conn.fetch(
+            _FEED_JSON_SELECT_BY_IDS,
+            feed_ids,
+            current_account_id,
+            image_format,
+        )
+        return [row[0] for row in rows]
+
+    async def get_account_feeds_json(
+        self,
+        account_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        current_account_id: str | None = None,
+        image_format: str | None = None,
+    ) -> tuple[list[str], int]:
+        rows = await self.conn.fetch(
+            _FEED_JSON_SELECT_ACCOUNT_FEEDS,
+            account_id,
+            current_account_id,
+            limit,
+            offset,
+            image_format,
+        )
+        if not rows:
+            return ([], 0)
+        return ([row[0] for row in rows], int(rows[0][1]))
+
+    async def get_states_by_ids(
+        self,
+        feed_ids: list[uuid.UUID],
+        current_account_id: str | None = None,
+    ) -> list[feed_entity.FeedState]:
+        if not feed_ids:
+            return []
+        rows = await self.conn.fetch(
+            _FEED_STATE_SELECT_BY_IDS,
+            feed_ids,
+            current_account_id,
+        )
+        return [_row_to_feed_state(row) for row in rows]
+
+    async def get_account_feed_states(
+        self,
+        account_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        current_account_id: str | None = None,
+    ) -> tuple[list[feed_entity.FeedState], int]:
+        rows = await self.conn.fetch(
+            _FEED_STATE_SELECT_ACCOUNT_FEEDS,
+            account_id,
+            current_account_id,
+            limit,
+            offset,
+        )
+        if not rows:
+            return ([], 0)
+        return (
+            [_row_to_feed_state(row) for row in rows],
+            int(rows[0][-1]),
         )
-        result = []
-        for row in rows:
-            images = images_by_feed.get(row["feed_id"], [])
-            result.append(_row_to_feed(row, images))
-        return (result, total_count)
 
     async def count_feeds(self, account_id: str) -> int:
         r = await self.conn.fetchval(
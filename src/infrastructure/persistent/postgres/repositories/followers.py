@@ -4,10 +4,11 @@ from service.interfaces.repositories import followers as followers_interface
 
 
 def _row_to_follower(row) -> follower_entity.Follower:
+    # Columns: follower, follow_for, followed_at
     return follower_entity.Follower(
-        follower=row["follower"],
-        follow_for=row["follow_for"],
-        followed_at=row["followed_at"],
+        follower=row[0],
+        follow_for=row[1],
+        followed_at=row[2],
     )
 
 
@@ -79,7 +80,7 @@ class PostgresFollowersRepository(
             limit,
             offset,
         )
-        total_count = int(rows[0]["total_count"]) if rows else 0
+        total_count = int(rows[0][3]) if rows else 0
         return ([_row_to_follower(r) for r in rows], total_count)
 
     async def get_following(
@@ -103,7 +104,7 @@ class PostgresFollowersRepository(
             limit,
             offset,
         )
-        total_count = int(rows[0]["total_count"]) if rows else 0
+        total_count = int(rows[0][3]) if rows else 0
         return ([_row_to_follower(r) for r in rows], total_count)
 
     async def count_followers(self, account_id: str) -> int:
@@ -1,22 +1,33 @@
+import datetime
+import typing
 import uuid
 
 import asyncpg
 
 from domain.entities import images as images_entity
+from infrastructure.persistent.postgres import columns
 from infrastructure.persistent.postgres.base import BaseRepository
 from service import exceptions
+from service.helpers.image import perceptual
 from service.interfaces.repositories import images as images_interface
 
 
 def _row_to_image(row: asyncpg.Record) -> images_entity.Image:
+    # Columns: image_id, feed_id, uploader, url, blurhash, uploaded_at, "order", variants,
+    # encodings, ready, content_hash, perceptual_hash
     return images_entity.Image(
-        image_id=row["image_id"],
-        feed_id=row["feed_id"],
-        uploader=row["uploader"],
-        url=row["url"],
-        blurhash=row["blurhash"],
-        uploaded_at=row["uploaded_at"],
-        order=row["order"],
+        image_id=row[0],
+        feed_id=row[1],
+        uploader=row[2],
+        url=row[3],
+        blurhash=row[4],
+        uploaded_at=row[5],
+        order=row[6],
+        variants=columns.load_variants(row[7]),
+        encodings=columns.load_encodings(row[8]),
+        ready=row[9],
+        content_hash=row[10],
+        perceptual_hash=row[11],
     )
 
 
@@ -30,8 +41,11 @@ class PostgresImagesRepository(BaseRepository, images_interface.IImageRepository
             raise exceptions.ImageAlreadyExists(image_id=image.image_id)
         await self.conn.execute(
             """
-            INSERT INTO images (image_id, feed_id, uploader, url, blurhash, uploaded_at, "order")
-            VALUES ($1, $2, $3, $4, $5, $6, $7)
+            INSERT INTO images (
+                image_id, feed_id, uploader, url, blurhash, uploaded_at, "order", content_hash,
+                variants, encodings, perceptual_hash
+            )
+            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9::json, $10::json, $11)
             """,
             image.image_id,
             image.feed_id,
@@ -40,12 +54,188 @@ class PostgresImagesRepository(BaseRepository, images_interface.IImageRepository
             image.blurhash,
             image.uploaded_at,
             image.order,
+            image.content_hash,
+            columns.dump_variants(image.variants),
+            columns.dump_encodings(image.encodings),
+            image.perceptual_hash,
         )
 
+    async def add_many(self, *image: images_entity.Image) -> None:
+        if not image:
+            return
+        image_ids = [img.image_id for img in image]
+        rows = await self.conn.fetch(
+            """
+            INSERT INTO images (
+                image_id, feed_id, uploader, url, blurhash, uploaded_at, "order", content_hash,
+                variants, encodings, perceptual_hash
+            )
+            SELECT * FROM unnest(
+                $1::uuid[],
+                $2::uuid[],
+                $3::text[],
+                $4::text[],
+                $5::text[],
+                $6::timestamptz[],
+                $7::int[],
+                $8::text[],
+                $9::json[],
+                $10::json[],
+                $11::bigint[]
+            )
+            ON CONFLICT (image_id) DO NOTHING
+            RETURNING image_id
+            """,
+            image_ids,
+            [img.feed_id for img in image],
+            [img.uploader for img in image],
+            [img.url for img in image],
+            [img.blurhash for img in image],
+            [img.uploaded_at for img in image],
+            [img.order for img in image],
+            [img.content_hash for img in image],
+            [columns.dump_variants(img.variants) for img in image],
+            [columns.dump_encodings(img.encodings) for img in image],
+            [img.perceptual_hash for img in image],
+        )
+        if len(rows) != len(image_ids):
+            inserted = {row[0] for row in rows}
+            raise exceptions.ImageAlreadyExists(
+                image_id=next(
+                    image_id for image_id in image_ids if image_id not in inserted
+                ),
+            )
+
+    async def add_pending(self, image: images_entity.Image) -> None:
+        await self.conn.execute(
+            """
+            INSERT INTO images (
+                image_id, feed_id, uploader, url, blurhash, uploaded_at, "order", status
+            )
+            VALUES ($1, $2, $3, $4, $5, $6, $7, 'pending')
+            """,
+            image.image_id,
+            image.feed_id,
+            image.uploader,
+            image.url,
+            image.blurhash,
+            image.uploaded_at,
+            image.order,
+        )
+
+    async def get_pending(self, image_id: uuid.UUID) -> images_entity.Image | None:
+        row = await self.conn.fetchrow(
+            """
+            SELECT
+                image_id, feed_id, uploader, url, blurhash, uploaded_at, "order", variants,
+                encodings, status = 'ready', content_hash, perceptual_hash
+            FROM images WHERE image_id = $1 AND status = 'pending'
+            """,
+            image_id,
+        )
+        if row is None:
+            return None
+        return _row_to_image(row)
+
+    async def mark_ready(
+        self,
+        image_id: uuid.UUID,
+        url: str,
+        blurhash: str | None,
+        content_hash: str | None = None,
+        variants: tuple[images_entity.ImageVariant, ...] = (),
+        encodings: tuple[images_entity.ImageEncoding, ...] = (),
+        perceptual_hash: int | None = None,
+    ) -> None:
+        # Feed version is its updated_at: bumping it refreshes cached feed content
+        await self.conn.execute(
+            """
+            WITH ready AS (
+                UPDATE images
+                SET
+                    url = $2,
+                    blurhash = $3,
+                    content_hash = $4,
+                    variants = $5::json,
+                    encodings = $6::json,
+                    perceptual_hash = $7,
+                    status = 'ready',
+                    processed_at = clock_timestamp()
+                WHERE image_id = $1
+                RETURNING feed_id
+            )
+            UPDATE feeds SET updated_at = now()
+            FROM ready
+            WHERE feeds.feed_id = ready.feed_id
+            """,
+            image_id,
+            url,
+            blurhash,
+            content_hash,
+            columns.dump_variants(variants),
+            columns.dump_encodings(encodings),
+            perceptual_hash,
+        )
+
+    async def mark_failed(self, image_id: uuid.UUID) -> None:
+        await self.conn.execute(
+            "UPDATE images SET status = 'failed' WHERE image_id = $1 AND status = 'pending'",
+            image_id,
+        )
+
+    async def is_failed(self, image_id: uuid.UUID) -> bool:
+        return bool(
+            await self.conn.fetchval(
+                "SELECT EXISTS (SELECT FROM images WHERE image_id = $1 AND status = 'failed')",
+                image_id,
+            ),
+        )
+
+    async def lock_stale_pending(
+        self,
+        pending_for: datetime.timedelta,
+        limit: int,
+    ) -> list[images_entity.Image]:
+        rows = await self.conn.fetch(
+            """
+            SELECT
+                image_id, feed_id, uploader, url, blurhash, uploaded_at, "order", variants,
+                encodings, status = 'ready', content_hash, perceptual_hash
+            FROM images
+            WHERE status = 'pending' AND uploaded_at < now() - $1::interval
+            ORDER BY uploaded_at
+            LIMIT $2
+            FOR UPDATE SKIP LOCKED
+            """,
+            pending_for,
+            limit,
+        )
+        return [_row_to_image(row) for row in rows]
+
+    async def get_by_content_hashes(
+        self,
+        *content_hash: str,
+    ) -> dict[str, images_entity.Image]:
+        if not content_hash:
+            return {}
+        rows = await self.conn.fetch(
+            """
+            SELECT DISTINCT ON (content_hash)
+                image_id, feed_id, uploader, url, blurhash, uploaded_at, "order", variants,
+                encodings, status = 'ready', content_hash, perceptual_hash
+            FROM images
+            WHERE content_hash = ANY($1::text[]) AND status = 'ready'
+            """,
+            list(content_hash),
+        )
+        return {row[10]: _row_to_image(row) for row in rows}
+
     async def get_by_id(self, image_id: uuid.UUID) -> images_entity.Image | None:
         row = await self.conn.fetchrow(
             """
-            SELECT image_id, feed_id, uploader, url, blurhash, uploaded_at, "order"
+            SELECT
+                image_id, feed_id, uploader, url, blurhash, uploaded_at, "order", variants,
+                encodings, status = 'ready', content_hash, perceptual_hash
             FROM images WHERE image_id = $1
             """,
             image_id,
@@ -59,13 +249,163 @@ class PostgresImagesRepository(BaseRepository, images_interface.IImageRepository
             return []
         rows = await self.conn.fetch(
             """
-            SELECT image_id, feed_id, uploader, url, blurhash, uploaded_at, "order"
+            SELECT
+                image_id, feed_id, uploader, url, blurhash, uploaded_at, "order", variants,
+                encodings, status = 'ready', content_hash, perceptual_hash
+            FROM images WHERE image_id = ANY($1::uuid[]) AND status = 'ready'
+            """,
+            list(image_ids),
+        )
+        return [_row_to_image(r) for r in rows]
+
+    async def get_processed(
+        self,
+        image_id: uuid.UUID,
+    ) -> tuple[images_entity.Image, datetime.datetime] | None:
+        row = await self.conn.fetchrow(
+            """
+            SELECT
+                image_id, feed_id, uploader, url, blurhash, uploaded_at, "order", variants,
+                encodings, status = 'ready', content_hash, perceptual_hash, processed_at
+            FROM images WHERE image_id = $1 AND status = 'ready'
+            """,
+            image_id,
+        )
+        if row is None:
+            return None
+        return _row_to_image(row), row[12]
+
+    async def lock_many(self, *image_ids: uuid.UUID) -> list[images_entity.Image]:
+        if not image_ids:
+            return []
+        rows = await self.conn.fetch(
+            """
+            SELECT
+                image_id, feed_id, uploader, url, blurhash, uploaded_at, "order", variants,
+                encodings, status = 'ready', content_hash, perceptual_hash
             FROM images WHERE image_id = ANY($1::uuid[])
+            ORDER BY image_id
+            FOR UPDATE
             """,
             list(image_ids),
         )
         return [_row_to_image(r) for r in rows]
 
+    async def find_similar(
+        self,
+        perceptual_hash: int,
+        max_distance: int,
+        limit: int,
+        visible_to: str | None = None,
+    ) -> list[tuple[images_entity.Image, int]]:
+        # Chunk expressions match the multi-index hashing indexes
+        candidates = perceptual.chunk_candidates(perceptual_hash, max_distance)
+        rows = await self.conn.fetch(
+            """
+            SELECT
+                image_id, feed_id, uploader, url, blurhash, uploaded_at, "order", variants,
+                encodings, status = 'ready', content_hash, perceptual_hash,
+                bit_count((perceptual_hash # $1)::bit(64)) AS distance
+            FROM images
+            WHERE perceptual_hash IS NOT NULL
+                AND (
+                    ((perceptual_hash >> 48) & 65535) = ANY($2::bigint[])
+                    OR ((perceptual_hash >> 32) & 65535) = ANY($3::bigint[])
+                    OR ((perceptual_hash >> 16) & 65535) = ANY($4::bigint[])
+                    OR (perceptual_hash & 65535) = ANY($5::bigint[])
+                )
+                AND bit_count((perceptual_hash # $1)::bit(64)) <= $6
+                AND status = 'ready'
+                AND ($8::text IS NULL OR feed_id IS NOT NULL OR uploader = $8)
+            ORDER BY distance, uploaded_at
+            LIMIT $7
+            """,
+            perceptual_hash,
+            *candidates,
+            max_distance,
+            limit,
+            visible_to,
+        )
+        return [(_row_to_image(row), row[12]) for row in rows]
+
+    async def iter_for_reprocessing(
+        self,
+        after: uuid.UUID | None = None,
+        batch_size: int = 100,
+        missing_blurhash: bool = False,
+        missing_variants: bool = False,
+    ) -> typing.AsyncIterator[list[images_entity.Image]]:
+        # Server-side cursor: rows are fetched batch_size at a time within the transaction
+        batch: list[images_entity.Image] = []
+        async for row in self.conn.cursor(
+            """
+            SELECT
+                image_id, feed_id, uploader, url, blurhash, uploaded_at, "order", variants,
+                encodings, status = 'ready', content_hash, perceptual_hash
+            FROM images
+            WHERE status = 'ready'
+                AND ($1::uuid IS NULL OR image_id > $1)
+                AND (NOT $2 OR blurhash IS NULL)
+                AND (NOT $3 OR json_array_length(variants) = 0)
+            ORDER BY image_id
+            """,
+            after,
+            missing_blurhash,
+            missing_variants,
+            prefetch=batch_size,
+        ):
+            batch.append(_row_to_image(row))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def update_processed(self, *image: images_entity.Image) -> None:
+        if not image:
+            return
+        # Feed version is its updated_at: bumping it refreshes cached feed content
+        await self.conn.execute(
+            """
+            WITH processed AS (
+                UPDATE images AS i
+                SET
+                    url = d.url,
+                    blurhash = d.blurhash,
+                    content_hash = d.content_hash,
+                    variants = d.variants,
+                    encodings = d.encodings,
+                    perceptual_hash = d.perceptual_hash,
+                    processed_at = clock_timestamp()
+                FROM (
+                    SELECT * FROM unnest(
+                        $1::uuid[],
+                        $2::text[],
+                        $3::text[],
+                        $4::text[],
+                        $5::json[],
+                        $6::json[],
+                        $7::bigint[]
+                    ) AS t(
+                        image_id, url, blurhash, content_hash, variants, encodings,
+                        perceptual_hash
+                    )
+                ) AS d
+                WHERE i.image_id = d.image_id AND i.status = 'ready'
+                RETURNING i.feed_id
+            )
+            UPDATE feeds SET updated_at = now()
+            WHERE feed_id IN (SELECT feed_id FROM processed)
+            """,
+            [img.image_id for img in image],
+            [img.url for img in image],
+            [img.blurhash for img in image],
+            [img.content_hash for img in image],
+            [columns.dump_variants(img.variants) for img in image],
+            [columns.dump_encodings(img.encodings) for img in image],
+            [img.perceptual_hash for img in image],
+        )
+
     async def update(self, *image: images_entity.Image) -> None:
         if not image:
             return
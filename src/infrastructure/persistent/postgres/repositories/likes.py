@@ -6,10 +6,11 @@ from service.interfaces.repositories import likes as likes_interface
 
 
 def _row_to_like(row) -> like_entity.Like:
+    # Columns: feed_id, account_id, liked_at
     return like_entity.Like(
-        feed_id=row["feed_id"],
-        account_id=row["account_id"],
-        liked_at=row["liked_at"],
+        feed_id=row[0],
+        account_id=row[1],
+        liked_at=row[2],
     )
 
 
@@ -53,7 +54,7 @@ class PostgresLikesRepository(BaseRepository, likes_interface.ILikesRepository):
             limit,
             offset,
         )
-        total_count = int(rows[0]["total_count"]) if rows else 0
+        total_count = int(rows[0][3]) if rows else 0
         return (total_count, [_row_to_like(r) for r in rows])
 
     async def has_like(self, feed_id: uuid.UUID, account_id: str) -> bool:
@@ -15,6 +15,10 @@ class PostgresSettings(pydantic_settings.BaseSettings):
     PASSWORD: str = Field(default="postgres")
     POOL_MIN_SIZE: int = Field(default=5, description="Min connections in pool")
     POOL_MAX_SIZE: int = Field(default=20, description="Max connections in pool")
+    LAZY_READ_ENTITIES: bool = Field(
+        default=False,
+        description="Return record-backed lazy entities on read paths",
+    )
 
     @property
     def dsn(self) -> str:
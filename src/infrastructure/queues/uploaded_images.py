@@ -0,0 +1,65 @@
+import typing
+import uuid
+
+import redis.asyncio as redis
+
+from service.interfaces import queues
+
+_QUEUE_KEY = "images:uploaded"
+_PROCESSING_KEY = "images:uploaded:processing"
+
+
+def _value(image_id: uuid.UUID) -> typing.Any:
+    # redis-py stubs type list values as str, bytes are stored as is
+    return image_id.bytes
+
+
+class RedisUploadedImagesQueue(queues.UploadedImagesQueue):
+    """
+    Redis list based queue: LPUSH on enqueue, BLMOVE of the oldest into the processing list
+    on dequeue, LREM from it on ack.
+    """
+
+    def __init__(self, redis_factory: typing.Callable[[], redis.Redis]):
+        self._redis_client = redis_factory()
+
+    async def put(self, image_id: uuid.UUID) -> None:
+        # redis-py stubs type results of the asyncio client as sync ones
+        await typing.cast(
+            typing.Awaitable[int],
+            self._redis_client.lpush(_QUEUE_KEY, _value(image_id)),
+        )
+
+    async def get(self, timeout: int) -> uuid.UUID | None:
+        value: bytes | None = await self._redis_client.blmove(
+            _QUEUE_KEY,
+            _PROCESSING_KEY,
+            timeout,
+            src="RIGHT",
+            dest="LEFT",
+        )
+        if value is None:
+            return None
+        return uuid.UUID(bytes=value)
+
+    async def ack(self, image_id: uuid.UUID) -> None:
+        await typing.cast(
+            typing.Awaitable[int],
+            self._redis_client.lrem(_PROCESSING_KEY, 0, _value(image_id)),
+        )
+
+    async def processing(self) -> list[uuid.UUID]:
+        values = await typing.cast(
+            typing.Awaitable[list[bytes]],
+            self._redis_client.lrange(_PROCESSING_KEY, 0, -1),
+        )
+        return [uuid.UUID(bytes=value) for value in values]
+
+    async def requeue(self, image_id: uuid.UUID) -> None:
+        # Oldest end of the queue: requeued image is taken next, never waits twice
+        value = _value(image_id)
+        async with self._redis_client.pipeline(transaction=True) as pipeline:
+            pipeline.lrem(_QUEUE_KEY, 0, value)
+            pipeline.lrem(_PROCESSING_KEY, 0, value)
+            pipeline.rpush(_QUEUE_KEY, value)
+            await pipeline.execute()
@@ -1,5 +1,9 @@
+import asyncio
+import collections
+import hashlib
 import logging
 import os
+import time
 
 import dotenv
 import httpx
@@ -16,14 +20,79 @@ dotenv.load_dotenv()
 logger = logging.getLogger(__name__)
 
 
+class VerifiedTokensCache:
+    """
+    Ограниченный LRU кэш проверенных токенов: sha256(token) -> (user_id, expires_at).
+    Запись живёт не дольше exp токена и не дольше ttl_seconds.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int) -> None:
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._items: collections.OrderedDict[bytes, tuple[str, float]] = (
+            collections.OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, token: str) -> str | None:
+        if not self._max_size:
+            return None
+        key = self.key(token)
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        user_id, expires_at = item
+        if expires_at <= time.time():
+            del self._items[key]
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return user_id
+
+    def put(self, token: str, user_id: str, exp: float | None) -> None:
+        if not self._max_size:
+            return
+        expires_at = time.time() + self._ttl_seconds
+        if exp is not None:
+            expires_at = min(expires_at, exp)
+        key = self.key(token)
+        self._items[key] = (user_id, expires_at)
+        self._items.move_to_end(key)
+        while len(self._items) > self._max_size:
+            self._items.popitem(last=False)
+
+
+verified_tokens_cache = VerifiedTokensCache(
+    max_size=settings.jwt_settings.cache_max_size,
+    ttl_seconds=settings.jwt_settings.cache_ttl_seconds,
+)
+
+
 class LocalJWTIAMService(iam_service.IAMService):
     """
     Проверка access-токена так же, как в IAM.
     Те же параметры jwt.decode: secret, algorithm, audience, issuer.
+    Успешно проверенные токены кэшируются в verified_tokens_cache до их exp.
     """
 
     def __init__(self) -> None:
         self._settings = settings.jwt_settings
+        self._cache = verified_tokens_cache
 
     @staticmethod
     def _log_signature_debug(
@@ -50,6 +119,10 @@ class LocalJWTIAMService(iam_service.IAMService):
             pass
 
     async def get_user_id(self, token: str) -> str:
+        user_id = self._cache.get(token)
+        if user_id is not None:
+            return user_id
+
         jwt_secret = self._settings.secret
         jwt_algorithm = self._settings.algorithm
         jwt_audience = self._settings.audience
@@ -74,36 +147,103 @@ class LocalJWTIAMService(iam_service.IAMService):
         if not user_id:
             logger.error("Invalid access token: user_id not found in token")
             raise exceptions.GetUserIdError("user_id not found in token")
+        self._cache.put(token, str(user_id), payload.get("exp"))
         return str(user_id)
 
 
+http_verified_tokens_cache = VerifiedTokensCache(
+    max_size=settings.iam_settings.cache_max_size,
+    ttl_seconds=settings.iam_settings.cache_ttl_seconds,
+)
+
+_http_client: httpx.AsyncClient | None = None
+_http_transport: httpx.AsyncHTTPTransport | None = None
+
+# sha256(token) -> in-flight validation shared by concurrent requests with the same token
+_in_flight_validations: dict[bytes, asyncio.Future[str]] = {}
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client, _http_transport
+    if _http_client is None:
+        iam_settings = settings.iam_settings
+        _http_transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=iam_settings.max_connections,
+                max_keepalive_connections=iam_settings.max_keepalive_connections,
+                keepalive_expiry=iam_settings.keepalive_expiry,
+            ),
+        )
+        _http_client = httpx.AsyncClient(
+            transport=httpx_retries.RetryTransport(
+                transport=_http_transport,
+                retry=httpx_retries.Retry(
+                    total=iam_settings.retries,
+                    backoff_factor=iam_settings.backoff_factor,
+                    max_backoff_wait=iam_settings.deadline,
+                    status_forcelist=[502, 503, 504, 429],
+                    allowed_methods=["POST", "GET"],
+                ),
+            ),
+            timeout=iam_settings.timeout,
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client, _http_transport
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+    if _http_transport is not None:
+        # RetryTransport does not close the transport it wraps
+        await _http_transport.aclose()
+        _http_transport = None
+
+
 class HttpIAMService(iam_service.IAMService):
+    """
+    Проверка access-токена запросом в IAM.
+    Использует общий долгоживущий httpx клиент, кэширует проверенные токены и
+    объединяет одновременные проверки одного и того же токена в один запрос.
+    """
+
     VALIDATE_TOKEN_ENDPOINT = os.getenv("VALIDATE_TOKEN_ENDPOINT", default="notset")
 
     def __init__(self):
-        self.transport = httpx_retries.RetryTransport(
-            retry=httpx_retries.Retry(
-                total=15,
-                backoff_factor=1,
-                status_forcelist=[502, 503, 504, 429],
-                allowed_methods=["POST", "GET"],
-            ),
-        )
+        self._cache = http_verified_tokens_cache
+        self._deadline = settings.iam_settings.deadline
 
     async def get_user_id(self, token: str) -> str:
+        user_id = self._cache.get(token)
+        if user_id is not None:
+            return user_id
+
+        key = self._cache.key(token)
+        validation = _in_flight_validations.get(key)
+        if validation is None:
+            validation = asyncio.ensure_future(self._validate(token))
+            _in_flight_validations[key] = validation
+            validation.add_done_callback(
+                lambda _: _in_flight_validations.pop(key, None),
+            )
+        # shield: cancellation of one waiter must not cancel validation for the others
+        return await asyncio.shield(validation)
+
+    async def _validate(self, token: str) -> str:
         logger.info("Validating token")
         try:
-            async with httpx.AsyncClient(
-                transport=self.transport,
-            ) as client:
-                response = await client.get(
+            async with asyncio.timeout(self._deadline):
+                response = await _get_http_client().get(
                     self.VALIDATE_TOKEN_ENDPOINT,
                     headers={
                         "Content-Type": "application/json",
                         "Authorization": f"Bearer {token}",
                     },
-                    timeout=30.0,
                 )
+        except TimeoutError:
+            logger.error("Failed to get user id: deadline exceeded")
+            raise exceptions.GetUserIdError("Failed to get user id: deadline exceeded")
         except httpx.HTTPError as e:
             logger.error(f"Failed to get user id: {e}")
             raise exceptions.GetUserIdError(f"Failed to get user id: {str(e)}")
@@ -117,4 +257,6 @@ class HttpIAMService(iam_service.IAMService):
 
         response_data = orjson.loads(response.content)
 
-        return response_data["result"]["user_id"]
+        user_id = response_data["result"]["user_id"]
+        self._cache.put(token, user_id, None)
+        return user_id
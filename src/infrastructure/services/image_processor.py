@@ -0,0 +1,231 @@
+import asyncio
+import concurrent.futures
+import concurrent.futures.process
+import logging
+import time
+import typing
+
+import settings
+from service import exceptions
+from service.helpers.image import formats, header, process, transcode
+from service.interfaces.services import image_processor
+
+logger = logging.getLogger(__name__)
+
+
+class ImageProcessingMetrics:
+    """
+    Counters of image processing: tasks, rejections, timeouts, broken pools, queue wait
+    and worker CPU time.
+    """
+
+    def __init__(self) -> None:
+        self.processed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.broken_pools = 0
+        self.queue_wait_seconds = 0.0
+        self.max_queue_wait_seconds = 0.0
+        self.cpu_seconds = 0.0
+
+    def observe_queue_wait(self, seconds: float) -> None:
+        self.queue_wait_seconds += seconds
+        self.max_queue_wait_seconds = max(self.max_queue_wait_seconds, seconds)
+
+    def observe_processed(self, cpu_seconds: float) -> None:
+        self.processed += 1
+        self.cpu_seconds += cpu_seconds
+
+    @property
+    def avg_queue_wait_seconds(self) -> float:
+        started = self.processed + self.timeouts
+        return self.queue_wait_seconds / started if started else 0.0
+
+    @property
+    def avg_cpu_seconds(self) -> float:
+        return self.cpu_seconds / self.processed if self.processed else 0.0
+
+
+image_processing_metrics = ImageProcessingMetrics()
+
+_executor: concurrent.futures.ProcessPoolExecutor | None = None
+
+
+_T = typing.TypeVar("_T")
+
+
+def _timed(
+    function: typing.Callable[..., _T],
+    *args: typing.Any,
+) -> tuple[_T, float]:
+    started = time.process_time()
+    result = function(*args)
+    return result, time.process_time() - started
+
+
+def _encodings(
+    image_processing_settings: settings.ImageProcessing,
+) -> dict[str, dict[str, typing.Any]]:
+    """Enabled modern formats available in installed Pillow -> Pillow save options"""
+    options: dict[str, dict[str, typing.Any]] = {
+        formats.WEBP: {
+            "quality": image_processing_settings.webp_quality,
+            "method": image_processing_settings.webp_method,
+        },
+        formats.AVIF: {
+            "quality": image_processing_settings.avif_quality,
+            "speed": image_processing_settings.avif_speed,
+        },
+    }
+    encodings: dict[str, dict[str, typing.Any]] = {}
+    for image_format in image_processing_settings.formats:
+        if not formats.available(image_format):
+            logger.warning(
+                "Image format %s is not supported by Pillow, skipped",
+                image_format,
+            )
+            continue
+        encodings[image_format] = options[image_format]
+    return encodings
+
+
+def _jpeg_policy(
+    image_processing_settings: settings.ImageProcessing,
+) -> transcode.JpegPolicy:
+    return transcode.JpegPolicy(
+        max_long_edge=image_processing_settings.max_long_edge,
+        quality=image_processing_settings.jpeg_quality,
+        min_quality=image_processing_settings.jpeg_min_quality,
+        max_bytes=image_processing_settings.jpeg_max_bytes,
+        progressive=image_processing_settings.jpeg_progressive,
+        subsampling=image_processing_settings.jpeg_subsampling,
+    )
+
+
+def _get_executor() -> concurrent.futures.ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=settings.image_processing_settings.workers,
+        )
+    return _executor
+
+
+def _replace_broken_executor(broken: concurrent.futures.ProcessPoolExecutor) -> None:
+    """A pool with a dead worker rejects every task: the next one starts a new pool"""
+    global _executor
+    if _executor is broken:
+        _executor = None
+        image_processing_metrics.broken_pools += 1
+        logger.error("Image processing pool is broken, a worker process died: replaced")
+        broken.shutdown(wait=False, cancel_futures=True)
+
+
+def start_executor() -> None:
+    """Spawns worker processes ahead of the first upload"""
+    executor = _get_executor()
+    for _ in range(settings.image_processing_settings.workers):
+        executor.submit(time.process_time)
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+
+class ProcessPoolImageProcessor(image_processor.ImageProcessor):
+    """
+    Processes images in a shared process pool, so decoding and encoding never block the event loop.
+    At most `workers` images are processed at once and at most `max_queue_size` wait for a worker,
+    uploads beyond that are rejected.
+
+    A process cannot be interrupted: after timeout the image is still processed and keeps
+    its worker slot until it finishes, so images slower than `timeout` reduce throughput.
+    A pool whose worker process died (e.g. killed out of memory) is replaced with a new one.
+    """
+
+    def __init__(self) -> None:
+        self._settings = settings.image_processing_settings
+        self._metrics = image_processing_metrics
+        self._workers = asyncio.Semaphore(self._settings.workers)
+        self._encodings = _encodings(self._settings)
+        self._jpeg_policy = _jpeg_policy(self._settings)
+        self._waiting = 0
+
+    async def process(self, image: bytes) -> image_processor.ProcessedImage:
+        # Decompression bombs are rejected before they reach a worker process
+        header.check(image, self._settings.max_pixels)
+        return await self._run(
+            process.process_image,
+            image,
+            self._settings.variant_widths,
+            self._encodings,
+            self._jpeg_policy,
+        )
+
+    async def resize(
+        self,
+        image: bytes,
+        width: int | None,
+        image_format: str | None = None,
+    ) -> bytes:
+        return await self._run(
+            process.resize_image,
+            image,
+            width,
+            image_format,
+            self._encodings.get(image_format) if image_format is not None else None,
+        )
+
+    async def hashes(self, image: bytes) -> tuple[str, int]:
+        return await self._run(process.hash_image, image)
+
+    async def _run(self, function: typing.Callable[..., _T], *args: typing.Any) -> _T:
+        if self._waiting >= self._settings.max_queue_size:
+            self._metrics.rejected += 1
+            raise exceptions.ImageProcessingOverloaded(self._settings.max_queue_size)
+
+        enqueued_at = time.monotonic()
+        self._waiting += 1
+        try:
+            await self._workers.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._metrics.observe_queue_wait(time.monotonic() - enqueued_at)
+        executor = _get_executor()
+        try:
+            future = asyncio.get_running_loop().run_in_executor(
+                executor,
+                _timed,
+                function,
+                *args,
+            )
+        except Exception as e:
+            self._workers.release()
+            if isinstance(e, concurrent.futures.process.BrokenProcessPool):
+                _replace_broken_executor(executor)
+            raise
+        # Worker slot is held until the process finishes the image, even after timeout
+        future.add_done_callback(lambda _: self._workers.release())
+
+        try:
+            async with asyncio.timeout(self._settings.timeout):
+                result, cpu_seconds = await asyncio.shield(future)
+        except TimeoutError:
+            self._metrics.timeouts += 1
+            logger.error("Image processing timed out")
+            raise exceptions.ImageProcessingTimeout(self._settings.timeout)
+        except concurrent.futures.process.BrokenProcessPool:
+            _replace_broken_executor(executor)
+            raise
+
+        self._metrics.observe_processed(cpu_seconds)
+        logger.debug(
+            "Image processed in %.3f CPU seconds, %d images processed",
+            cpu_seconds,
+            self._metrics.processed,
+        )
+        return result
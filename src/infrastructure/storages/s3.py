@@ -1,8 +1,13 @@
-import io
+import asyncio
+import concurrent.futures
+import functools
 import logging
+import mimetypes
+import threading
+import typing
 
 import boto3.session
-from botocore import client
+from botocore import client, config, exceptions as botocore_exceptions
 
 from infrastructure.storages import settings
 from service.interfaces.storages import images_storage
@@ -13,44 +18,157 @@ logging.getLogger("boto3").setLevel(logging.ERROR)
 
 logger = logging.getLogger(__name__)
 
+_client: client.BaseClient | None = None
+_client_lock = threading.Lock()
+_executor: concurrent.futures.ThreadPoolExecutor | None = None
+
+
+def _get_client() -> client.BaseClient:
+    """Long-lived S3 client, botocore clients are thread safe and keep a connection pool"""
+    global _client
+    if _client is not None:
+        return _client
+    with _client_lock:
+        if _client is not None:
+            return _client
+        s3_settings = settings.s3_settings
+        _client = boto3.session.Session().client(
+            "s3",
+            endpoint_url=s3_settings.ENDPOINT_URL,
+            region_name=s3_settings.REGION_NAME,
+            aws_access_key_id=s3_settings.ACCESS_KEY_ID,
+            aws_secret_access_key=s3_settings.SECRET_ACCESS_KEY,
+            config=config.Config(
+                max_pool_connections=s3_settings.MAX_CONCURRENCY,
+                connect_timeout=s3_settings.CONNECT_TIMEOUT,
+                read_timeout=s3_settings.READ_TIMEOUT,
+                retries={"max_attempts": s3_settings.MAX_ATTEMPTS, "mode": "standard"},
+            ),
+        )
+        return _client
+
+
+def _call_client(method: str, kwargs: dict[str, typing.Any]) -> typing.Any:
+    # Runs in the pool: creating the client takes long enough to stall the event loop
+    return getattr(_get_client(), method)(**kwargs)
+
+
+def _get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Dedicated pool for blocking S3 calls, its size bounds concurrent transfers"""
+    global _executor
+    if _executor is None:
+        _executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=settings.s3_settings.MAX_CONCURRENCY,
+            thread_name_prefix="s3",
+        )
+    return _executor
+
+
+def _is_not_found(error: botocore_exceptions.ClientError) -> bool:
+    # HEAD responses have no body, so no error code but the status
+    return error.response.get("Error", {}).get("Code") in ("NoSuchKey", "404")
+
+
+def close() -> None:
+    global _client, _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+    if _client is not None:
+        _client.close()
+        _client = None
+
 
 class S3ImagesStorage(images_storage.ImagesStorage):
     def __init__(self):
         self.endpoint_url = settings.s3_settings.ENDPOINT_URL
-        self.region_name = settings.s3_settings.REGION_NAME
 
         self.bucket_name = settings.s3_settings.BUCKET_NAME
         self.path_prefix = settings.s3_settings.PATH_PREFIX
 
-        self.access_key_id = settings.s3_settings.ACCESS_KEY_ID
-        self.secret_access_key = settings.s3_settings.SECRET_ACCESS_KEY
+    def _full_filename(self, filename: str) -> str:
+        return f"{self.path_prefix}/{filename}" if self.path_prefix else filename
 
     def _generate_download_url(self, filename: str) -> str:
         return self.endpoint_url + "/" + self.bucket_name + "/" + filename
 
-    async def upload_one(self, image: images_storage.Image) -> str:
-        full_filename = (
-            f"{self.path_prefix}/{image.filename}"
-            if self.path_prefix
-            else image.filename
-        )
-        session = boto3.session.Session()
-        s3: client.BaseClient = session.client(
-            "s3",
-            endpoint_url=self.endpoint_url,
-            region_name=self.region_name,
-            aws_access_key_id=self.access_key_id,
-            aws_secret_access_key=self.secret_access_key,
+    async def _call(self, method: str, **kwargs) -> typing.Any:
+        return await asyncio.get_running_loop().run_in_executor(
+            _get_executor(),
+            functools.partial(_call_client, method, kwargs),
         )
 
-        image_io = io.BytesIO(image.image)
-        image_io.seek(0)
-        s3.upload_fileobj(image_io, self.bucket_name, full_filename)
+    def get_url(self, filename: str) -> str:
+        return self._generate_download_url(self._full_filename(filename))
+
+    async def upload_one(self, image: images_storage.Image) -> str:
+        full_filename = self._full_filename(image.filename)
+        content_type, _ = mimetypes.guess_type(full_filename)
+        await self._call(
+            "put_object",
+            Bucket=self.bucket_name,
+            Key=full_filename,
+            Body=image.image,
+            ContentType=content_type or "application/octet-stream",
+        )
         logger.debug(f"New image {image.filename} uploaded")
         return self._generate_download_url(full_filename)
 
+    async def presign_upload(
+        self,
+        filename: str,
+        max_bytes: int,
+    ) -> images_storage.PresignedUpload:
+        expires_in = settings.s3_settings.PRESIGN_EXPIRES_SECONDS
+        # POST policy, unlike presigned PUT, bounds the size of the uploaded file
+        post = await self._call(
+            "generate_presigned_post",
+            Bucket=self.bucket_name,
+            Key=self._full_filename(filename),
+            Conditions=[["content-length-range", 1, max_bytes]],
+            ExpiresIn=expires_in,
+        )
+        return images_storage.PresignedUpload(
+            url=post["url"],
+            expires_in=expires_in,
+            fields=post["fields"],
+        )
+
+    async def size(self, filename: str) -> int | None:
+        try:
+            response = await self._call(
+                "head_object",
+                Bucket=self.bucket_name,
+                Key=self._full_filename(filename),
+            )
+        except botocore_exceptions.ClientError as e:
+            if _is_not_found(e):
+                return None
+            raise
+        return response["ContentLength"]
+
+    async def download(self, filename: str) -> bytes | None:
+        try:
+            response = await self._call(
+                "get_object",
+                Bucket=self.bucket_name,
+                Key=self._full_filename(filename),
+            )
+        except botocore_exceptions.ClientError as e:
+            if _is_not_found(e):
+                return None
+            raise
+        return await asyncio.get_running_loop().run_in_executor(
+            _get_executor(),
+            response["Body"].read,
+        )
+
+    async def delete(self, filename: str) -> None:
+        await self._call(
+            "delete_object",
+            Bucket=self.bucket_name,
+            Key=self._full_filename(filename),
+        )
+
     async def upload(self, *image: images_storage.Image) -> list[str]:
-        urls = []
-        for img in image:
-            urls.append(await self.upload_one(img))
-        return urls
+        return list(await asyncio.gather(*(self.upload_one(img) for img in image)))
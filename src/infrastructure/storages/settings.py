@@ -12,6 +12,12 @@ class S3Settings(pydantic_settings.BaseSettings, case_sensitive=True):
     ACCESS_KEY_ID: str = pydantic.Field(default="")
     SECRET_ACCESS_KEY: str = pydantic.Field(default="")
 
+    MAX_CONCURRENCY: int = pydantic.Field(default=16)
+    CONNECT_TIMEOUT: float = pydantic.Field(default=5.0)
+    READ_TIMEOUT: float = pydantic.Field(default=30.0)
+    MAX_ATTEMPTS: int = pydantic.Field(default=3)
+    PRESIGN_EXPIRES_SECONDS: int = pydantic.Field(default=900)
+
     model_config = pydantic_settings.SettingsConfigDict(env_prefix="S3_")
 
 
@@ -93,6 +93,38 @@ def cannot_follow_self_error_handler(
     return models.ErrorResponse(message=str(error))
 
 
+@bind_exception(status.HTTP_503_SERVICE_UNAVAILABLE)
+def image_processing_overloaded_error_handler(
+    _: requests.Request,
+    error: service_exceptions.ImageProcessingOverloaded,
+) -> models.ErrorResponse:
+    return models.ErrorResponse(message=str(error))
+
+
+@bind_exception(status.HTTP_504_GATEWAY_TIMEOUT)
+def image_processing_timeout_error_handler(
+    _: requests.Request,
+    error: service_exceptions.ImageProcessingTimeout,
+) -> models.ErrorResponse:
+    return models.ErrorResponse(message=str(error))
+
+
+@bind_exception(status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+def unsupported_image_format_error_handler(
+    _: requests.Request,
+    error: service_exceptions.UnsupportedImageFormat,
+) -> models.ErrorResponse:
+    return models.ErrorResponse(message=str(error))
+
+
+@bind_exception(status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+def image_dimensions_too_large_error_handler(
+    _: requests.Request,
+    error: service_exceptions.ImageDimensionsTooLarge,
+) -> models.ErrorResponse:
+    return models.ErrorResponse(message=str(error))
+
+
 handlers = [
     unauthorized_error_handler,
     forbidden_error_handler,
@@ -105,4 +137,8 @@ handlers = [
     user_not_found_error_handler,
     already_following_error_handler,
     cannot_follow_self_error_handler,
+    image_processing_overloaded_error_handler,
+    image_processing_timeout_error_handler,
+    unsupported_image_format_error_handler,
+    image_dimensions_too_large_error_handler,
 ]
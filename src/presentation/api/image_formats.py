@@ -0,0 +1,74 @@
+import fastapi
+
+import settings
+from service.helpers.image import formats
+
+# Formats images are encoded into, in server preference order
+_SERVED_FORMATS = tuple(
+    image_format
+    for image_format in settings.image_processing_settings.formats
+    if formats.available(image_format)
+)
+# Request headers the format is negotiated from: caches must key responses with
+# negotiated image URLs or bodies by them
+VARY_HEADERS = {"Vary": "Accept, X-Image-Formats"}
+
+
+def _client_formats(accept: str | None, x_image_formats: str | None) -> set[str]:
+    client_formats: set[str] = set()
+    if x_image_formats:
+        client_formats.update(
+            image_format.strip().lower() for image_format in x_image_formats.split(",")
+        )
+    if accept:
+        for media_range in accept.split(","):
+            media_type = media_range.split(";", 1)[0].strip().lower()
+            if media_type.startswith("image/"):
+                client_formats.add(media_type.removeprefix("image/"))
+    return client_formats
+
+
+def negotiate_image_format(
+    accept: str | None = fastapi.Header(default=None, include_in_schema=False),
+    x_image_formats: str | None = fastapi.Header(
+        default=None,
+        description="Image formats supported by the client, e.g. `avif, webp`",
+    ),
+) -> str | None:
+    """
+    Picks the most preferred served format the client supports, from X-Image-Formats
+    or image/* types in Accept. None means JPEG, supported by every client
+    """
+    if not _SERVED_FORMATS or not (accept or x_image_formats):
+        return None
+    client_formats = _client_formats(accept, x_image_formats)
+    return next(
+        (
+            image_format
+            for image_format in _SERVED_FORMATS
+            if image_format in client_formats
+        ),
+        None,
+    )
+
+
+def resized_image_format(
+    image_format: str | None = fastapi.Query(
+        default=None,
+        alias="format",
+        pattern="^(jpeg|webp|avif)$",
+        description="Explicit format, negotiated from request headers when omitted",
+    ),
+    accept: str | None = fastapi.Header(default=None, include_in_schema=False),
+    x_image_formats: str | None = fastapi.Header(
+        default=None,
+        description="Image formats supported by the client, e.g. `avif, webp`",
+    ),
+) -> str | None:
+    """
+    Format of an image resized on demand. Explicitly requested formats
+    which are not served fall back to JPEG
+    """
+    if image_format is None:
+        return negotiate_image_format(accept, x_image_formats)
+    return image_format if image_format in _SERVED_FORMATS else None
@@ -6,10 +6,15 @@ import dotenv
 import fastapi
 import fastapi_app
 from fastapi_app import logging as fastapi_logging
+from starlette import formparsers
 
 import settings
+from infrastructure import dependencies as infrastructure_dependencies
 from infrastructure.persistent.postgres import connection as postgres_connection
-from presentation.api import errors, limiter, routes
+from infrastructure.services import iam_service, image_processor
+from infrastructure.storages import s3
+from presentation import dependencies
+from presentation.api import errors, limiter, routes, settings as api_settings
 from presentation.api.routes import healthcheck
 
 dotenv.load_dotenv()
@@ -42,9 +47,15 @@ logging.getLogger("httpx_retries").setLevel(logging.ERROR)
 @asynccontextmanager
 async def lifespan(app: fastapi.FastAPI):
     await postgres_connection.init_pool()
+    dependencies.compile_dependencies()
+    image_processor.start_executor()
     try:
         yield
     finally:
+        infrastructure_dependencies.compiled_container.close()
+        image_processor.shutdown_executor()
+        s3.close()
+        await iam_service.close_http_client()
         await postgres_connection.close_pool()
 
 
@@ -65,3 +76,5 @@ app = fastapi_app.create(
 )
 # Rate Limitation
 app.state.limiter = limiter.limiter
+# Uploaded files above the threshold are spooled to disk instead of memory
+formparsers.MultiPartParser.max_file_size = api_settings.api_settings.upload_spool_bytes
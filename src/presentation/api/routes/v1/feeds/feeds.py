@@ -5,7 +5,7 @@ from fastapi_app import response
 from fastapi_app.exception_handlers import registry
 
 from presentation import dependencies
-from presentation.api import limiter, security, settings
+from presentation.api import image_formats, limiter, security, serializers, settings
 from presentation.api.schemas import (
     pagination,
     requests as requests_schema,
@@ -19,12 +19,14 @@ from service.models.commands.feeds import (
 )
 from service.models.queries.feeds import get_feeds as get_feeds_model
 
-router = fastapi.APIRouter(prefix="/feeds")
+router = fastapi.APIRouter(prefix="/feeds", route_class=serializers.ORJSONRoute)
 
 
 @router.post(
     "",
     status_code=fastapi.status.HTTP_201_CREATED,
+    response_model=response.Response[responses_schema.Feed],
+    response_class=serializers.ORJSONResponse,
     responses=registry.get_exception_responses(
         service_exceptions.FeedAlreadyExists,
         service_exceptions.GetUserIdError,
@@ -38,10 +40,11 @@ async def post_feed(
     request: fastapi.Request,
     body: requests_schema.PostFeed = fastapi.Body(...),
     account_id: pydantic.StrictStr = fastapi.Depends(security.extract_account_id),
+    image_format: str | None = fastapi.Depends(image_formats.negotiate_image_format),
     mediator: cqrs.RequestMediator = fastapi.Depends(
         dependencies.request_mediator_factory,
     ),
-) -> response.Response[responses_schema.Feed]:
+) -> serializers.ORJSONResponse:
     """
     # Create feed
     """
@@ -52,28 +55,16 @@ async def post_feed(
             images=body.images,
         ),
     )
-    return response.Response(
-        result=responses_schema.Feed.model_construct(
-            uuid=result.feed.feed_id,
-            account_id=account_id,
-            has_followed=False,
-            created_at=result.feed.created_at,
-            updated_at=result.feed.updated_at,
-            text=body.text,
-            images=[
-                responses_schema.OrderedImage.model_construct(
-                    image=responses_schema.Image.model_construct(
-                        uuid=image.image_id,
-                        url=image.url,
-                        blurhash=image.blurhash,
-                    ),
-                    order=image.order,
-                )
-                for image in result.feed.images
-            ],
-            likes_count=result.feed.likes_count,
-            views_count=result.feed.views_count,
+    return serializers.ORJSONResponse(
+        serializers.envelope(
+            serializers.feed(
+                result.feed,
+                account_id=account_id,
+                image_format=image_format,
+            ),
         ),
+        status_code=fastapi.status.HTTP_201_CREATED,
+        headers=image_formats.VARY_HEADERS,
     )
 
 
@@ -81,6 +72,8 @@ async def post_feed(
     "",
     status_code=fastapi.status.HTTP_200_OK,
     description="Get feeds",
+    response_model=response.Response[responses_schema.Feeds],
+    response_class=serializers.ORJSONResponse,
 )
 @limiter.limiter.limit(settings.api_settings.max_requests_per_ip_limit)
 async def get_feeds(
@@ -90,45 +83,59 @@ async def get_feeds(
         max_length=100,
     ),
     account_id: pydantic.StrictStr = fastapi.Depends(security.extract_account_id),
+    image_format: str | None = fastapi.Depends(image_formats.negotiate_image_format),
     mediator: cqrs.RequestMediator = fastapi.Depends(
         dependencies.request_mediator_factory,
     ),
-) -> response.Response[responses_schema.Feeds]:
+) -> serializers.ORJSONResponse:
     """
     # Get feeds by ids
     """
+    if settings.api_settings.feeds_json_passthrough:
+        json_result: get_feeds_model.GetFeedsJsonResponse = await mediator.send(
+            get_feeds_model.GetFeedsJson(
+                feed_ids=feed_id,
+                current_account_id=account_id,
+                image_format=image_format,
+            ),
+        )
+        return serializers.ORJSONResponse(
+            serializers.envelope(
+                serializers.feeds(serializers.feed_fragments(json_result.feeds)),
+            ),
+            headers=image_formats.VARY_HEADERS,
+        )
+
+    if settings.api_settings.feeds_fragments_cache:
+        fragments_result: get_feeds_model.GetFeedsFragmentsResponse = (
+            await mediator.send(
+                get_feeds_model.GetFeedsFragments(
+                    feed_ids=feed_id,
+                    current_account_id=account_id,
+                    image_format=image_format,
+                ),
+            )
+        )
+        return serializers.ORJSONResponse(
+            serializers.envelope(
+                serializers.feeds(serializers.feed_fragments(fragments_result.feeds)),
+            ),
+            headers=image_formats.VARY_HEADERS,
+        )
+
     result: get_feeds_model.GetFeedsResponse = await mediator.send(
         get_feeds_model.GetFeeds(feed_ids=feed_id, current_account_id=account_id),
     )
-
-    return response.Response[responses_schema.Feeds](
-        result=responses_schema.Feeds.model_construct(
-            items=[
-                responses_schema.Feed.model_construct(
-                    uuid=feed.feed_id,
-                    account_id=feed.account_id,
-                    has_followed=feed.has_followed,
-                    has_liked=feed.has_liked,
-                    created_at=feed.created_at,
-                    updated_at=feed.updated_at,
-                    text=feed.text,
-                    images=[
-                        responses_schema.OrderedImage.model_construct(
-                            image=responses_schema.Image.model_construct(
-                                uuid=image.image_id,
-                                url=image.url,
-                                blurhash=image.blurhash,
-                            ),
-                            order=image.order,
-                        )
-                        for image in feed.images
-                    ],
-                    likes_count=feed.likes_count,
-                    views_count=feed.views_count,
-                )
-                for feed in result.feeds
-            ],
+    return serializers.ORJSONResponse(
+        serializers.envelope(
+            serializers.feeds(
+                [
+                    serializers.feed(feed, image_format=image_format)
+                    for feed in result.feeds
+                ],
+            ),
         ),
+        headers=image_formats.VARY_HEADERS,
     )
 
 
@@ -136,6 +143,8 @@ async def get_feeds(
     "/{account_id}",
     status_code=fastapi.status.HTTP_200_OK,
     description="Get account feeds",
+    response_model=response.Response[pagination.Pagination[responses_schema.Feed]],
+    response_class=serializers.ORJSONResponse,
     responses=registry.get_exception_responses(
         service_exceptions.GetUserIdError,
         service_exceptions.UnauthorizedError,
@@ -150,13 +159,60 @@ async def get_account_feeds(
     ),
     limit: pydantic.PositiveInt = fastapi.Query(default=10, ge=1, le=100),
     offset: pydantic.NonNegativeInt = fastapi.Query(default=0),
+    image_format: str | None = fastapi.Depends(image_formats.negotiate_image_format),
     mediator: cqrs.RequestMediator = fastapi.Depends(
         dependencies.request_mediator_factory,
     ),
-) -> response.Response[pagination.Pagination[responses_schema.Feed]]:
+) -> serializers.ORJSONResponse:
     """
     # Get account feeds
     """
+    if settings.api_settings.feeds_json_passthrough:
+        json_result: get_feeds_model.GetAccountFeedsJsonResponse = await mediator.send(
+            get_feeds_model.GetAccountFeedsJson(
+                account_id=account_id,
+                current_account_id=current_account_id,
+                limit=limit,
+                offset=offset,
+                image_format=image_format,
+            ),
+        )
+        return serializers.ORJSONResponse(
+            serializers.envelope(
+                serializers.page(
+                    serializers.feed_fragments(json_result.feeds),
+                    limit=limit,
+                    offset=offset,
+                    count=json_result.total_count,
+                ),
+            ),
+            headers=image_formats.VARY_HEADERS,
+        )
+
+    if settings.api_settings.feeds_fragments_cache:
+        fragments_result: get_feeds_model.GetAccountFeedsFragmentsResponse = (
+            await mediator.send(
+                get_feeds_model.GetAccountFeedsFragments(
+                    account_id=account_id,
+                    current_account_id=current_account_id,
+                    limit=limit,
+                    offset=offset,
+                    image_format=image_format,
+                ),
+            )
+        )
+        return serializers.ORJSONResponse(
+            serializers.envelope(
+                serializers.page(
+                    serializers.feed_fragments(fragments_result.feeds),
+                    limit=limit,
+                    offset=offset,
+                    count=fragments_result.total_count,
+                ),
+            ),
+            headers=image_formats.VARY_HEADERS,
+        )
+
     result: get_feeds_model.GetAccountFeedsResponse = await mediator.send(
         get_feeds_model.GetAccountFeeds(
             account_id=account_id,
@@ -165,39 +221,23 @@ async def get_account_feeds(
             offset=offset,
         ),
     )
-
-    return response.Response[pagination.Pagination[responses_schema.Feed]](
-        result=pagination.Pagination[responses_schema.Feed].model_construct(
-            url="",
-            base_items=[
-                responses_schema.Feed.model_construct(
-                    uuid=feed.feed_id,
-                    account_id=account_id,
-                    has_followed=feed.has_followed,
-                    has_liked=feed.has_liked,
-                    created_at=feed.created_at,
-                    updated_at=feed.updated_at,
-                    text=feed.text,
-                    images=[
-                        responses_schema.OrderedImage.model_construct(
-                            image=responses_schema.Image.model_construct(
-                                uuid=image.image_id,
-                                url=image.url,
-                                blurhash=image.blurhash,
-                            ),
-                            order=image.order,
-                        )
-                        for image in feed.images
-                    ],
-                    likes_count=feed.likes_count,
-                    views_count=feed.views_count,
-                )
-                for feed in result.feeds
-            ],
-            limit=limit,
-            offset=offset,
-            count=result.total_count,
+    return serializers.ORJSONResponse(
+        serializers.envelope(
+            serializers.page(
+                [
+                    serializers.feed(
+                        feed,
+                        account_id=account_id,
+                        image_format=image_format,
+                    )
+                    for feed in result.feeds
+                ],
+                limit=limit,
+                offset=offset,
+                count=result.total_count,
+            ),
         ),
+        headers=image_formats.VARY_HEADERS,
     )
 
 
@@ -205,6 +245,8 @@ async def get_account_feeds(
     "/{feed_id}",
     status_code=fastapi.status.HTTP_200_OK,
     description="Update feed",
+    response_model=response.Response[responses_schema.Feed],
+    response_class=serializers.ORJSONResponse,
     responses=registry.get_exception_responses(
         service_exceptions.GetUserIdError,
         service_exceptions.UnauthorizedError,
@@ -218,10 +260,11 @@ async def patch_feed(
     feed_id: pydantic.UUID4 = fastapi.Path(...),
     body: requests_schema.UpdateFeed = fastapi.Body(...),
     account_id: pydantic.StrictStr = fastapi.Depends(security.extract_account_id),
+    image_format: str | None = fastapi.Depends(image_formats.negotiate_image_format),
     mediator: cqrs.RequestMediator = fastapi.Depends(
         dependencies.request_mediator_factory,
     ),
-) -> response.Response[responses_schema.Feed]:
+) -> serializers.ORJSONResponse:
     """
     # Update feed
     """
@@ -233,28 +276,9 @@ async def patch_feed(
             images=body.images,
         ),
     )
-    return response.Response(
-        result=responses_schema.Feed.model_construct(
-            uuid=result.feed.feed_id,
-            account_id=result.feed.account_id,
-            has_followed=result.feed.has_followed,
-            created_at=result.feed.created_at,
-            updated_at=result.feed.updated_at,
-            text=body.text,
-            images=[
-                responses_schema.OrderedImage.model_construct(
-                    image=responses_schema.Image.model_construct(
-                        uuid=image.image_id,
-                        url=image.url,
-                        blurhash=image.blurhash,
-                    ),
-                    order=image.order,
-                )
-                for image in result.feed.images
-            ],
-            likes_count=result.feed.likes_count,
-            views_count=result.feed.views_count,
-        ),
+    return serializers.ORJSONResponse(
+        serializers.envelope(serializers.feed(result.feed, image_format=image_format)),
+        headers=image_formats.VARY_HEADERS,
     )
 
 
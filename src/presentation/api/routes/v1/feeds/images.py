@@ -4,13 +4,53 @@ import pydantic
 from fastapi_app import response
 from fastapi_app.exception_handlers import registry
 
+import settings as app_settings
+from domain.entities import images as images_entity
 from presentation import dependencies
-from presentation.api import limiter, security, settings
+from presentation.api import image_formats, limiter, security, settings, uploads
 from presentation.api.schemas import responses as responses_schema
 from service import exceptions as service_exceptions
-from service.models.commands.images import upload_image as upload_image_model
+from service.helpers.image import perceptual, resized
+from service.models.commands.images import (
+    enqueue_image as enqueue_image_model,
+    presign_upload as presign_upload_model,
+    upload_image as upload_image_model,
+    upload_images as upload_images_model,
+)
+from service.models.queries.images import (
+    find_similar_images as find_similar_images_model,
+    get_image as get_image_model,
+    get_resized_image as get_resized_image_model,
+)
+
+router = fastapi.APIRouter(
+    prefix="/feeds/images",
+    route_class=uploads.LimitedUploadRoute,
+)
+
 
-router = fastapi.APIRouter(prefix="/feeds/images")
+def _variants(
+    variants: tuple[images_entity.ImageVariant, ...],
+) -> list[responses_schema.ImageVariant]:
+    return [
+        responses_schema.ImageVariant.model_construct(
+            width=variant.width,
+            url=variant.url,
+        )
+        for variant in variants
+    ]
+
+
+def _image(image: images_entity.Image, failed: bool = False) -> responses_schema.Image:
+    url, variants = image.in_format(None)
+    return responses_schema.Image.model_construct(
+        uuid=image.image_id,
+        url=url,
+        blurhash=image.blurhash,
+        variants=_variants(variants),
+        ready=image.ready,
+        failed=failed,
+    )
 
 
 @router.post(
@@ -20,12 +60,21 @@ router = fastapi.APIRouter(prefix="/feeds/images")
         service_exceptions.GetUserIdError,
         service_exceptions.UnauthorizedError,
         service_exceptions.ImageAlreadyExists,
+        service_exceptions.UnsupportedImageFormat,
+        service_exceptions.ImageDimensionsTooLarge,
+        service_exceptions.ImageProcessingOverloaded,
+        service_exceptions.ImageProcessingTimeout,
     ),
 )
 @limiter.limiter.limit(settings.api_settings.max_requests_per_ip_limit)
 async def upload_image(
     request: fastapi.Request,
     image: fastapi.UploadFile = fastapi.File(...),
+    processing_async: bool = fastapi.Query(
+        default=False,
+        alias="async",
+        description="Return pending image right away, process it in background",
+    ),
     account_id: pydantic.StrictStr = fastapi.Depends(security.extract_account_id),
     mediator: cqrs.RequestMediator = fastapi.Depends(
         dependencies.request_mediator_factory,
@@ -33,9 +82,18 @@ async def upload_image(
 ) -> response.Response[responses_schema.Image]:
     """
     # Upload image
+
+    In async mode the image is not ready yet: poll its status until it is,
+    meanwhile it can already be posted in feeds
     """
     filename = image.filename
-    image_bytes = await image.read()
+    image_bytes = await uploads.read_image(image)
+
+    if processing_async:
+        enqueued: enqueue_image_model.EnqueueImageResponse = await mediator.send(
+            enqueue_image_model.EnqueueImage(uploader=account_id, image=image_bytes),
+        )
+        return response.Response(result=_image(enqueued.image))
 
     result: upload_image_model.UploadImageResponse = await mediator.send(
         upload_image_model.UploadImage(
@@ -45,10 +103,267 @@ async def upload_image(
         ),
     )
 
+    return response.Response(result=_image(result.image))
+
+
+@router.post(
+    "/batch",
+    status_code=fastapi.status.HTTP_201_CREATED,
+    responses=registry.get_exception_responses(
+        service_exceptions.GetUserIdError,
+        service_exceptions.UnauthorizedError,
+        service_exceptions.ImageAlreadyExists,
+        service_exceptions.UnsupportedImageFormat,
+        service_exceptions.ImageDimensionsTooLarge,
+        service_exceptions.ImageProcessingOverloaded,
+        service_exceptions.ImageProcessingTimeout,
+    ),
+)
+@limiter.limiter.limit(settings.api_settings.max_requests_per_ip_limit)
+async def upload_images(
+    request: fastapi.Request,
+    images: list[fastapi.UploadFile] = fastapi.File(...),
+    account_id: pydantic.StrictStr = fastapi.Depends(security.extract_account_id),
+    mediator: cqrs.RequestMediator = fastapi.Depends(
+        dependencies.request_mediator_factory,
+    ),
+) -> response.Response[list[responses_schema.Image]]:
+    """
+    # Upload several images at once
+
+    Images are returned in the same order as files in the request
+    """
+    if len(images) > settings.api_settings.max_images_per_upload:
+        raise fastapi.HTTPException(
+            status_code=fastapi.status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {settings.api_settings.max_images_per_upload} images per request",
+        )
+
+    result: upload_images_model.UploadImagesResponse = await mediator.send(
+        upload_images_model.UploadImages(
+            uploader=account_id,
+            images=[await uploads.read_image(image) for image in images],
+            concurrency=app_settings.image_processing_settings.workers,
+        ),
+    )
+
+    return response.Response(
+        result=[_image(image) for image in result.images],
+    )
+
+
+@router.post(
+    "/presign",
+    status_code=fastapi.status.HTTP_201_CREATED,
+    responses=registry.get_exception_responses(
+        service_exceptions.GetUserIdError,
+        service_exceptions.UnauthorizedError,
+    ),
+)
+@limiter.limiter.limit(settings.api_settings.max_requests_per_ip_limit)
+async def presign_image_upload(
+    request: fastapi.Request,
+    account_id: pydantic.StrictStr = fastapi.Depends(security.extract_account_id),
+    mediator: cqrs.RequestMediator = fastapi.Depends(
+        dependencies.request_mediator_factory,
+    ),
+) -> response.Response[responses_schema.PresignedImageUpload]:
+    """
+    # Start direct image upload
+
+    POST the image file to `upload_url` as multipart/form-data: `upload_fields`,
+    then the file in field `file`, at most as large as uploads to this API. Then
+    confirm it with `POST /feeds/images/{uuid}/uploaded`. The image can be attached
+    to feeds once it is processed.
+    """
+    result: presign_upload_model.PresignImageUploadResponse = await mediator.send(
+        presign_upload_model.PresignImageUpload(
+            uploader=account_id,
+            max_bytes=settings.api_settings.max_image_bytes,
+        ),
+    )
+    return response.Response(
+        result=responses_schema.PresignedImageUpload.model_construct(
+            uuid=result.image_id,
+            upload_url=result.upload_url,
+            upload_fields=result.upload_fields,
+            expires_in=result.expires_in,
+        ),
+    )
+
+
+@router.post(
+    "/{image_id}/uploaded",
+    status_code=fastapi.status.HTTP_202_ACCEPTED,
+    responses=registry.get_exception_responses(
+        service_exceptions.GetUserIdError,
+        service_exceptions.UnauthorizedError,
+        service_exceptions.ImageNotFound,
+    ),
+)
+@limiter.limiter.limit(settings.api_settings.max_requests_per_ip_limit)
+async def complete_image_upload(
+    request: fastapi.Request,
+    image_id: pydantic.UUID4 = fastapi.Path(...),
+    account_id: pydantic.StrictStr = fastapi.Depends(security.extract_account_id),
+    mediator: cqrs.RequestMediator = fastapi.Depends(
+        dependencies.request_mediator_factory,
+    ),
+) -> None:
+    """
+    # Confirm direct image upload
+
+    Queues the uploaded file for processing
+    """
+    await mediator.send(
+        presign_upload_model.CompleteImageUpload(
+            uploader=account_id,
+            image_id=image_id,
+        ),
+    )
+
+
+@router.get(
+    "/{image_id}/status",
+    status_code=fastapi.status.HTTP_200_OK,
+    responses=registry.get_exception_responses(
+        service_exceptions.GetUserIdError,
+        service_exceptions.UnauthorizedError,
+        service_exceptions.ImageNotFound,
+    ),
+)
+@limiter.limiter.limit(settings.api_settings.max_requests_per_ip_limit)
+async def get_image_status(
+    request: fastapi.Request,
+    image_id: pydantic.UUID4 = fastapi.Path(...),
+    account_id: pydantic.StrictStr = fastapi.Depends(security.extract_account_id),
+    mediator: cqrs.RequestMediator = fastapi.Depends(
+        dependencies.request_mediator_factory,
+    ),
+) -> response.Response[responses_schema.Image]:
+    """
+    # Get uploaded image
+
+    Pending images have ready false until processed, failed ones never become ready
+    """
+    result: get_image_model.GetImageResponse = await mediator.send(
+        get_image_model.GetImage(uploader=account_id, image_id=image_id),
+    )
+    return response.Response(result=_image(result.image, failed=result.failed))
+
+
+@router.get(
+    "/{image_id}/similar",
+    status_code=fastapi.status.HTTP_200_OK,
+    responses=registry.get_exception_responses(
+        service_exceptions.GetUserIdError,
+        service_exceptions.UnauthorizedError,
+        service_exceptions.ImageNotFound,
+    ),
+)
+@limiter.limiter.limit(settings.api_settings.max_requests_per_ip_limit)
+async def find_similar_images(
+    request: fastapi.Request,
+    image_id: pydantic.UUID4 = fastapi.Path(...),
+    max_distance: pydantic.NonNegativeInt = fastapi.Query(
+        default=6,
+        le=perceptual.MAX_DISTANCE,
+        description="Maximum Hamming distance of 64-bit perceptual hashes",
+    ),
+    limit: pydantic.PositiveInt = fastapi.Query(default=20, ge=1, le=100),
+    account_id: pydantic.StrictStr = fastapi.Depends(security.extract_account_id),
+    mediator: cqrs.RequestMediator = fastapi.Depends(
+        dependencies.request_mediator_factory,
+    ),
+) -> response.Response[list[responses_schema.SimilarImage]]:
+    """
+    # Find near-duplicate images
+
+    Resized or recompressed copies of the image among images in feeds and your uploads,
+    nearest first
+    """
+    result: find_similar_images_model.FindSimilarImagesResponse = await mediator.send(
+        find_similar_images_model.FindSimilarImages(
+            account_id=account_id,
+            image_id=image_id,
+            max_distance=max_distance,
+            limit=limit,
+        ),
+    )
     return response.Response(
-        result=responses_schema.Image.model_construct(
-            uuid=result.image.image_id,
-            url=result.image.url,
-            blurhash=result.image.blurhash,
+        result=[
+            responses_schema.SimilarImage.model_construct(
+                image=_image(similar.image),
+                distance=similar.distance,
+            )
+            for similar in result.images
+        ],
+    )
+
+
+@router.get(
+    "/{image_id}",
+    status_code=fastapi.status.HTTP_200_OK,
+    response_class=fastapi.Response,
+    responses={
+        fastapi.status.HTTP_200_OK: {
+            "content": {"image/jpeg": {}, "image/webp": {}, "image/avif": {}},
+        },
+        fastapi.status.HTTP_304_NOT_MODIFIED: {
+            "description": "Image matches If-None-Match",
+        },
+        **registry.get_exception_responses(
+            service_exceptions.ImageNotFound,
+            service_exceptions.ImageProcessingOverloaded,
+            service_exceptions.ImageProcessingTimeout,
+        ),
+    },
+)
+@limiter.limiter.limit(settings.api_settings.max_requests_per_ip_limit)
+async def get_resized_image(
+    request: fastapi.Request,
+    image_id: pydantic.UUID4 = fastapi.Path(...),
+    width: pydantic.PositiveInt | None = fastapi.Query(
+        default=None,
+        alias="w",
+        description="Width to downscale to, rounded up to the nearest allowed one",
+    ),
+    image_format: str | None = fastapi.Depends(image_formats.resized_image_format),
+    if_none_match: str | None = fastapi.Header(default=None, include_in_schema=False),
+    mediator: cqrs.RequestMediator = fastapi.Depends(
+        dependencies.request_mediator_factory,
+    ),
+) -> fastapi.Response:
+    """
+    # Get resized image
+
+    Resized on first request and cached, changes only when the image is processed again:
+    served with strong ETag of its processing, cacheable for a day, then revalidated
+    """
+    width = resized.snap_width(
+        width,
+        app_settings.image_processing_settings.resize_widths,
+    )
+    result: get_resized_image_model.GetResizedImageResponse = await mediator.send(
+        get_resized_image_model.GetResizedImage(
+            image_id=image_id,
+            width=width,
+            image_format=image_format,
+            if_none_match=if_none_match,
         ),
     )
+    headers = {
+        "ETag": result.etag,
+        "Cache-Control": "public, max-age=86400",
+        **image_formats.VARY_HEADERS,
+    }
+    if result.image is None:
+        return fastapi.Response(
+            status_code=fastapi.status.HTTP_304_NOT_MODIFIED,
+            headers=headers,
+        )
+    return fastapi.Response(
+        content=result.image,
+        media_type=result.content_type,
+        headers=headers,
+    )
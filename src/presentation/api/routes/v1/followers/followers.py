@@ -5,7 +5,7 @@ from fastapi_app import response
 from fastapi_app.exception_handlers import registry
 
 from presentation import dependencies
-from presentation.api import limiter, security, settings
+from presentation.api import limiter, security, serializers, settings
 from presentation.api.schemas import (
     pagination,
     requests as requests_schema,
@@ -22,7 +22,7 @@ from service.models.queries.followers import (
     get_following as get_following_model,
 )
 
-router = fastapi.APIRouter(prefix="/followers")
+router = fastapi.APIRouter(prefix="/followers", route_class=serializers.ORJSONRoute)
 
 
 @router.post(
@@ -3,11 +3,11 @@ import fastapi
 import pydantic
 
 from presentation import dependencies
-from presentation.api import limiter, security, settings
+from presentation.api import limiter, security, serializers, settings
 from presentation.api.schemas import requests as requests_schema
 from service.models.commands.views import view_feeds as view_feeds_model
 
-router = fastapi.APIRouter(prefix="/feeds/views")
+router = fastapi.APIRouter(prefix="/feeds/views", route_class=serializers.ORJSONRoute)
 
 
 async def _process_views(
@@ -1,10 +1,50 @@
 import pydantic
 
 
+class ImageVariant(pydantic.BaseModel):
+    width: pydantic.PositiveInt = pydantic.Field(description="Image width, pixels")
+    url: pydantic.StrictStr = pydantic.Field(description="Download image url")
+
+
 class Image(pydantic.BaseModel):
     uuid: pydantic.UUID4 = pydantic.Field(description="Image id")
-    url: pydantic.StrictStr = pydantic.Field(description="Download image url")
+    url: pydantic.StrictStr | None = pydantic.Field(
+        description="Download image url, null until the image is ready",
+    )
     blurhash: pydantic.StrictStr | None = pydantic.Field(description="Blurhash")
+    variants: list[ImageVariant] = pydantic.Field(
+        description="Downscaled copies ascending by width, only narrower than the image",
+        default_factory=list,
+    )
+    ready: bool = pydantic.Field(
+        description="False while the image is processed, url and variants are empty then",
+        default=True,
+    )
+    failed: bool = pydantic.Field(
+        description="Processing failed, the image never becomes ready: upload it again",
+        default=False,
+    )
+
+
+class SimilarImage(pydantic.BaseModel):
+    image: Image = pydantic.Field(description="Image")
+    distance: pydantic.NonNegativeInt = pydantic.Field(
+        description="Hamming distance of perceptual hashes, 0 for visually identical",
+    )
+
+
+class PresignedImageUpload(pydantic.BaseModel):
+    uuid: pydantic.UUID4 = pydantic.Field(description="Image id")
+    upload_url: pydantic.StrictStr = pydantic.Field(
+        description="URL to POST the image file to as multipart/form-data",
+    )
+    upload_fields: dict[str, str] = pydantic.Field(
+        description="Form fields to POST before the file, sent in field `file`",
+        default_factory=dict,
+    )
+    expires_in: pydantic.PositiveInt = pydantic.Field(
+        description="Upload URL lifetime, seconds",
+    )
 
 
 class OrderedImage(pydantic.BaseModel):
@@ -0,0 +1,115 @@
+"""
+Serializers writing response bytes with orjson directly from domain entities,
+bypassing pydantic response models. Output matches pydantic serialization of
+presentation.api.schemas.responses wrapped into fastapi_app.response.Response.
+"""
+
+import typing
+
+import fastapi
+import orjson
+from fastapi import responses, routing
+
+from domain.entities import feed as feed_entity
+from presentation.api.schemas import pagination
+from service.helpers.feeds import fragments
+
+
+class ORJSONResponse(responses.JSONResponse):
+    def render(self, content: typing.Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=fragments.json_default,
+            option=fragments.DUMPS_OPTIONS,
+        )
+
+
+class ORJSONRequest(fastapi.Request):
+    async def json(self) -> typing.Any:
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(routing.APIRoute):
+    """Route parsing JSON request bodies with orjson"""
+
+    def get_route_handler(self) -> typing.Callable[[fastapi.Request], typing.Coroutine]:
+        route_handler = super().get_route_handler()
+
+        async def orjson_route_handler(request: fastapi.Request) -> responses.Response:
+            return await route_handler(ORJSONRequest(request.scope, request.receive))
+
+        return orjson_route_handler
+
+
+def envelope(result: typing.Any) -> dict[str, typing.Any]:
+    """Wraps result the same way fastapi_app.response.Response does"""
+    return {"result": result}
+
+
+def feed(
+    entity: feed_entity.Feed,
+    account_id: str | None = None,
+    image_format: str | None = None,
+) -> dict[str, typing.Any]:
+    """
+    Serializes feed as responses_schema.Feed (with computed images_count),
+    image URLs are of image_format encoding where the image has one
+    """
+    images = [fragments.ordered_image(image, image_format) for image in entity.images]
+    return {
+        "uuid": entity.feed_id,
+        "account_id": entity.account_id if account_id is None else account_id,
+        "has_followed": entity.has_followed,
+        "created_at": entity.created_at,
+        "updated_at": entity.updated_at,
+        "text": entity.text,
+        "images": images,
+        "has_liked": entity.has_liked,
+        "likes_count": entity.likes_count,
+        "views_count": entity.views_count,
+        "images_count": len(images),
+    }
+
+
+def feeds(items: typing.Sequence[typing.Any]) -> dict[str, typing.Any]:
+    """
+    Serializes already serialized feeds as responses_schema.Feeds (with computed total_count)
+    """
+    return {"items": items, "total_count": len(items)}
+
+
+def page(
+    items: typing.Sequence[typing.Any],
+    limit: int,
+    offset: int,
+    count: int,
+) -> dict[str, typing.Any]:
+    """
+    Serializes already serialized items as pagination.Pagination
+    """
+    model = pagination.Pagination.model_construct(
+        url="",
+        base_items=items,
+        limit=limit,
+        offset=offset,
+        count=count,
+    )
+    return {
+        "limit": model.limit,
+        "offset": model.offset,
+        "count": model.count,
+        "items": list(model.items),
+        "next": model.next,
+        "previous": model.previous,
+    }
+
+
+def feed_fragments(
+    feeds_json: typing.Sequence[str] | typing.Sequence[bytes],
+) -> list[orjson.Fragment]:
+    """
+    Wraps already rendered feeds JSON to be spliced into response as is
+    """
+    return [orjson.Fragment(feed_json) for feed_json in feeds_json]
@@ -8,6 +8,34 @@ dotenv.load_dotenv()
 class Api(pydantic_settings.BaseSettings):
     max_profiles: int = pydantic.Field(default=100)
     max_requests_per_ip_limit: str = pydantic.Field(default="100/minute")
+    feeds_json_passthrough: bool = pydantic.Field(
+        default=False,
+        description="Render GET /feeds responses in Postgres and stream them as is",
+    )
+    feeds_fragments_cache: bool = pydantic.Field(
+        default=False,
+        description="Assemble GET /feeds responses from cached feed JSON fragments",
+    )
+    max_images_per_upload: int = pydantic.Field(
+        default=10,
+        description="Maximum number of files in one POST /feeds/images/batch request",
+    )
+    max_image_bytes: int = pydantic.Field(
+        default=20 * 1024 * 1024,
+        description="Maximum size of one uploaded image file",
+    )
+    max_upload_bytes: int = pydantic.Field(
+        default=64 * 1024 * 1024,
+        description="Maximum request body size of image upload endpoints, checked while reading",
+    )
+    upload_spool_bytes: int = pydantic.Field(
+        default=1024 * 1024,
+        description="Uploaded files larger than this are spooled to a temporary file",
+    )
+    mediator_queries_fast_path: bool = pydantic.Field(
+        default=True,
+        description="Send queries straight to reused handlers, bypassing mediator pipeline",
+    )
 
 
 api_settings = Api()
@@ -0,0 +1,79 @@
+"""
+Image uploads read with bounded memory. Request bodies over the limit are rejected
+before they are read, uploaded files are spooled to disk by the multipart parser
+and checked by their header before being read in full.
+"""
+
+import typing
+
+import fastapi
+from fastapi import responses, routing
+
+import settings as app_settings
+from presentation.api import settings
+from service.helpers.image import header
+
+# Enough for image headers after typical EXIF and ICC profile segments
+_HEADER_BYTES = 256 * 1024
+
+
+def _too_large(max_bytes: int) -> fastapi.HTTPException:
+    return fastapi.HTTPException(
+        status_code=fastapi.status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Upload is larger than {max_bytes} bytes",
+    )
+
+
+class LimitedUploadRoute(routing.APIRoute):
+    """
+    Route rejecting request bodies larger than max_upload_bytes: by Content-Length
+    up front, or as soon as that many bytes of a chunked body are received
+    """
+
+    def get_route_handler(self) -> typing.Callable[[fastapi.Request], typing.Coroutine]:
+        route_handler = super().get_route_handler()
+        max_bytes = settings.api_settings.max_upload_bytes
+
+        async def limited_upload_route_handler(
+            request: fastapi.Request,
+        ) -> responses.Response:
+            content_length = request.headers.get("content-length", "")
+            if content_length.isdigit() and int(content_length) > max_bytes:
+                raise _too_large(max_bytes)
+
+            received = 0
+
+            async def receive() -> typing.MutableMapping[str, typing.Any]:
+                nonlocal received
+                message = await request.receive()
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    raise _too_large(max_bytes)
+                return message
+
+            return await route_handler(fastapi.Request(request.scope, receive))
+
+        return limited_upload_route_handler
+
+
+async def read_image(upload: fastapi.UploadFile) -> bytes:
+    """
+    Reads uploaded image of at most max_image_bytes. Magic bytes and declared dimensions
+    are checked on the first bytes, so a decompression bomb or a non-image file
+    is rejected without reading it.
+    :raises UnsupportedImageFormat: if the file is not an image of accepted format
+    :raises ImageDimensionsTooLarge: if the image declares too many pixels
+    """
+    max_bytes = settings.api_settings.max_image_bytes
+    max_pixels = app_settings.image_processing_settings.max_pixels
+    if upload.size is not None and upload.size > max_bytes:
+        raise _too_large(max_bytes)
+
+    head = await upload.read(_HEADER_BYTES)
+    checked = header.check(head, max_pixels, complete=len(head) < _HEADER_BYTES)
+    image = head + await upload.read(max_bytes + 1 - len(head))
+    if len(image) > max_bytes:
+        raise _too_large(max_bytes)
+    if not checked:
+        header.check(image, max_pixels)
+    return image
@@ -0,0 +1,175 @@
+"""
+Benchmarks blurhash of the generated fixture corpus of benchmark_images: the reference
+pure Python downsampling and blurhash.encode against the vectorized ones, on the same
+decoded pixels of every processed JPEG. Checks hashes are bit-for-bit identical.
+
+Run from src/: python -m presentation.cli.benchmark_blurhash [options]
+"""
+
+import argparse
+import io
+import logging
+import typing
+
+import blurhash as reference_blurhash
+import dotenv
+import numpy as np
+import simplejpeg
+
+import settings
+from infrastructure.services import image_processor
+from presentation.cli import benchmark_images, benchmarking
+from service.helpers.image import blurhash, transcode
+
+dotenv.load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+ENCODERS = ("reference", "vectorized")
+
+
+def reference_generate_blurhash(rgb_data: np.ndarray) -> str:
+    """Blurhash before vectorization: per pixel nearest-neighbour loop and blurhash.encode"""
+    height, width = rgb_data.shape[:2]
+    height_scale = height / blurhash.RESOLUTION
+    width_scale = width / blurhash.RESOLUTION
+    resized_image = np.empty(
+        (blurhash.RESOLUTION, blurhash.RESOLUTION, 3),
+        dtype=np.uint8,
+    )
+    for y in range(blurhash.RESOLUTION):
+        for x in range(blurhash.RESOLUTION):
+            resized_image[y, x] = rgb_data[int(y * height_scale), int(x * width_scale)][
+                :3
+            ]
+    return reference_blurhash.encode(
+        resized_image,
+        blurhash.COMPONENTS_X,
+        blurhash.COMPONENTS_Y,
+    )
+
+
+def decoded_corpus(seed: int, fixtures: list[str]) -> dict[str, np.ndarray]:
+    """Full size pixels of every fixture processed into JPEG"""
+    policy = image_processor._jpeg_policy(settings.image_processing_settings)
+    corpus = benchmark_images.generate_fixtures(seed)
+    return {
+        fixture: simplejpeg.decode_jpeg(
+            transcode.transcode_to_jpeg(io.BytesIO(corpus[fixture]), policy).getvalue(),
+        )
+        for fixture in fixtures
+    }
+
+
+def measure(
+    encoder: str,
+    fixture: str,
+    rgb_data: np.ndarray,
+    repeats: int,
+) -> dict[str, typing.Any]:
+    generate = (
+        reference_generate_blurhash
+        if encoder == "reference"
+        else blurhash.generate_blurhash_from_rgb
+    )
+    wall, cpu, value = benchmarking.timed(lambda: generate(rgb_data), repeats)
+    return {
+        "encoder": encoder,
+        "fixture": fixture,
+        "height": rgb_data.shape[0],
+        "width": rgb_data.shape[1],
+        "repeats": repeats,
+        "latency_ms": benchmarking.latency_ms(wall),
+        "cpu_ms": 1000 * sum(cpu) / len(cpu),
+        "blurhash": value,
+    }
+
+
+def _references(
+    results: list[dict[str, typing.Any]],
+) -> dict[str, dict[str, typing.Any]]:
+    return {
+        result["fixture"]: result
+        for result in results
+        if result["encoder"] == "reference"
+    }
+
+
+def _print_results(
+    results: list[dict[str, typing.Any]],
+    baseline: dict[tuple, dict[str, typing.Any]],
+) -> None:
+    reference = _references(results)
+    print(
+        f"{'encoder':<12}{'fixture':<20}{'p50 ms':>10}{'p95 ms':>10}{'speedup':>9}"
+        f"{'identical':>11}{'p50 vs base':>13}",
+    )
+    for result in results:
+        compared = reference.get(result["fixture"])
+        speedup = (
+            f"{compared['latency_ms']['p50'] / result['latency_ms']['p50']:.1f}x"
+            if compared
+            else "-"
+        )
+        identical = str(result["blurhash"] == compared["blurhash"]) if compared else "-"
+        print(
+            f"{result['encoder']:<12}{result['fixture']:<20}"
+            f"{result['latency_ms']['p50']:>10.2f}{result['latency_ms']['p95']:>10.2f}"
+            f"{speedup:>9}{identical:>11}"
+            f"{benchmarking.p50_change(result, baseline, 'encoder', 'fixture'):>13}",
+        )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark blurhash generation")
+    parser.add_argument(
+        "--encoders",
+        nargs="+",
+        choices=ENCODERS,
+        default=list(ENCODERS),
+    )
+    parser.add_argument(
+        "--fixtures",
+        nargs="+",
+        choices=tuple(benchmark_images.FIXTURES),
+        default=list(benchmark_images.FIXTURES),
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="seed of the generated corpus",
+    )
+    benchmarking.add_arguments(parser, output="benchmark_blurhash.json", repeats=5)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    corpus = decoded_corpus(args.seed, args.fixtures)
+    baseline = benchmarking.read_baseline(args.compare, "encoder", "fixture")
+
+    results = []
+    for fixture, rgb_data in corpus.items():
+        for encoder in args.encoders:
+            logger.info(f"Measuring {encoder} blurhash of {fixture}")
+            results.append(measure(encoder, fixture, rgb_data, args.repeats))
+
+    benchmarking.write_results(
+        args.output,
+        benchmarking.environment(seed=args.seed),
+        results,
+    )
+    _print_results(results, baseline)
+    reference = _references(results)
+    if any(
+        result["fixture"] in reference
+        and result["blurhash"] != reference[result["fixture"]]["blurhash"]
+        for result in results
+    ):
+        raise SystemExit("Blurhash differs from the reference")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.Logging().LEVEL)
+    main()
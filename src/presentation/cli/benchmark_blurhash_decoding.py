@@ -0,0 +1,166 @@
+"""
+Benchmarks memory of blurhash in the upload path on the fixture corpus of benchmark_images:
+transcoding followed by blurhash of a full size decode of the processed JPEG, as before,
+of a DCT scaled decode, and of the preview handed over by transcoding, as uploads do now.
+
+Every decoder and fixture is measured in a fresh process, so its peak RSS is the one of
+a single upload. Traced peak and time are of the blurhash step alone, after a warmup.
+
+Run from src/: python -m presentation.cli.benchmark_blurhash_decoding [options]
+"""
+
+import argparse
+import concurrent.futures
+import io
+import logging
+import multiprocessing
+import multiprocessing.forkserver
+import time
+import tracemalloc
+import typing
+
+import dotenv
+import numpy as np
+import simplejpeg
+
+import settings
+from infrastructure.services import image_processor
+from presentation.cli import benchmark_images, benchmarking
+from service.helpers.image import blurhash, transcode
+
+dotenv.load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DECODERS = ("full", "scaled", "preview")
+
+
+def _upload(decoder: str, image: bytes) -> tuple[typing.Callable[[], str], int]:
+    """Transcodes the image, returns its blurhash step and processed JPEG size"""
+    policy = image_processor._jpeg_policy(settings.image_processing_settings)
+    if decoder == "preview":
+        transcoded, preview, _ = transcode.transcode_to_jpeg_with_preview(
+            io.BytesIO(image),
+            preview_min_size=blurhash.RESOLUTION,
+            policy=policy,
+        )
+        return lambda: blurhash.generate_blurhash_from_rgb(
+            preview,
+        ), transcoded.getbuffer().nbytes
+
+    jpeg = transcode.transcode_to_jpeg(io.BytesIO(image), policy).getvalue()
+    if decoder == "scaled":
+        return lambda: blurhash.generate_blurhash_from_jpeg(jpeg), len(jpeg)
+
+    def full() -> str:
+        rgb_data: np.ndarray = simplejpeg.decode_jpeg(jpeg)
+        return blurhash.generate_blurhash_from_rgb(rgb_data)
+
+    return full, len(jpeg)
+
+
+def measure(decoder: str, fixture: str, image: bytes) -> dict[str, typing.Any]:
+    """Runs in a fresh process: peak RSS covers one upload of this fixture"""
+    generate, jpeg_bytes = _upload(decoder, image)
+    generate()
+    tracemalloc.start()
+    started = time.perf_counter()
+    value = generate()
+    elapsed = time.perf_counter() - started
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "decoder": decoder,
+        "fixture": fixture,
+        "jpeg_bytes": jpeg_bytes,
+        "blurhash_ms": 1000 * elapsed,
+        "blurhash_traced_peak_bytes": traced_peak,
+        "peak_rss_bytes": benchmarking.peak_rss_bytes(),
+        "blurhash": value,
+    }
+
+
+def _print_results(
+    results: list[dict[str, typing.Any]],
+    baseline: dict[tuple, dict[str, typing.Any]],
+) -> None:
+    print(
+        f"{'decoder':<9}{'fixture':<20}{'blurhash ms':>13}{'traced MiB':>12}{'RSS MiB':>9}"
+        f"{'RSS vs base':>13}",
+    )
+    for result in results:
+        compared = baseline.get((result["decoder"], result["fixture"]))
+        change = (
+            f"{result['peak_rss_bytes'] / compared['peak_rss_bytes'] - 1:+.1%}"
+            if compared
+            else "-"
+        )
+        print(
+            f"{result['decoder']:<9}{result['fixture']:<20}{result['blurhash_ms']:>13.2f}"
+            f"{result['blurhash_traced_peak_bytes'] / 2**20:>12.2f}"
+            f"{result['peak_rss_bytes'] / 2**20:>9.0f}{change:>13}",
+        )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark memory of blurhash decoding",
+    )
+    parser.add_argument(
+        "--decoders",
+        nargs="+",
+        choices=DECODERS,
+        default=list(DECODERS),
+    )
+    parser.add_argument(
+        "--fixtures",
+        nargs="+",
+        choices=tuple(benchmark_images.FIXTURES),
+        default=list(benchmark_images.FIXTURES),
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="seed of the generated corpus",
+    )
+    benchmarking.add_arguments(parser, output="benchmark_blurhash_decoding.json")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    # Measuring processes are forked from the server started before the corpus is generated
+    context = multiprocessing.get_context("forkserver")
+    multiprocessing.forkserver.ensure_running()
+    fixtures = benchmark_images.generate_fixtures(args.seed)
+    baseline = benchmarking.read_baseline(args.compare, "decoder", "fixture")
+
+    results = []
+    for fixture in args.fixtures:
+        for decoder in args.decoders:
+            logger.info(f"Measuring {decoder} decoding of {fixture}")
+            with concurrent.futures.ProcessPoolExecutor(
+                1,
+                mp_context=context,
+            ) as executor:
+                results.append(
+                    executor.submit(
+                        measure,
+                        decoder,
+                        fixture,
+                        fixtures[fixture],
+                    ).result(),
+                )
+
+    benchmarking.write_results(
+        args.output,
+        benchmarking.environment(seed=args.seed),
+        results,
+    )
+    _print_results(results, baseline)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.Logging().LEVEL)
+    main()
@@ -0,0 +1,159 @@
+"""
+Benchmarks per-request dependency resolution of the IAM service and request handlers:
+solving the graph and entering scopes on every request, as security and the mediator
+did before, against the compiled container.
+
+Runs offline: nothing connects on resolve, the Postgres pool is a placeholder.
+
+Run from src/: python -m presentation.cli.benchmark_dependencies [options]
+"""
+
+import argparse
+import asyncio
+import logging
+import typing
+from importlib import metadata
+
+import asyncpg
+import di
+import dotenv
+from cqrs.requests import map as request_map
+from di import dependent, executors
+
+import settings
+from infrastructure import dependencies
+from infrastructure.persistent.postgres import connection as postgres_connection
+from presentation.cli import benchmarking
+from service import mapping
+from service.interfaces.services import iam_service as iam_service_interface
+
+dotenv.load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+RESOLVERS = ("solve", "compiled")
+
+
+async def _solve_per_request(container: di.Container, type_: type) -> typing.Any:
+    """Dependency resolution before the compiled container"""
+    executor = executors.AsyncExecutor()
+    solved = container.solve(
+        dependent.Dependent(type_, scope="request"),
+        scopes=dependencies.SCOPES,
+    )
+    with container.enter_scope("app") as app_state:
+        async with container.enter_scope("request", state=app_state) as state:
+            return await solved.execute_async(executor=executor, state=state)
+
+
+def resolved_types(names: list[str] | None = None) -> dict[str, type]:
+    """IAM service and handlers of every request in service.mapping"""
+    requests = request_map.RequestMap()
+    mapping.init_requests(requests)
+    mapping.init_queries(requests)
+    types: dict[str, type] = {"IAMService": iam_service_interface.IAMService}
+    types.update(
+        (handler.__name__, handler)
+        for handler in requests.values()
+        if isinstance(handler, type)
+    )
+    return {name: types[name] for name in names} if names else types
+
+
+async def measure(
+    resolver: str,
+    name: str,
+    type_: type,
+    repeats: int,
+) -> dict[str, typing.Any]:
+    if resolver == "solve":
+        container = dependencies.container
+        wall, cpu, _ = await benchmarking.timed_async(
+            lambda: _solve_per_request(container, type_),
+            repeats,
+        )
+    else:
+        compiled = dependencies.compiled_container
+        wall, cpu, _ = await benchmarking.timed_async(
+            lambda: compiled.resolve(type_),
+            repeats,
+        )
+    return {
+        "resolver": resolver,
+        "type": name,
+        "repeats": repeats,
+        "latency_ms": benchmarking.latency_ms(wall),
+        "cpu_ms": 1000 * sum(cpu) / len(cpu),
+    }
+
+
+def _print_results(
+    results: list[dict[str, typing.Any]],
+    baseline: dict[tuple, dict[str, typing.Any]],
+) -> None:
+    print(f"{'resolver':<10}{'type':<32}{'p50 us':>9}{'p95 us':>9}{'p50 vs base':>13}")
+    for result in results:
+        print(
+            f"{result['resolver']:<10}{result['type']:<32}"
+            f"{1000 * result['latency_ms']['p50']:>9.1f}{1000 * result['latency_ms']['p95']:>9.1f}"
+            f"{benchmarking.p50_change(result, baseline, 'resolver', 'type'):>13}",
+        )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark per-request dependency resolution",
+    )
+    parser.add_argument(
+        "--resolvers",
+        nargs="+",
+        choices=RESOLVERS,
+        default=list(RESOLVERS),
+    )
+    parser.add_argument(
+        "--types",
+        nargs="+",
+        choices=tuple(resolved_types()),
+        default=None,
+        help="resolved types, all by default",
+    )
+    benchmarking.add_arguments(
+        parser,
+        output="benchmark_dependencies.json",
+        repeats=2_000,
+    )
+    return parser.parse_args()
+
+
+async def _measure_all(args: argparse.Namespace) -> list[dict[str, typing.Any]]:
+    results = []
+    for name, type_ in resolved_types(args.types).items():
+        for resolver in args.resolvers:
+            logger.info(f"Measuring {resolver} resolution of {name}")
+            results.append(await measure(resolver, name, type_, args.repeats))
+    return results
+
+
+def main() -> None:
+    args = _parse_args()
+    # Handlers get the pool through UoW factory, which does not touch it until a request
+    postgres_connection._pool = typing.cast(asyncpg.Pool, object())
+    baseline = benchmarking.read_baseline(args.compare, "resolver", "type")
+
+    try:
+        results = asyncio.run(_measure_all(args))
+    finally:
+        dependencies.compiled_container.close()
+        postgres_connection._pool = None
+
+    benchmarking.write_results(
+        args.output,
+        benchmarking.environment(di=metadata.version("di")),
+        results,
+    )
+    _print_results(results, baseline)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.Logging().LEVEL)
+    main()
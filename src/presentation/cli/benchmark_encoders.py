@@ -0,0 +1,230 @@
+"""
+Benchmarks encoder speed and size of modern formats on the fixture corpus of
+benchmark_images, to choose quality and effort settings: every WebP and AVIF setting of
+the grid against JPEG of the configured policy, on the same upright image stored
+for the upload. PSNR against that image stands in for perceived quality.
+
+AVIF is measured only when installed Pillow can encode it.
+
+Run from src/: python -m presentation.cli.benchmark_encoders [options]
+"""
+
+import argparse
+import io
+import itertools
+import logging
+import typing
+
+import dotenv
+import numpy as np
+import PIL
+import PIL.Image
+
+import settings
+from infrastructure.services import image_processor
+from presentation.cli import benchmark_images, benchmarking
+from service.helpers.image import formats, transcode
+
+dotenv.load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+JPEG = "jpeg"
+
+# Pillow option of encoder effort by format
+_EFFORT_OPTIONS = {formats.WEBP: "method", formats.AVIF: "speed"}
+
+
+def _psnr(reference: np.ndarray, encoded: bytes) -> float:
+    with PIL.Image.open(io.BytesIO(encoded)) as image:
+        decoded = np.asarray(image.convert("RGB"), dtype=np.float64)
+    mse = float(np.mean((reference.astype(np.float64) - decoded) ** 2))
+    return 10 * np.log10(255**2 / mse) if mse else float("inf")
+
+
+def settings_grid(args: argparse.Namespace) -> list[tuple[str, int | None, int | None]]:
+    """(format, quality, effort) to measure, JPEG with the configured policy first"""
+    grid: list[tuple[str, int | None, int | None]] = [(JPEG, None, None)]
+    for image_format, qualities, efforts in (
+        (formats.WEBP, args.webp_qualities, args.webp_methods),
+        (formats.AVIF, args.avif_qualities, args.avif_speeds),
+    ):
+        if image_format not in args.formats:
+            continue
+        if not formats.available(image_format):
+            logger.warning(f"Installed Pillow cannot encode {image_format}, skipped")
+            continue
+        grid.extend(
+            (image_format, quality, effort)
+            for quality, effort in itertools.product(qualities, efforts)
+        )
+    return grid
+
+
+def measure(
+    image_format: str,
+    quality: int | None,
+    effort: int | None,
+    fixture: str,
+    rgb_image: PIL.Image.Image,
+    repeats: int,
+) -> dict[str, typing.Any]:
+    if image_format == JPEG:
+        policy = image_processor._jpeg_policy(settings.image_processing_settings)
+
+        def encode() -> bytes:
+            return transcode.encode_jpeg(rgb_image, policy)
+
+    else:
+        options = {"quality": quality, _EFFORT_OPTIONS[image_format]: effort}
+
+        def encode() -> bytes:
+            return formats.encode(rgb_image, image_format, options)
+
+    wall, cpu, encoded = benchmarking.timed(encode, repeats)
+    return {
+        "format": image_format,
+        "quality": quality,
+        "effort": effort,
+        "fixture": fixture,
+        "width": rgb_image.width,
+        "height": rgb_image.height,
+        "repeats": repeats,
+        "latency_ms": benchmarking.latency_ms(wall),
+        "cpu_ms": 1000 * sum(cpu) / len(cpu),
+        "output_bytes": len(encoded),
+        "psnr_db": _psnr(np.asarray(rgb_image), encoded),
+    }
+
+
+def _print_results(
+    results: list[dict[str, typing.Any]],
+    baseline: dict[tuple, dict[str, typing.Any]],
+) -> None:
+    jpeg_bytes = {
+        result["fixture"]: result["output_bytes"]
+        for result in results
+        if result["format"] == JPEG
+    }
+    print(
+        f"{'format':<7}{'quality':>8}{'effort':>7}  {'fixture':<20}{'p50 ms':>10}{'KiB':>8}"
+        f"{'vs JPEG':>9}{'PSNR dB':>9}{'p50 vs base':>13}",
+    )
+    for result in results:
+        jpeg = jpeg_bytes.get(result["fixture"])
+        versus_jpeg = f"{result['output_bytes'] / jpeg - 1:+.0%}" if jpeg else "-"
+        change = benchmarking.p50_change(
+            result,
+            baseline,
+            "format",
+            "quality",
+            "effort",
+            "fixture",
+        )
+        print(
+            f"{result['format']:<7}{result['quality'] or '-':>8}{result['effort'] or '-':>7}  "
+            f"{result['fixture']:<20}{result['latency_ms']['p50']:>10.1f}"
+            f"{result['output_bytes'] / 1024:>8.0f}"
+            f"{versus_jpeg:>9}"
+            f"{result['psnr_db']:>9.2f}{change:>13}",
+        )
+
+
+def _parse_args() -> argparse.Namespace:
+    image_processing_settings = settings.image_processing_settings
+    parser = argparse.ArgumentParser(
+        description="Benchmark image encoders speed and size",
+    )
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=tuple(formats.EXTENSIONS),
+        default=list(formats.EXTENSIONS),
+    )
+    parser.add_argument(
+        "--webp-qualities",
+        nargs="+",
+        type=int,
+        default=sorted({70, image_processing_settings.webp_quality, 90}),
+    )
+    parser.add_argument(
+        "--webp-methods",
+        nargs="+",
+        type=int,
+        default=sorted({image_processing_settings.webp_method, 6}),
+    )
+    parser.add_argument(
+        "--avif-qualities",
+        nargs="+",
+        type=int,
+        default=sorted({50, image_processing_settings.avif_quality, 70}),
+    )
+    parser.add_argument(
+        "--avif-speeds",
+        nargs="+",
+        type=int,
+        default=sorted({image_processing_settings.avif_speed, 8}),
+    )
+    parser.add_argument(
+        "--fixtures",
+        nargs="+",
+        choices=tuple(benchmark_images.FIXTURES),
+        default=list(benchmark_images.FIXTURES),
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="seed of the generated corpus",
+    )
+    benchmarking.add_arguments(parser, output="benchmark_encoders.json", repeats=3)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    max_long_edge = settings.image_processing_settings.max_long_edge
+    corpus = benchmark_images.generate_fixtures(args.seed)
+    grid = settings_grid(args)
+    baseline = benchmarking.read_baseline(
+        args.compare,
+        "format",
+        "quality",
+        "effort",
+        "fixture",
+    )
+
+    results = []
+    for fixture in args.fixtures:
+        # The upright image stored for the upload, every encoding is made of it
+        rgb_image, _ = transcode._open_rgb(io.BytesIO(corpus[fixture]), max_long_edge)
+        for image_format, quality, effort in grid:
+            logger.info(
+                f"Measuring {image_format} q{quality} effort {effort} of {fixture}",
+            )
+            results.append(
+                measure(
+                    image_format,
+                    quality,
+                    effort,
+                    fixture,
+                    rgb_image,
+                    args.repeats,
+                ),
+            )
+
+    benchmarking.write_results(
+        args.output,
+        benchmarking.environment(
+            pillow=PIL.__version__,
+            seed=args.seed,
+            avif=formats.available(formats.AVIF),
+        ),
+        results,
+    )
+    _print_results(results, baseline)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.Logging().LEVEL)
+    main()
@@ -0,0 +1,279 @@
+"""
+Benchmarks token validation by HttpIAMService against a local stand-in IAM server:
+a new client per request, as the service did before, against the shared pooled client
+with the validated tokens cache off and on. Concurrent requests cycle through a set of
+distinct tokens, so concurrent validations of one token are coalesced.
+
+The stand-in serves plain HTTP with a configured latency and counts requests and
+connections. Without TLS, a new connection per request costs less than in production.
+
+Run from src/: python -m presentation.cli.benchmark_iam [options]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+import typing
+
+import dotenv
+import httpx
+import orjson
+
+import settings
+from infrastructure.services import iam_service
+from presentation.cli import benchmarking
+
+dotenv.load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+CLIENTS = ("per_request", "pooled", "pooled_cached")
+
+
+class StandInIAM:
+    """HTTP/1.1 keep-alive server answering every validation with the token's user id"""
+
+    def __init__(self, latency: float) -> None:
+        self._latency = latency
+        self._server: asyncio.Server | None = None
+        self._connections: set[asyncio.Task] = set()
+        self.requests = 0
+        self.connections = 0
+
+    @property
+    def endpoint(self) -> str:
+        assert self._server is not None
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/v1/validate"
+
+    async def __aenter__(self) -> typing.Self:
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        assert self._server is not None
+        self._server.close()
+        # Connections end once clients close them
+        await asyncio.gather(*self._connections)
+        await self._server.wait_closed()
+
+    async def _serve(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        self.connections += 1
+        connection = asyncio.current_task()
+        assert connection is not None
+        self._connections.add(connection)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                self.requests += 1
+                token = b""
+                for line in head.split(b"\r\n"):
+                    name, _, value = line.partition(b":")
+                    if name.lower() == b"authorization":
+                        token = value.strip().removeprefix(b"Bearer ")
+                await asyncio.sleep(self._latency)
+                body = orjson.dumps(
+                    {"result": {"user_id": f"user-{token[-8:].decode()}"}},
+                )
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: %d\r\n\r\n%s" % (len(body), body),
+                )
+                await writer.drain()
+        finally:
+            writer.close()
+            self._connections.discard(connection)
+
+
+async def _per_request_get_user_id(endpoint: str, token: str) -> str:
+    """HttpIAMService before the shared client: a new client and connection per request"""
+    async with httpx.AsyncClient() as client:
+        response = await client.get(
+            endpoint,
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {token}",
+            },
+            timeout=30.0,
+        )
+    response.raise_for_status()
+    return orjson.loads(response.content)["result"]["user_id"]
+
+
+def _get_user_id(
+    client: str,
+    endpoint: str,
+) -> typing.Callable[[str], typing.Awaitable[str]]:
+    if client == "per_request":
+        return lambda token: _per_request_get_user_id(endpoint, token)
+    service = iam_service.HttpIAMService()
+    service.VALIDATE_TOKEN_ENDPOINT = endpoint
+    service._cache = iam_service.VerifiedTokensCache(
+        max_size=settings.iam_settings.cache_max_size
+        if client == "pooled_cached"
+        else 0,
+        ttl_seconds=settings.iam_settings.cache_ttl_seconds,
+    )
+    return service.get_user_id
+
+
+async def _run(
+    client: str,
+    concurrency: int,
+    tokens: int,
+    requests: int,
+    latency: float,
+) -> tuple[list[float], float, StandInIAM]:
+    issued = [f"token-{index:08d}" for index in range(tokens)]
+    wall: list[float] = []
+
+    async with StandInIAM(latency) as iam:
+        get_user_id = _get_user_id(client, iam.endpoint)
+
+        async def worker(first: int) -> None:
+            for index in range(first, requests, concurrency):
+                started = time.perf_counter()
+                await get_user_id(issued[index % tokens])
+                wall.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(worker(first) for first in range(concurrency)))
+        finally:
+            await iam_service.close_http_client()
+        elapsed = time.perf_counter() - started
+    return wall, elapsed, iam
+
+
+def measure(
+    client: str,
+    concurrency: int,
+    tokens: int,
+    requests: int,
+    latency: float,
+) -> dict[str, typing.Any]:
+    wall, elapsed, iam = asyncio.run(
+        _run(client, concurrency, tokens, requests, latency),
+    )
+    return {
+        "client": client,
+        "concurrency": concurrency,
+        "tokens": tokens,
+        "requests": requests,
+        "iam_latency_ms": 1000 * latency,
+        "latency_ms": benchmarking.latency_ms(wall),
+        "requests_per_second": requests / elapsed,
+        "iam_requests": iam.requests,
+        "iam_connections": iam.connections,
+    }
+
+
+def _print_results(
+    results: list[dict[str, typing.Any]],
+    baseline: dict[tuple, dict[str, typing.Any]],
+) -> None:
+    print(
+        f"{'client':<15}{'conc':>6}{'p50 ms':>9}{'p95 ms':>9}{'req/s':>9}{'IAM req':>9}"
+        f"{'IAM conn':>10}{'p50 vs base':>13}",
+    )
+    for result in results:
+        change = benchmarking.p50_change(
+            result,
+            baseline,
+            "client",
+            "concurrency",
+            "tokens",
+        )
+        print(
+            f"{result['client']:<15}{result['concurrency']:>6}"
+            f"{result['latency_ms']['p50']:>9.2f}{result['latency_ms']['p95']:>9.2f}"
+            f"{result['requests_per_second']:>9.0f}{result['iam_requests']:>9}"
+            f"{result['iam_connections']:>10}{change:>13}",
+        )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark token validation in IAM")
+    parser.add_argument("--clients", nargs="+", choices=CLIENTS, default=list(CLIENTS))
+    parser.add_argument(
+        "--concurrency",
+        nargs="+",
+        type=int,
+        default=[1, 50],
+        help="concurrent requests",
+    )
+    parser.add_argument(
+        "--tokens",
+        type=int,
+        default=100,
+        help="distinct tokens in requests",
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=2_000,
+        help="requests to measure",
+    )
+    parser.add_argument(
+        "--iam-latency-ms",
+        type=float,
+        default=5.0,
+        help="stand-in IAM response time",
+    )
+    benchmarking.add_arguments(parser, output="benchmark_iam.json")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    baseline = benchmarking.read_baseline(
+        args.compare,
+        "client",
+        "concurrency",
+        "tokens",
+    )
+
+    results = []
+    for client in args.clients:
+        for concurrency in args.concurrency:
+            logger.info(
+                f"Measuring {client} client with {concurrency} concurrent requests",
+            )
+            results.append(
+                measure(
+                    client,
+                    concurrency,
+                    args.tokens,
+                    args.requests,
+                    args.iam_latency_ms / 1000,
+                ),
+            )
+
+    benchmarking.write_results(
+        args.output,
+        benchmarking.environment(
+            httpx=httpx.__version__,
+            iam=settings.iam_settings.model_dump(
+                include={
+                    "max_connections",
+                    "max_keepalive_connections",
+                    "cache_ttl_seconds",
+                },
+            ),
+        ),
+        results,
+    )
+    _print_results(results, baseline)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.Logging().LEVEL)
+    main()
@@ -0,0 +1,369 @@
+"""
+Benchmarks the image pipeline on a generated fixture corpus: transcoding, blurhash,
+processing with variants and encodings, and upload end to end with UploadImageHandler.
+Runs offline: storage is a local directory and repository keeps images in memory.
+
+Every stage and fixture is measured in a fresh process, so its peak RSS is its own.
+Results are written as JSON, and compared with a previous run when --compare is given.
+
+Run from src/: python -m presentation.cli.benchmark_images [options]
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import io
+import logging
+import multiprocessing
+import multiprocessing.forkserver
+import pathlib
+import tempfile
+import time
+import typing
+
+import dotenv
+import numpy as np
+import PIL
+import PIL.Image
+
+import settings
+from domain.entities import images as images_entity
+from infrastructure.services import image_processor
+from presentation.cli import benchmarking
+from service.handlers.commands.images import upload_image as upload_image_handler
+from service.helpers.image import blurhash, process, transcode
+from service.interfaces import unit_of_work
+from service.interfaces.repositories import images as images_repository_interface
+from service.interfaces.storages import images_storage
+from service.models.commands.images import upload_image
+
+dotenv.load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("transcode", "blurhash", "process", "upload")
+
+# name -> (format, width, height, EXIF orientation)
+FIXTURES: dict[str, tuple[str, int, int, int | None]] = {
+    "jpeg_small": ("JPEG", 800, 600, None),
+    "jpeg_phone_rotated": ("JPEG", 4032, 3024, 6),
+    "png_alpha": ("PNG", 1600, 1200, None),
+    # Stand-in for HEIC camera photos: Pillow decodes HEIC only with a plugin
+    "webp_camera": ("WEBP", 4000, 3000, None),
+    "jpeg_panorama": ("JPEG", 12000, 2000, None),
+}
+
+_ORIENTATION_TAG = 0x0112
+
+
+def _photo(width: int, height: int, rng: np.random.Generator) -> PIL.Image.Image:
+    """Smooth color regions with sensor-like noise: compresses like a photo, not like noise"""
+    coarse = rng.integers(
+        0,
+        256,
+        (height // 64 + 2, width // 64 + 2, 3),
+        dtype=np.uint8,
+    )
+    smooth = np.asarray(
+        PIL.Image.fromarray(coarse).resize(
+            (width, height),
+            PIL.Image.Resampling.BICUBIC,
+        ),
+        dtype=np.int16,
+    )
+    smooth += rng.integers(-6, 7, smooth.shape, dtype=np.int16)
+    return PIL.Image.fromarray(np.clip(smooth, 0, 255).astype(np.uint8))
+
+
+def generate_fixtures(seed: int) -> dict[str, bytes]:
+    """The same corpus for the same seed, so runs are comparable"""
+    fixtures: dict[str, bytes] = {}
+    for index, (name, (image_format, width, height, orientation)) in enumerate(
+        FIXTURES.items(),
+    ):
+        image = _photo(width, height, np.random.default_rng(seed + index))
+        options: dict[str, typing.Any] = {}
+        if image_format == "PNG":
+            image.putalpha(PIL.Image.linear_gradient("L").resize(image.size))
+        elif image_format == "JPEG":
+            options["quality"] = 92
+            if orientation is not None:
+                exif = PIL.Image.Exif()
+                exif[_ORIENTATION_TAG] = orientation
+                options["exif"] = exif.tobytes()
+        else:
+            options["quality"] = 90
+        encoded = io.BytesIO()
+        image.save(encoded, format=image_format, **options)
+        fixtures[name] = encoded.getvalue()
+    return fixtures
+
+
+class _LocalImagesStorage(images_storage.ImagesStorage):
+    """Files in a local directory in place of S3"""
+
+    def __init__(self, directory: pathlib.Path):
+        self._directory = directory
+
+    async def upload(self, *images: images_storage.Image) -> list[str]:
+        for image in images:
+            path = self._directory / image.filename
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(image.image)
+        return [self.get_url(image.filename) for image in images]
+
+    def get_url(self, filename: str) -> str:
+        return (self._directory / filename).as_uri()
+
+    async def presign_upload(
+        self,
+        filename: str,
+        max_bytes: int,
+    ) -> images_storage.PresignedUpload:
+        raise NotImplementedError
+
+    async def size(self, filename: str) -> int | None:
+        path = self._directory / filename
+        return path.stat().st_size if path.exists() else None
+
+    async def download(self, filename: str) -> bytes | None:
+        path = self._directory / filename
+        return path.read_bytes() if path.exists() else None
+
+    async def delete(self, filename: str) -> None:
+        (self._directory / filename).unlink(missing_ok=True)
+
+
+class _MemoryImagesRepository:
+    """
+    Only what UploadImageHandler uses. Never finds the same content,
+    so every upload is processed
+    """
+
+    def __init__(self) -> None:
+        self.images: list[images_entity.Image] = []
+
+    async def get_by_content_hashes(
+        self,
+        *content_hash: str,
+    ) -> dict[str, images_entity.Image]:
+        return {}
+
+    async def add(self, image: images_entity.Image) -> None:
+        self.images.append(image)
+
+
+class _MemoryUoW:
+    def __init__(self, images_repository: _MemoryImagesRepository):
+        self.images_repository = typing.cast(
+            images_repository_interface.IImageRepository,
+            images_repository,
+        )
+
+    async def __aenter__(self) -> typing.Self:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+    async def commit(self) -> None:
+        pass
+
+
+def _run_stage(
+    stage: str,
+    image: bytes,
+    repeats: int,
+) -> tuple[list[float], list[float], int]:
+    """Wall and CPU seconds of every repeat after a warmup, output bytes"""
+    if stage == "upload":
+        return asyncio.run(_run_upload(image, repeats))
+
+    # The same options the image processor passes to its workers
+    image_processing_settings = settings.image_processing_settings
+    policy = image_processor._jpeg_policy(image_processing_settings)
+    encodings = image_processor._encodings(image_processing_settings)
+
+    if stage == "blurhash":
+        # Blurhash is generated from the processed JPEG
+        image = transcode.transcode_to_jpeg(io.BytesIO(image), policy).getvalue()
+
+    def run() -> int:
+        if stage == "transcode":
+            return len(
+                transcode.transcode_to_jpeg(io.BytesIO(image), policy).getvalue(),
+            )
+        if stage == "blurhash":
+            return len(blurhash.generate_blurhash(io.BytesIO(image)))
+        processed = process.process_image(
+            image,
+            image_processing_settings.variant_widths,
+            encodings,
+            policy,
+        )
+        return (
+            len(processed.image)
+            + sum(map(len, processed.variants.values()))
+            + sum(
+                len(encoded.image) + sum(map(len, encoded.variants.values()))
+                for encoded in processed.encodings.values()
+            )
+        )
+
+    return benchmarking.timed(run, repeats)
+
+
+async def _run_upload(
+    image: bytes,
+    repeats: int,
+) -> tuple[list[float], list[float], int]:
+    """UploadImageHandler with the process pool: CPU time is the one spent by the workers"""
+    metrics = image_processor.image_processing_metrics
+    image_processor.start_executor()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            storage = _LocalImagesStorage(pathlib.Path(directory))
+            repository = _MemoryImagesRepository()
+            handler = upload_image_handler.UploadImageHandler(
+                image_storage=storage,
+                uow_factory=typing.cast(
+                    unit_of_work.UoWFactory,
+                    lambda: _MemoryUoW(repository),
+                ),
+                image_processor=image_processor.ProcessPoolImageProcessor(),
+            )
+            request = upload_image.UploadImage(uploader="benchmark", image=image)
+
+            await handler.handle(request)
+            wall: list[float] = []
+            cpu: list[float] = []
+            for _ in range(repeats):
+                cpu_before = metrics.cpu_seconds
+                wall_started = time.perf_counter()
+                await handler.handle(request)
+                wall.append(time.perf_counter() - wall_started)
+                cpu.append(metrics.cpu_seconds - cpu_before)
+            output_bytes = sum(
+                path.stat().st_size
+                for path in pathlib.Path(directory).rglob("*")
+                if path.is_file()
+            )
+    finally:
+        image_processor.shutdown_executor()
+    return wall, cpu, output_bytes
+
+
+def measure(
+    stage: str,
+    fixture: str,
+    image: bytes,
+    repeats: int,
+) -> dict[str, typing.Any]:
+    """Runs in a fresh process: peak RSS covers only this stage and fixture"""
+    wall, cpu, output_bytes = _run_stage(stage, image, repeats)
+    cpu_mean = sum(cpu) / len(cpu)
+    return {
+        "stage": stage,
+        "fixture": fixture,
+        "input_bytes": len(image),
+        "output_bytes": output_bytes,
+        "repeats": repeats,
+        "latency_ms": benchmarking.latency_ms(wall),
+        "cpu_ms": 1000 * cpu_mean,
+        "images_per_core_second": 1 / cpu_mean if cpu_mean else None,
+        "peak_rss_bytes": benchmarking.peak_rss_bytes(),
+    }
+
+
+def _environment(seed: int) -> dict[str, typing.Any]:
+    image_processing_settings = settings.image_processing_settings
+    return benchmarking.environment(
+        pillow=PIL.__version__,
+        seed=seed,
+        image_processing=image_processing_settings.model_dump(
+            include={
+                "workers",
+                "variant_widths",
+                "formats",
+                "max_long_edge",
+                "jpeg_quality",
+                "jpeg_max_bytes",
+                "jpeg_progressive",
+            },
+        ),
+    )
+
+
+def _print_results(
+    results: list[dict[str, typing.Any]],
+    baseline: dict[tuple, dict[str, typing.Any]],
+) -> None:
+    print(
+        f"{'stage':<10}{'fixture':<20}{'p50 ms':>10}{'p95 ms':>10}{'img/s/core':>12}"
+        f"{'out KiB':>10}{'RSS MiB':>9}{'p50 vs base':>13}",
+    )
+    for result in results:
+        change = benchmarking.p50_change(result, baseline, "stage", "fixture")
+        per_core = result["images_per_core_second"]
+        print(
+            f"{result['stage']:<10}{result['fixture']:<20}"
+            f"{result['latency_ms']['p50']:>10.1f}{result['latency_ms']['p95']:>10.1f}"
+            f"{per_core if per_core is not None else float('nan'):>12.2f}"
+            f"{result['output_bytes'] / 1024:>10.0f}{result['peak_rss_bytes'] / 2**20:>9.0f}"
+            f"{change:>13}",
+        )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the image pipeline")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument(
+        "--fixtures",
+        nargs="+",
+        choices=tuple(FIXTURES),
+        default=list(FIXTURES),
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="seed of the generated corpus",
+    )
+    benchmarking.add_arguments(parser, output="benchmark_images.json", repeats=5)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    # Peak RSS is inherited by forked and even exec'd children on Linux: measuring processes
+    # are forked from the server started before the corpus is generated
+    context = multiprocessing.get_context("forkserver")
+    multiprocessing.forkserver.ensure_running()
+    fixtures = generate_fixtures(args.seed)
+    baseline = benchmarking.read_baseline(args.compare, "stage", "fixture")
+
+    results = []
+    for stage in args.stages:
+        for fixture in args.fixtures:
+            logger.info(f"Measuring {stage} of {fixture}")
+            with concurrent.futures.ProcessPoolExecutor(
+                1,
+                mp_context=context,
+            ) as executor:
+                results.append(
+                    executor.submit(
+                        measure,
+                        stage,
+                        fixture,
+                        fixtures[fixture],
+                        args.repeats,
+                    ).result(),
+                )
+
+    benchmarking.write_results(args.output, _environment(args.seed), results)
+    _print_results(results, baseline)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.Logging().LEVEL)
+    main()
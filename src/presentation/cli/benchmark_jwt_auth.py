@@ -0,0 +1,183 @@
+"""
+Benchmarks auth overhead per request of LocalJWTIAMService for HS256 and RS256 tokens,
+with the verified tokens cache off and on. Requests cycle through a set of distinct
+tokens, the way clients reuse their access token for minutes.
+
+Run from src/: python -m presentation.cli.benchmark_jwt_auth [options]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+import typing
+
+import dotenv
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+import settings
+from infrastructure.services import iam_service
+from presentation.cli import benchmarking
+
+dotenv.load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+ALGORITHMS = ("HS256", "RS256")
+CACHES = ("off", "on")
+
+_HS256_SECRET = "benchmark-secret-of-the-recommended-length-32b"
+
+
+def _keys(algorithm: str) -> tuple[str | bytes, str]:
+    """Signing key and the one the service verifies with"""
+    if algorithm == "HS256":
+        return _HS256_SECRET, _HS256_SECRET
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    return private_pem, public_pem.decode()
+
+
+def _service(
+    algorithm: str,
+    verify_key: str,
+    cache: str,
+) -> iam_service.LocalJWTIAMService:
+    service = iam_service.LocalJWTIAMService()
+    service._settings = settings.jwt_settings.model_copy(
+        update={"secret": verify_key, "algorithm": algorithm},
+    )
+    service._cache = iam_service.VerifiedTokensCache(
+        max_size=settings.jwt_settings.cache_max_size if cache == "on" else 0,
+        ttl_seconds=settings.jwt_settings.cache_ttl_seconds,
+    )
+    return service
+
+
+async def _run(
+    algorithm: str,
+    cache: str,
+    tokens: int,
+    requests: int,
+) -> tuple[list[float], iam_service.VerifiedTokensCache]:
+    signing_key, verify_key = _keys(algorithm)
+    jwt_settings = settings.jwt_settings
+    issued = [
+        jwt.encode(
+            {
+                "sub": f"account-{index}",
+                "iss": jwt_settings.issuer,
+                "aud": jwt_settings.audience,
+                "exp": int(time.time()) + 3600,
+            },
+            signing_key,
+            algorithm=algorithm,
+        )
+        for index in range(tokens + 1)
+    ]
+    # Warmup with a token outside the measured set
+    await _service(algorithm, verify_key, "off").get_user_id(issued.pop())
+
+    service = _service(algorithm, verify_key, cache)
+    wall: list[float] = []
+    for index in range(requests):
+        token = issued[index % tokens]
+        started = time.perf_counter()
+        await service.get_user_id(token)
+        wall.append(time.perf_counter() - started)
+    return wall, service._cache
+
+
+def measure(
+    algorithm: str,
+    cache: str,
+    tokens: int,
+    requests: int,
+) -> dict[str, typing.Any]:
+    wall, tokens_cache = asyncio.run(_run(algorithm, cache, tokens, requests))
+    return {
+        "algorithm": algorithm,
+        "cache": cache,
+        "tokens": tokens,
+        "requests": requests,
+        "latency_ms": benchmarking.latency_ms(wall),
+        "requests_per_second": len(wall) / sum(wall),
+        "hit_rate": tokens_cache.hit_rate,
+    }
+
+
+def _print_results(
+    results: list[dict[str, typing.Any]],
+    baseline: dict[tuple, dict[str, typing.Any]],
+) -> None:
+    print(
+        f"{'algorithm':<11}{'cache':<7}{'p50 us':>9}{'p95 us':>9}{'mean us':>9}{'req/s':>10}"
+        f"{'hit rate':>10}{'p50 vs base':>13}",
+    )
+    for result in results:
+        latency = result["latency_ms"]
+        print(
+            f"{result['algorithm']:<11}{result['cache']:<7}"
+            f"{1000 * latency['p50']:>9.1f}{1000 * latency['p95']:>9.1f}"
+            f"{1000 * latency['mean']:>9.1f}{result['requests_per_second']:>10.0f}"
+            f"{result['hit_rate']:>10.1%}"
+            f"{benchmarking.p50_change(result, baseline, 'algorithm', 'cache', 'tokens'):>13}",
+        )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark local JWT auth overhead")
+    parser.add_argument(
+        "--algorithms",
+        nargs="+",
+        choices=ALGORITHMS,
+        default=list(ALGORITHMS),
+    )
+    parser.add_argument("--caches", nargs="+", choices=CACHES, default=list(CACHES))
+    parser.add_argument(
+        "--tokens",
+        type=int,
+        default=100,
+        help="distinct tokens in requests",
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=10_000,
+        help="requests to measure",
+    )
+    benchmarking.add_arguments(parser, output="benchmark_jwt_auth.json")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    baseline = benchmarking.read_baseline(args.compare, "algorithm", "cache", "tokens")
+
+    results = []
+    for algorithm in args.algorithms:
+        for cache in args.caches:
+            logger.info(f"Measuring {algorithm} auth with cache {cache}")
+            results.append(measure(algorithm, cache, args.tokens, args.requests))
+
+    benchmarking.write_results(
+        args.output,
+        benchmarking.environment(pyjwt=jwt.__version__),
+        results,
+    )
+    _print_results(results, baseline)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.Logging().LEVEL)
+    main()
@@ -0,0 +1,236 @@
+"""
+Benchmarks mediator overhead per request type of service.mapping: the regular
+mediator and the one with queries fast path against calling the handler directly.
+Handlers do nothing, so what is measured is handler lookup, dependency resolution,
+middlewares and events processing.
+
+The cqrs package sets its logger to DEBUG on import, so its logging middleware writes two
+records per request. The level is set with --cqrs-log-level to measure with or without them.
+
+Runs offline: handlers are resolved with their real dependencies, nothing connects
+on resolve and the Postgres pool is a placeholder.
+
+Run from src/: python -m presentation.cli.benchmark_mediator [options]
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import datetime
+import logging
+import types
+import typing
+import uuid
+
+import asyncpg
+import cqrs
+import dotenv
+from cqrs.requests import map as request_map
+
+import settings
+from infrastructure import dependencies as infrastructure_dependencies
+from infrastructure.persistent.postgres import connection as postgres_connection
+from presentation import dependencies
+from presentation.cli import benchmarking
+from service import mapping
+
+dotenv.load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DISPATCHERS = ("direct", "regular", "fast_path")
+
+# Values of required request fields by type
+_SAMPLES: dict[typing.Any, typing.Any] = {
+    str: "benchmark",
+    int: 1,
+    float: 1.0,
+    bool: False,
+    bytes: b"",
+    uuid.UUID: uuid.UUID("6b0f5c3e-1a44-4d70-9d0e-3a7f1f0b6c11"),
+    datetime.datetime: datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+}
+
+
+def _sample_value(annotation: typing.Any) -> typing.Any:
+    if annotation in _SAMPLES:
+        return _SAMPLES[annotation]
+    origin = typing.get_origin(annotation)
+    if origin in (list, tuple, set):
+        return origin()
+    if origin in (typing.Union, types.UnionType):
+        return _sample_value(typing.get_args(annotation)[0])
+    return None
+
+
+def sample_request(request_type: type) -> cqrs.IRequest:
+    hints = typing.get_type_hints(request_type)
+    return request_type(
+        **{
+            field.name: _sample_value(hints[field.name])
+            for field in dataclasses.fields(request_type)
+            if field.default is dataclasses.MISSING
+            and field.default_factory is dataclasses.MISSING
+        },
+    )
+
+
+def _noop_handler(handler_type: type) -> type:
+    """The handler with its dependencies and events, doing nothing"""
+
+    async def handle(self, request: cqrs.IRequest) -> None:
+        return None
+
+    return type(handler_type.__name__, (handler_type,), {"handle": handle})
+
+
+def _noop_mapper(
+    mapper: dependencies.RequestsMapper,
+    noop_handlers: dict[type, type],
+) -> dependencies.RequestsMapper:
+    def noop_mapper(requests: request_map.RequestMap) -> None:
+        mapped = request_map.RequestMap()
+        mapper(mapped)
+        for request_type, handler_type in mapped.items():
+            if isinstance(handler_type, type):
+                noop_handlers[request_type] = noop_handlers.get(
+                    request_type,
+                ) or _noop_handler(
+                    handler_type,
+                )
+                requests.bind(request_type, noop_handlers[request_type])
+
+    return noop_mapper
+
+
+class _Dispatchers:
+    def __init__(self) -> None:
+        self.noop_handlers: dict[type, type] = {}
+        commands_mapper = _noop_mapper(mapping.init_requests, self.noop_handlers)
+        queries_mapper = _noop_mapper(mapping.init_queries, self.noop_handlers)
+        queries = request_map.RequestMap()
+        mapping.init_queries(queries)
+        self.queries = set(queries)
+        self.mediators = {
+            "regular": dependencies.build_request_mediator(
+                commands_mapper,
+                queries_mapper,
+                queries_fast_path=False,
+            ),
+            "fast_path": dependencies.build_request_mediator(
+                commands_mapper,
+                queries_mapper,
+                queries_fast_path=True,
+            ),
+        }
+
+    async def send(self, dispatcher: str, request_type: type) -> typing.Callable:
+        request = sample_request(request_type)
+        if dispatcher == "direct":
+            handler = await infrastructure_dependencies.compiled_container.resolve(
+                self.noop_handlers[request_type],
+            )
+            return lambda: handler.handle(request)
+        mediator = self.mediators[dispatcher]
+        return lambda: mediator.send(request)
+
+
+async def _measure_all(args: argparse.Namespace) -> list[dict[str, typing.Any]]:
+    dispatchers = _Dispatchers()
+    request_types = [
+        request_type
+        for request_type in dispatchers.noop_handlers
+        if not args.requests or request_type.__name__ in args.requests
+    ]
+    results = []
+    for request_type in request_types:
+        direct_p50 = None
+        for dispatcher in args.dispatchers:
+            logger.info(f"Measuring {dispatcher} dispatch of {request_type.__name__}")
+            send = await dispatchers.send(dispatcher, request_type)
+            wall, _, _ = await benchmarking.timed_async(send, args.repeats)
+            latency = benchmarking.latency_ms(wall)
+            if dispatcher == "direct":
+                direct_p50 = latency["p50"]
+            results.append(
+                {
+                    "request": request_type.__name__,
+                    "kind": "query"
+                    if request_type in dispatchers.queries
+                    else "command",
+                    "dispatcher": dispatcher,
+                    "repeats": args.repeats,
+                    "latency_ms": latency,
+                    "overhead_ms": latency["p50"] - direct_p50
+                    if direct_p50 is not None
+                    else None,
+                },
+            )
+    return results
+
+
+def _print_results(
+    results: list[dict[str, typing.Any]],
+    baseline: dict[tuple, dict[str, typing.Any]],
+) -> None:
+    print(
+        f"{'request':<28}{'kind':<9}{'dispatcher':<11}{'p50 us':>9}{'p95 us':>9}"
+        f"{'overhead us':>13}{'p50 vs base':>13}",
+    )
+    for result in results:
+        overhead = result["overhead_ms"]
+        print(
+            f"{result['request']:<28}{result['kind']:<9}{result['dispatcher']:<11}"
+            f"{1000 * result['latency_ms']['p50']:>9.1f}{1000 * result['latency_ms']['p95']:>9.1f}"
+            f"{1000 * overhead if overhead is not None else float('nan'):>13.1f}"
+            f"{benchmarking.p50_change(result, baseline, 'request', 'dispatcher'):>13}",
+        )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark mediator dispatch overhead")
+    parser.add_argument(
+        "--dispatchers",
+        nargs="+",
+        choices=DISPATCHERS,
+        default=list(DISPATCHERS),
+    )
+    parser.add_argument(
+        "--requests",
+        nargs="+",
+        default=None,
+        help="request type names",
+    )
+    parser.add_argument(
+        "--cqrs-log-level",
+        default="WARNING",
+        help="level of the cqrs logger",
+    )
+    benchmarking.add_arguments(parser, output="benchmark_mediator.json", repeats=2_000)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    logging.getLogger("cqrs").setLevel(args.cqrs_log_level)
+    # Handlers get the pool through UoW factory, which does not touch it until a request
+    postgres_connection._pool = typing.cast(asyncpg.Pool, object())
+    baseline = benchmarking.read_baseline(args.compare, "request", "dispatcher")
+
+    try:
+        results = asyncio.run(_measure_all(args))
+    finally:
+        infrastructure_dependencies.compiled_container.close()
+        postgres_connection._pool = None
+
+    benchmarking.write_results(
+        args.output,
+        benchmarking.environment(cqrs_log_level=args.cqrs_log_level),
+        results,
+    )
+    _print_results(results, baseline)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.Logging().LEVEL)
+    main()
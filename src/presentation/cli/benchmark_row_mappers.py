@@ -0,0 +1,235 @@
+"""
+Benchmarks mapping of feed and image rows into entities: by column name as the feeds
+repository did before, by column position, and into record-backed lazy entities.
+Reports time to map the rows, memory the mapped entities keep allocated, and time to
+read every field of them once, as serializers do.
+
+Rows are real asyncpg.Record: they are generated by a query without tables,
+so any Postgres will do.
+
+Run from src/: python -m presentation.cli.benchmark_row_mappers [options]
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import logging
+import tracemalloc
+import typing
+
+import asyncpg
+import dotenv
+
+import settings
+from domain.entities import feed as feed_entity, images as images_entity
+from infrastructure.persistent.postgres import columns, records
+from infrastructure.persistent.postgres.repositories import feeds as feeds_repository
+from infrastructure.persistent.settings import postgres_settings
+from presentation.cli import benchmarking
+
+dotenv.load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+MAPPERS = ("by_name", "positional", "record")
+KINDS = ("image", "feed")
+
+# Columns of feeds repository selects, without tables
+_IMAGE_ROWS = """
+SELECT gen_random_uuid() AS image_id, gen_random_uuid() AS feed_id,
+       'account-' || n AS uploader, 'https://storage.example.com/' || n || '.jpg' AS url,
+       'LEHV6nWB2yk8pyo0adR*.7kCMdnj' AS blurhash, now() AS uploaded_at, n % 10 AS "order",
+       $2::text AS variants, $3::text AS encodings, true AS ready
+FROM generate_series(1, $1) AS n
+"""
+_FEED_ROWS = """
+SELECT gen_random_uuid() AS feed_id, 'account-' || n AS account_id, now() AS created_at,
+       NULL::timestamptz AS updated_at, repeat('word ', n % 50) AS text,
+       n AS likes_count, 10 * n AS views_count, n % 2 = 0 AS has_followed,
+       n % 3 = 0 AS has_liked
+FROM generate_series(1, $1) AS n
+"""
+
+
+def _by_name_image(row: asyncpg.Record) -> images_entity.Image:
+    return images_entity.Image(
+        image_id=row["image_id"],
+        feed_id=row["feed_id"],
+        uploader=row["uploader"],
+        url=row["url"],
+        blurhash=row["blurhash"],
+        uploaded_at=row["uploaded_at"],
+        order=row["order"],
+        variants=columns.load_variants(row["variants"]),
+        encodings=columns.load_encodings(row["encodings"]),
+        ready=row["ready"],
+    )
+
+
+def _by_name_feed(
+    row: asyncpg.Record,
+    images: list[images_entity.Image],
+) -> feed_entity.Feed:
+    has_followed = (
+        bool(row["has_followed"]) if row.get("has_followed") is not None else False
+    )
+    has_liked = bool(row["has_liked"]) if row.get("has_liked") is not None else False
+    return feed_entity.Feed(
+        feed_id=row["feed_id"],
+        account_id=row["account_id"],
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+        text=row["text"],
+        images=images,
+        likes_count=int(row["likes_count"])
+        if row.get("likes_count") is not None
+        else 0,
+        views_count=int(row["views_count"])
+        if row.get("views_count") is not None
+        else 0,
+        has_followed=has_followed,
+        has_liked=has_liked,
+    )
+
+
+_IMAGE_MAPPERS: dict[str, typing.Callable[[asyncpg.Record], typing.Any]] = {
+    "by_name": _by_name_image,
+    "positional": feeds_repository._row_to_image,
+    "record": records.RecordImage,
+}
+_FEED_MAPPERS: dict[str, typing.Callable[[asyncpg.Record, list], typing.Any]] = {
+    "by_name": _by_name_feed,
+    "positional": feeds_repository._row_to_feed,
+    "record": records.RecordFeed,
+}
+
+
+async def fetch_rows(dsn: str, rows: int) -> dict[str, list[asyncpg.Record]]:
+    variants = columns.dump_variants(
+        tuple(
+            images_entity.ImageVariant(
+                width=width,
+                url=f"https://storage.example.com/{width}.jpg",
+            )
+            for width in (320, 640, 1080)
+        ),
+    )
+    connection = await asyncpg.connect(dsn)
+    try:
+        return {
+            "image": await connection.fetch(
+                _IMAGE_ROWS,
+                rows,
+                variants,
+                columns.dump_encodings(()),
+            ),
+            "feed": await connection.fetch(_FEED_ROWS, rows),
+        }
+    finally:
+        await connection.close()
+
+
+def _mapping(
+    mapper: str,
+    kind: str,
+    rows: list[asyncpg.Record],
+) -> typing.Callable[[], list]:
+    if kind == "image":
+        map_image = _IMAGE_MAPPERS[mapper]
+        return lambda: [map_image(row) for row in rows]
+    map_feed = _FEED_MAPPERS[mapper]
+    return lambda: [map_feed(row, []) for row in rows]
+
+
+def _read_fields(entities: list) -> None:
+    names = [field.name for field in dataclasses.fields(entities[0])]
+    for entity in entities:
+        for name in names:
+            getattr(entity, name)
+
+
+def _allocated(run: typing.Callable[[], list]) -> tuple[int, int]:
+    """Bytes and blocks the mapped entities keep allocated"""
+    tracemalloc.start()
+    try:
+        mapped = run()
+        statistics = tracemalloc.take_snapshot().statistics("filename")
+        del mapped
+    finally:
+        tracemalloc.stop()
+    return sum(stat.size for stat in statistics), sum(stat.count for stat in statistics)
+
+
+def measure(
+    mapper: str,
+    kind: str,
+    rows: list[asyncpg.Record],
+    repeats: int,
+) -> dict[str, typing.Any]:
+    run = _mapping(mapper, kind, rows)
+    wall, _, mapped = benchmarking.timed(run, repeats)
+    read_wall, _, _ = benchmarking.timed(lambda: _read_fields(mapped), repeats)
+    allocated_bytes, allocated_blocks = _allocated(run)
+    return {
+        "mapper": mapper,
+        "kind": kind,
+        "rows": len(rows),
+        "repeats": repeats,
+        "latency_ms": benchmarking.latency_ms(wall),
+        "read_fields_ms": benchmarking.latency_ms(read_wall),
+        "allocated_bytes_per_row": allocated_bytes / len(rows),
+        "allocated_blocks_per_row": allocated_blocks / len(rows),
+    }
+
+
+def _print_results(
+    results: list[dict[str, typing.Any]],
+    baseline: dict[tuple, dict[str, typing.Any]],
+) -> None:
+    print(
+        f"{'mapper':<12}{'kind':<7}{'rows':>7}{'map p50 ms':>12}{'read p50 ms':>13}"
+        f"{'B/row':>8}{'blocks/row':>12}{'p50 vs base':>13}",
+    )
+    for result in results:
+        print(
+            f"{result['mapper']:<12}{result['kind']:<7}{result['rows']:>7}"
+            f"{result['latency_ms']['p50']:>12.2f}{result['read_fields_ms']['p50']:>13.2f}"
+            f"{result['allocated_bytes_per_row']:>8.0f}{result['allocated_blocks_per_row']:>12.1f}"
+            f"{benchmarking.p50_change(result, baseline, 'mapper', 'kind', 'rows'):>13}",
+        )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark row mappers of the feeds repository",
+    )
+    parser.add_argument("--mappers", nargs="+", choices=MAPPERS, default=list(MAPPERS))
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    parser.add_argument("--rows", type=int, default=10_000, help="rows of every kind")
+    parser.add_argument(
+        "--dsn",
+        default=postgres_settings.dsn,
+        help="Postgres to generate rows",
+    )
+    benchmarking.add_arguments(parser, output="benchmark_row_mappers.json", repeats=20)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    rows = asyncio.run(fetch_rows(args.dsn, args.rows))
+    baseline = benchmarking.read_baseline(args.compare, "mapper", "kind", "rows")
+
+    results = []
+    for kind in args.kinds:
+        for mapper in args.mappers:
+            logger.info(f"Measuring {mapper} mapping of {args.rows} {kind} rows")
+            results.append(measure(mapper, kind, rows[kind], args.repeats))
+
+    benchmarking.write_results(args.output, benchmarking.environment(), results)
+    _print_results(results, baseline)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.Logging().LEVEL)
+    main()
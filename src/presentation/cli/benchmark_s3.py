@@ -0,0 +1,314 @@
+"""
+Benchmarks concurrent uploads of S3ImagesStorage against a local stand-in S3 server:
+a new session and client per upload with the blocking transfer inside the event loop,
+as the storage did before, against the shared client on the bounded thread pool.
+Also reports the longest event loop stall while uploading, after a warmup upload.
+
+The stand-in runs in its own thread, answers path-style PUT and DELETE with a configured
+latency and keeps no objects. It serves plain HTTP and does not verify signatures.
+
+Run from src/: python -m presentation.cli.benchmark_s3 [options]
+"""
+
+import argparse
+import asyncio
+import io
+import logging
+import threading
+import time
+import typing
+
+import boto3
+import boto3.session
+import dotenv
+
+import settings
+from infrastructure.storages import s3, settings as storages_settings
+from presentation.cli import benchmarking
+from service.interfaces.storages import images_storage
+
+dotenv.load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+STORAGES = ("client_per_upload", "pooled")
+
+_BUCKET = "benchmark"
+
+
+class StandInS3:
+    """HTTP/1.1 keep-alive server accepting every object, in a thread with its own loop"""
+
+    def __init__(self, latency: float) -> None:
+        self._latency = latency
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._server: asyncio.Server | None = None
+        self._connections: dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self.requests = 0
+        self.connections = 0
+
+    @property
+    def endpoint(self) -> str:
+        assert self._server is not None
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> typing.Self:
+        self._thread.start()
+        self._server = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(self._serve, "127.0.0.1", 0),
+            self._loop,
+        ).result()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        asyncio.run_coroutine_threadsafe(self._close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    async def _close(self) -> None:
+        assert self._server is not None
+        self._server.close()
+        # Clients created per upload are never closed and keep their connections
+        for writer in self._connections.values():
+            writer.close()
+        await asyncio.gather(*self._connections)
+
+    async def _serve(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        self.connections += 1
+        connection = asyncio.current_task()
+        assert connection is not None
+        self._connections[connection] = writer
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                self.requests += 1
+                method = head.split(b" ", 1)[0]
+                headers = {
+                    name.strip().lower(): value.strip()
+                    for name, _, value in (
+                        line.partition(b":") for line in head.split(b"\r\n")[1:] if line
+                    )
+                }
+                if headers.get(b"expect", b"").lower() == b"100-continue":
+                    writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+                await reader.readexactly(int(headers.get(b"content-length", b"0")))
+                await asyncio.sleep(self._latency)
+                status = b"204 No Content" if method == b"DELETE" else b"200 OK"
+                writer.write(
+                    b'HTTP/1.1 %s\r\nETag: "0"\r\nContent-Length: 0\r\n\r\n' % status,
+                )
+                await writer.drain()
+        finally:
+            writer.close()
+            self._connections.pop(connection, None)
+
+
+class _ClientPerUploadStorage(s3.S3ImagesStorage):
+    """S3ImagesStorage before the shared client: blocking upload_fileobj in the event loop"""
+
+    async def upload_one(self, image: images_storage.Image) -> str:
+        s3_settings = storages_settings.s3_settings
+        full_filename = self._full_filename(image.filename)
+        client = boto3.session.Session().client(
+            "s3",
+            endpoint_url=s3_settings.ENDPOINT_URL,
+            region_name=s3_settings.REGION_NAME,
+            aws_access_key_id=s3_settings.ACCESS_KEY_ID,
+            aws_secret_access_key=s3_settings.SECRET_ACCESS_KEY,
+        )
+        client.upload_fileobj(io.BytesIO(image.image), self.bucket_name, full_filename)
+        return self._generate_download_url(full_filename)
+
+
+async def _loop_stall(stop: asyncio.Event, interval: float = 0.001) -> float:
+    """Longest delay of a periodic wakeup behind schedule"""
+    longest = 0.0
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        longest = max(longest, time.perf_counter() - expected)
+    return longest
+
+
+async def _run(
+    storage: str,
+    concurrency: int,
+    uploads: int,
+    image: bytes,
+) -> tuple[list[float], float, float]:
+    images_storage_ = (
+        _ClientPerUploadStorage()
+        if storage == "client_per_upload"
+        else s3.S3ImagesStorage()
+    )
+    wall: list[float] = []
+
+    async def worker(first: int) -> None:
+        for index in range(first, uploads, concurrency):
+            started = time.perf_counter()
+            await images_storage_.upload_one(
+                images_storage.Image(filename=f"images/{index}.jpg", image=image),
+            )
+            wall.append(time.perf_counter() - started)
+
+    await images_storage_.upload_one(
+        images_storage.Image(filename="images/warmup.jpg", image=image),
+    )
+    stop = asyncio.Event()
+    stall = asyncio.create_task(_loop_stall(stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(first) for first in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    return wall, elapsed, await stall
+
+
+def measure(
+    storage: str,
+    concurrency: int,
+    uploads: int,
+    image_bytes: int,
+    latency: float,
+) -> dict[str, typing.Any]:
+    image = bytes(image_bytes)
+    with StandInS3(latency) as stand_in:
+        storages_settings.s3_settings = storages_settings.s3_settings.model_copy(
+            update={
+                "ENDPOINT_URL": stand_in.endpoint,
+                "REGION_NAME": "us-east-1",
+                "BUCKET_NAME": _BUCKET,
+                "ACCESS_KEY_ID": "benchmark",
+                "SECRET_ACCESS_KEY": "benchmark",
+            },
+        )
+        try:
+            wall, elapsed, stall = asyncio.run(
+                _run(storage, concurrency, uploads, image),
+            )
+        finally:
+            s3.close()
+    return {
+        "storage": storage,
+        "concurrency": concurrency,
+        "uploads": uploads,
+        "image_bytes": image_bytes,
+        "s3_latency_ms": 1000 * latency,
+        "latency_ms": benchmarking.latency_ms(wall),
+        "uploads_per_second": uploads / elapsed,
+        "max_loop_stall_ms": 1000 * stall,
+        "s3_connections": stand_in.connections,
+    }
+
+
+def _print_results(
+    results: list[dict[str, typing.Any]],
+    baseline: dict[tuple, dict[str, typing.Any]],
+) -> None:
+    print(
+        f"{'storage':<19}{'conc':>6}{'p50 ms':>9}{'p95 ms':>9}{'uploads/s':>11}"
+        f"{'stall ms':>10}{'S3 conn':>9}{'p50 vs base':>13}",
+    )
+    for result in results:
+        change = benchmarking.p50_change(
+            result,
+            baseline,
+            "storage",
+            "concurrency",
+            "image_bytes",
+        )
+        print(
+            f"{result['storage']:<19}{result['concurrency']:>6}"
+            f"{result['latency_ms']['p50']:>9.2f}{result['latency_ms']['p95']:>9.2f}"
+            f"{result['uploads_per_second']:>11.0f}{result['max_loop_stall_ms']:>10.1f}"
+            f"{result['s3_connections']:>9}{change:>13}",
+        )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark concurrent uploads to S3")
+    parser.add_argument(
+        "--storages",
+        nargs="+",
+        choices=STORAGES,
+        default=list(STORAGES),
+    )
+    parser.add_argument(
+        "--concurrency",
+        nargs="+",
+        type=int,
+        default=[1, 16],
+        help="concurrent uploads",
+    )
+    parser.add_argument("--uploads", type=int, default=200, help="uploads to measure")
+    parser.add_argument(
+        "--image-kib",
+        type=int,
+        default=256,
+        help="size of every upload",
+    )
+    parser.add_argument(
+        "--s3-latency-ms",
+        type=float,
+        default=10.0,
+        help="stand-in S3 response time",
+    )
+    benchmarking.add_arguments(parser, output="benchmark_s3.json")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    baseline = benchmarking.read_baseline(
+        args.compare,
+        "storage",
+        "concurrency",
+        "image_bytes",
+    )
+
+    results = []
+    for storage in args.storages:
+        for concurrency in args.concurrency:
+            logger.info(
+                f"Measuring {storage} storage with {concurrency} concurrent uploads",
+            )
+            results.append(
+                measure(
+                    storage,
+                    concurrency,
+                    args.uploads,
+                    1024 * args.image_kib,
+                    args.s3_latency_ms / 1000,
+                ),
+            )
+
+    benchmarking.write_results(
+        args.output,
+        benchmarking.environment(
+            boto3=boto3.__version__,
+            s3=storages_settings.s3_settings.model_dump(
+                include={
+                    "MAX_CONCURRENCY",
+                    "CONNECT_TIMEOUT",
+                    "READ_TIMEOUT",
+                    "MAX_ATTEMPTS",
+                },
+            ),
+        ),
+        results,
+    )
+    _print_results(results, baseline)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.Logging().LEVEL)
+    main()
@@ -0,0 +1,203 @@
+"""
+Benchmarks encoding of a feeds response: pydantic response models encoded by FastAPI,
+as feed routes did before, against orjson serializers of presentation.api.serializers.
+Measures encoding only, without routing and database: responses per core second are
+the upper bound encoding puts on requests per second.
+
+Run from src/: python -m presentation.cli.benchmark_serializers [options]
+"""
+
+import argparse
+import datetime
+import logging
+import random
+import typing
+import uuid
+
+import dotenv
+import orjson
+import pydantic
+from fastapi import encoders, responses
+
+import settings
+from domain.entities import feed as feed_entity, images as images_entity
+from presentation.api import serializers
+from presentation.api.schemas import responses as responses_schema
+from presentation.cli import benchmarking
+
+dotenv.load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+ENCODERS = ("pydantic", "orjson")
+
+
+def generate_feeds(count: int, images: int, seed: int) -> list[feed_entity.Feed]:
+    rng = random.Random(seed)
+    created_at = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+    def image(order: int) -> images_entity.Image:
+        image_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+        url = f"https://storage.example.com/images/{image_id}"
+        return images_entity.Image(
+            image_id=image_id,
+            uploader=f"account-{rng.randrange(1000)}",
+            url=f"{url}.jpg",
+            blurhash="LEHV6nWB2yk8pyo0adR*.7kCMdnj",
+            order=order,
+            variants=tuple(
+                images_entity.ImageVariant(width=width, url=f"{url}_{width}.jpg")
+                for width in (320, 640, 1080)
+            ),
+        )
+
+    return [
+        feed_entity.Feed(
+            feed_id=uuid.UUID(int=rng.getrandbits(128), version=4),
+            account_id=f"account-{rng.randrange(1000)}",
+            has_followed=rng.random() < 0.5,
+            has_liked=rng.random() < 0.5,
+            text=" ".join(
+                f"word{rng.randrange(10_000)}" for _ in range(rng.randrange(5, 60))
+            ),
+            images=[image(order) for order in range(images)],
+            created_at=created_at + datetime.timedelta(seconds=rng.randrange(10**8)),
+            likes_count=rng.randrange(10_000),
+            views_count=rng.randrange(1_000_000),
+        )
+        for _ in range(count)
+    ]
+
+
+def _pydantic_response(feeds: list[feed_entity.Feed]) -> bytes:
+    """Response models the way routes built them, encoded the way FastAPI encodes them"""
+    model = responses_schema.Feeds.model_construct(
+        items=[
+            responses_schema.Feed.model_construct(
+                uuid=feed.feed_id,
+                account_id=feed.account_id,
+                has_followed=feed.has_followed,
+                has_liked=feed.has_liked,
+                created_at=feed.created_at,
+                updated_at=feed.updated_at,
+                text=feed.text,
+                images=[
+                    responses_schema.OrderedImage.model_construct(
+                        image=responses_schema.Image.model_construct(
+                            uuid=image.image_id,
+                            url=image.url,
+                            blurhash=image.blurhash,
+                            variants=[
+                                responses_schema.ImageVariant.model_construct(
+                                    width=variant.width,
+                                    url=variant.url,
+                                )
+                                for variant in image.variants
+                            ],
+                            ready=image.ready,
+                        ),
+                        order=image.order,
+                    )
+                    for image in feed.images
+                ],
+                likes_count=feed.likes_count,
+                views_count=feed.views_count,
+            )
+            for feed in feeds
+        ],
+    )
+    return responses.JSONResponse(encoders.jsonable_encoder({"result": model})).body
+
+
+def _orjson_response(feeds: list[feed_entity.Feed]) -> bytes:
+    return serializers.ORJSONResponse(
+        serializers.envelope(
+            serializers.feeds([serializers.feed(feed) for feed in feeds]),
+        ),
+    ).body
+
+
+def measure(
+    encoder: str,
+    feeds: list[feed_entity.Feed],
+    repeats: int,
+) -> dict[str, typing.Any]:
+    encode = _pydantic_response if encoder == "pydantic" else _orjson_response
+    wall, cpu, body = benchmarking.timed(lambda: encode(feeds), repeats)
+    cpu_mean = sum(cpu) / len(cpu)
+    return {
+        "encoder": encoder,
+        "feeds": len(feeds),
+        "response_bytes": len(body),
+        "repeats": repeats,
+        "latency_ms": benchmarking.latency_ms(wall),
+        "cpu_ms": 1000 * cpu_mean,
+        "responses_per_core_second": 1 / cpu_mean if cpu_mean else None,
+    }
+
+
+def _print_results(
+    results: list[dict[str, typing.Any]],
+    baseline: dict[tuple, dict[str, typing.Any]],
+) -> None:
+    print(
+        f"{'encoder':<10}{'feeds':>7}{'p50 ms':>10}{'p95 ms':>10}{'resp/s/core':>13}"
+        f"{'KiB':>8}{'p50 vs base':>13}",
+    )
+    for result in results:
+        per_core = result["responses_per_core_second"]
+        print(
+            f"{result['encoder']:<10}{result['feeds']:>7}"
+            f"{result['latency_ms']['p50']:>10.2f}{result['latency_ms']['p95']:>10.2f}"
+            f"{per_core if per_core is not None else float('nan'):>13.1f}"
+            f"{result['response_bytes'] / 1024:>8.0f}"
+            f"{benchmarking.p50_change(result, baseline, 'encoder', 'feeds'):>13}",
+        )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark feeds response encoding")
+    parser.add_argument(
+        "--encoders",
+        nargs="+",
+        choices=ENCODERS,
+        default=list(ENCODERS),
+    )
+    parser.add_argument("--feeds", type=int, default=100, help="feeds in a response")
+    parser.add_argument("--images", type=int, default=3, help="images of every feed")
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="seed of the generated feeds",
+    )
+    benchmarking.add_arguments(parser, output="benchmark_serializers.json", repeats=200)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    feeds = generate_feeds(args.feeds, args.images, args.seed)
+    baseline = benchmarking.read_baseline(args.compare, "encoder", "feeds")
+
+    results = []
+    for encoder in args.encoders:
+        logger.info(f"Measuring {encoder} encoding of {args.feeds} feeds")
+        results.append(measure(encoder, feeds, args.repeats))
+
+    benchmarking.write_results(
+        args.output,
+        benchmarking.environment(
+            orjson=orjson.__version__,
+            pydantic=pydantic.VERSION,
+            seed=args.seed,
+            images=args.images,
+        ),
+        results,
+    )
+    _print_results(results, baseline)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.Logging().LEVEL)
+    main()
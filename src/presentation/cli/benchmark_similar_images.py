@@ -0,0 +1,304 @@
+"""
+Benchmarks near-duplicate lookup of PostgresImagesRepository.find_similar at scale:
+latency of queries within every Hamming distance over millions of stored hashes.
+
+Hashes are stored in a scratch schema, in a copy of the images table with the perceptual
+hash indexes and statistics of the migrations, so Postgres must have them applied. Stored
+hashes are uniformly random, and every query is a stored hash with up to the distance of
+its bits flipped, so it finds at least one image. Real dHashes cluster more, so lookups
+of real images scan more candidates than uniform ones.
+
+The scratch schema is dropped after the run, --keep reuses it for the next one.
+
+Run from src/: python -m presentation.cli.benchmark_similar_images [options]
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+import typing
+
+import asyncpg
+import dotenv
+
+import settings
+from infrastructure.persistent.postgres.repositories import images as images_repository
+from infrastructure.persistent.settings import postgres_settings
+from presentation.cli import benchmarking
+from service.helpers.image import perceptual
+
+dotenv.load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = "benchmark_similar_images"
+
+_BATCH_SIZE = 1_000_000
+# Uniformly random signed 64-bit hash of two 32-bit halves, random() has 52 bits
+_INSERT_HASHES = """
+INSERT INTO images (image_id, uploader, url, status, perceptual_hash)
+SELECT gen_random_uuid(), 'benchmark', 'https://storage.example.com/' || n || '.jpg', 'ready',
+       (floor(random() * 4294967296)::bigint << 32) | floor(random() * 4294967296)::bigint
+FROM generate_series($1::bigint, $2::bigint) AS n
+"""
+
+
+async def prepare(
+    connection: asyncpg.Connection,
+    hashes: int,
+    seed: int,
+    statistics: bool,
+) -> None:
+    """Fills the scratch images table, unless kept from a run with as many hashes"""
+    exists = await connection.fetchval(
+        "SELECT to_regclass($1) IS NOT NULL",
+        f"{SCHEMA}.images",
+    )
+    if (
+        exists
+        and await connection.fetchval("SELECT count(*) FROM images") == hashes
+        and await _has_statistics(connection) == statistics
+    ):
+        logger.info(f"Reusing {hashes} hashes of {SCHEMA}")
+        return
+
+    await connection.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    await connection.execute(f"CREATE SCHEMA {SCHEMA}")
+    await connection.execute(
+        "CREATE TABLE images (LIKE public.images INCLUDING DEFAULTS)",
+    )
+    await connection.execute("SELECT setseed($1)", (seed % 1000) / 1000)
+    for start in range(1, hashes + 1, _BATCH_SIZE):
+        logger.info(f"Inserting hashes from {start} of {hashes}")
+        await connection.execute(
+            _INSERT_HASHES,
+            start,
+            min(start + _BATCH_SIZE - 1, hashes),
+        )
+
+    # Built after filling, as the migrations define them
+    definitions = await connection.fetch(
+        "SELECT indexname AS name, indexdef AS definition FROM pg_indexes "
+        "WHERE schemaname = 'public' AND tablename = 'images' "
+        "AND indexname LIKE 'ix_images_perceptual_hash_%'",
+    )
+    if not definitions:
+        raise SystemExit(
+            "No perceptual hash indexes on public.images: apply the migrations",
+        )
+    if statistics:
+        definitions += await connection.fetch(
+            "SELECT stxname AS name, pg_get_statisticsobjdef(oid) AS definition "
+            "FROM pg_statistic_ext "
+            "WHERE stxrelid = 'public.images'::regclass "
+            "AND stxname LIKE 'st_images_perceptual_hash_%'",
+        )
+    for definition in definitions:
+        logger.info(f"Building {definition['name']}")
+        await connection.execute(
+            definition["definition"].replace("public.", f"{SCHEMA}."),
+        )
+    await connection.execute("ANALYZE images")
+
+
+async def _has_statistics(connection: asyncpg.Connection) -> bool:
+    return bool(
+        await connection.fetchval(
+            "SELECT EXISTS (SELECT FROM pg_statistic_ext WHERE stxnamespace = $1::regnamespace)",
+            SCHEMA,
+        ),
+    )
+
+
+async def _queries(
+    connection: asyncpg.Connection,
+    count: int,
+    max_distance: int,
+    rng: random.Random,
+) -> list[int]:
+    """Stored hashes with up to max_distance random bits flipped"""
+    stored = await connection.fetch(
+        "SELECT perceptual_hash FROM images ORDER BY random() LIMIT $1",
+        count,
+    )
+    queries = []
+    for row in stored:
+        flips = sum(
+            1 << bit
+            for bit in rng.sample(range(perceptual.BITS), rng.randint(0, max_distance))
+        )
+        queries.append(perceptual._signed((row[0] ^ flips) & perceptual._UNSIGNED_MASK))
+    return queries
+
+
+async def _uses_indexes(connection: asyncpg.Connection, perceptual_hash: int) -> bool:
+    """Whether the lookup plan scans the chunk indexes, not the whole table"""
+    candidates = perceptual.chunk_candidates(perceptual_hash, 0)
+    plan = await connection.fetch(
+        "EXPLAIN (FORMAT TEXT) SELECT 1 FROM images WHERE perceptual_hash IS NOT NULL AND ("
+        "((perceptual_hash >> 48) & 65535) = ANY($1::bigint[]) "
+        "OR ((perceptual_hash >> 32) & 65535) = ANY($2::bigint[]) "
+        "OR ((perceptual_hash >> 16) & 65535) = ANY($3::bigint[]) "
+        "OR (perceptual_hash & 65535) = ANY($4::bigint[]))",
+        *candidates,
+    )
+    return any("ix_images_perceptual_hash" in row[0] for row in plan)
+
+
+async def measure(
+    connection: asyncpg.Connection,
+    hashes: int,
+    max_distance: int,
+    queries: list[int],
+    limit: int,
+    statistics: bool,
+) -> dict[str, typing.Any]:
+    repository = images_repository.PostgresImagesRepository(connection)
+    # Warmup, results of every query
+    found = [
+        await repository.find_similar(perceptual_hash, max_distance, limit)
+        for perceptual_hash in queries
+    ]
+    wall: list[float] = []
+    for perceptual_hash in queries:
+        started = time.perf_counter()
+        await repository.find_similar(perceptual_hash, max_distance, limit)
+        wall.append(time.perf_counter() - started)
+    return {
+        "hashes": hashes,
+        "max_distance": max_distance,
+        "statistics": statistics,
+        "queries": len(queries),
+        "limit": limit,
+        "chunk_values": sum(map(len, perceptual.chunk_candidates(0, max_distance))),
+        "latency_ms": benchmarking.latency_ms(wall),
+        "found_mean": sum(map(len, found)) / len(found),
+        "missed": sum(not similar for similar in found),
+        "uses_indexes": await _uses_indexes(connection, queries[0]),
+    }
+
+
+def _print_results(
+    results: list[dict[str, typing.Any]],
+    baseline: dict[tuple, dict[str, typing.Any]],
+) -> None:
+    print(
+        f"{'hashes':>11}{'distance':>10}{'statistics':>12}{'chunk values':>14}{'p50 ms':>9}"
+        f"{'p95 ms':>9}{'found':>7}{'missed':>8}{'indexes':>9}{'p50 vs base':>13}",
+    )
+    for result in results:
+        change = benchmarking.p50_change(
+            result,
+            baseline,
+            "hashes",
+            "max_distance",
+            "statistics",
+        )
+        print(
+            f"{result['hashes']:>11}{result['max_distance']:>10}"
+            f"{'yes' if result['statistics'] else 'no':>12}{result['chunk_values']:>14}"
+            f"{result['latency_ms']['p50']:>9.2f}{result['latency_ms']['p95']:>9.2f}"
+            f"{result['found_mean']:>7.1f}{result['missed']:>8}"
+            f"{'yes' if result['uses_indexes'] else 'no':>9}{change:>13}",
+        )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark near-duplicate image lookup",
+    )
+    parser.add_argument(
+        "--hashes",
+        type=int,
+        default=1_000_000,
+        help="stored hashes, e.g. 10000000 for production scale",
+    )
+    parser.add_argument(
+        "--distances",
+        nargs="+",
+        type=int,
+        default=[0, 4, 8, perceptual.MAX_DISTANCE],
+    )
+    parser.add_argument(
+        "--queries",
+        type=int,
+        default=200,
+        help="queries of every distance",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=20,
+        help="images a query returns at most",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="seed of hashes and queries",
+    )
+    parser.add_argument(
+        "--no-statistics",
+        dest="statistics",
+        action="store_false",
+        help="skip statistics of hash chunks, as before they were collected",
+    )
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schema")
+    parser.add_argument(
+        "--dsn",
+        default=postgres_settings.dsn,
+        help="Postgres with migrations",
+    )
+    benchmarking.add_arguments(parser, output="benchmark_similar_images.json")
+    return parser.parse_args()
+
+
+async def run(args: argparse.Namespace) -> list[dict[str, typing.Any]]:
+    connection = await asyncpg.connect(
+        args.dsn,
+        server_settings={"search_path": SCHEMA},
+    )
+    try:
+        await prepare(connection, args.hashes, args.seed, args.statistics)
+        rng = random.Random(args.seed)
+        results = []
+        for max_distance in args.distances:
+            logger.info(
+                f"Measuring lookups within {max_distance} of {args.hashes} hashes",
+            )
+            queries = await _queries(connection, args.queries, max_distance, rng)
+            results.append(
+                await measure(
+                    connection,
+                    args.hashes,
+                    max_distance,
+                    queries,
+                    args.limit,
+                    args.statistics,
+                ),
+            )
+        return results
+    finally:
+        if not args.keep:
+            await connection.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await connection.close()
+
+
+def main() -> None:
+    args = _parse_args()
+    baseline = benchmarking.read_baseline(
+        args.compare,
+        "hashes",
+        "max_distance",
+        "statistics",
+    )
+    results = asyncio.run(run(args))
+    benchmarking.write_results(args.output, benchmarking.environment(), results)
+    _print_results(results, baseline)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.Logging().LEVEL)
+    main()
@@ -0,0 +1,185 @@
+"""
+Reports storage savings of the stored JPEG encoding policy on a sample corpus: the bytes
+of every stored image under the previous encoding, Pillow defaults at full resolution
+(quality 75, no optimized Huffman tables, baseline), against the configured policy.
+
+The corpus is the generated fixtures of benchmark_images, or image files of --corpus.
+
+Run from src/: python -m presentation.cli.benchmark_storage_savings [options]
+"""
+
+import argparse
+import io
+import logging
+import pathlib
+import typing
+
+import dotenv
+import PIL
+import PIL.Image
+
+import settings
+from infrastructure.services import image_processor
+from presentation.cli import benchmark_images, benchmarking
+from service.helpers.image import transcode
+
+dotenv.load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+ENCODINGS = ("pillow_defaults", "policy")
+
+
+def _pillow_defaults(image: bytes) -> bytes:
+    """How uploads were stored before the policy"""
+    encoded = io.BytesIO()
+    PIL.Image.open(io.BytesIO(image)).convert("RGB").save(encoded, format="JPEG")
+    return encoded.getvalue()
+
+
+def _policy(image: bytes) -> bytes:
+    policy = image_processor._jpeg_policy(settings.image_processing_settings)
+    return transcode.transcode_to_jpeg(io.BytesIO(image), policy).getvalue()
+
+
+_ENCODERS: dict[str, typing.Callable[[bytes], bytes]] = {
+    "pillow_defaults": _pillow_defaults,
+    "policy": _policy,
+}
+
+
+def _read_corpus(directory: pathlib.Path | None, seed: int) -> dict[str, bytes]:
+    if directory is None:
+        return benchmark_images.generate_fixtures(seed)
+    return {
+        path.name: path.read_bytes()
+        for path in sorted(directory.iterdir())
+        if path.is_file()
+    }
+
+
+def measure(
+    encoding: str,
+    name: str,
+    image: bytes,
+    repeats: int,
+) -> dict[str, typing.Any]:
+    wall, cpu, encoded = benchmarking.timed(lambda: _ENCODERS[encoding](image), repeats)
+    with PIL.Image.open(io.BytesIO(encoded)) as stored:
+        width, height = stored.size
+    return {
+        "encoding": encoding,
+        "image": name,
+        "input_bytes": len(image),
+        "output_bytes": len(encoded),
+        "width": width,
+        "height": height,
+        "repeats": repeats,
+        "latency_ms": benchmarking.latency_ms(wall),
+        "cpu_ms": 1000 * sum(cpu) / len(cpu),
+    }
+
+
+def _print_results(
+    results: list[dict[str, typing.Any]],
+    baseline: dict[tuple, dict[str, typing.Any]],
+) -> None:
+    previous = {
+        result["image"]: result["output_bytes"]
+        for result in results
+        if result["encoding"] == "pillow_defaults"
+    }
+    print(
+        f"{'encoding':<17}{'image':<24}{'size':>12}{'in KiB':>9}{'out KiB':>9}{'saved':>8}"
+        f"{'p50 ms':>9}{'p50 vs base':>13}",
+    )
+    for result in results:
+        change = benchmarking.p50_change(result, baseline, "encoding", "image")
+        before = previous.get(result["image"])
+        saved = (
+            f"{1 - result['output_bytes'] / before:.0%}"
+            if before and result["encoding"] != "pillow_defaults"
+            else "-"
+        )
+        size = f"{result['width']}x{result['height']}"
+        print(
+            f"{result['encoding']:<17}{result['image'][:23]:<24}{size:>12}"
+            f"{result['input_bytes'] / 1024:>9.0f}{result['output_bytes'] / 1024:>9.0f}"
+            f"{saved:>8}{result['latency_ms']['p50']:>9.1f}{change:>13}",
+        )
+
+    totals = {
+        encoding: sum(
+            result["output_bytes"]
+            for result in results
+            if result["encoding"] == encoding
+        )
+        for encoding in ENCODINGS
+    }
+    if totals["pillow_defaults"]:
+        print(
+            f"Corpus stored in {totals['pillow_defaults'] / 2**20:.1f} MiB with Pillow defaults, "
+            f"{totals['policy'] / 2**20:.1f} MiB with the policy: "
+            f"{1 - totals['policy'] / totals['pillow_defaults']:.0%} saved",
+        )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Report storage savings of the JPEG policy",
+    )
+    parser.add_argument(
+        "--corpus",
+        type=pathlib.Path,
+        help="directory of sample images, the generated fixtures by default",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="seed of the generated corpus",
+    )
+    benchmarking.add_arguments(
+        parser,
+        output="benchmark_storage_savings.json",
+        repeats=3,
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    corpus = _read_corpus(args.corpus, args.seed)
+    baseline = benchmarking.read_baseline(args.compare, "encoding", "image")
+
+    results = []
+    for name, image in corpus.items():
+        for encoding in ENCODINGS:
+            logger.info(f"Measuring {encoding} of {name}")
+            results.append(measure(encoding, name, image, args.repeats))
+
+    image_processing_settings = settings.image_processing_settings
+    benchmarking.write_results(
+        args.output,
+        benchmarking.environment(
+            pillow=PIL.__version__,
+            corpus=str(args.corpus) if args.corpus else f"generated, seed {args.seed}",
+            image_processing=image_processing_settings.model_dump(
+                include={
+                    "max_long_edge",
+                    "jpeg_quality",
+                    "jpeg_min_quality",
+                    "jpeg_max_bytes",
+                    "jpeg_progressive",
+                    "jpeg_subsampling",
+                },
+            ),
+        ),
+        results,
+    )
+    _print_results(results, baseline)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.Logging().LEVEL)
+    main()
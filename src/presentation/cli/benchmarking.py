@@ -0,0 +1,144 @@
+"""
+Measuring helpers shared by the offline benchmarks in presentation.cli
+"""
+
+import argparse
+import datetime
+import json
+import os
+import pathlib
+import platform
+import resource
+import sys
+import time
+import typing
+
+T = typing.TypeVar("T")
+
+
+def peak_rss_bytes() -> int:
+    # Linux reports KiB, macOS bytes. Children are the reaped worker processes
+    scale = 1 if sys.platform == "darwin" else 1024
+    return scale * max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+
+
+def percentile(values: typing.Sequence[float], percent: float) -> float:
+    """Nearest rank percentile"""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def latency_ms(wall: typing.Sequence[float]) -> dict[str, float]:
+    return {
+        "mean": 1000 * sum(wall) / len(wall),
+        "p50": 1000 * percentile(wall, 50),
+        "p95": 1000 * percentile(wall, 95),
+        "min": 1000 * min(wall),
+    }
+
+
+def timed(
+    run: typing.Callable[[], T],
+    repeats: int,
+) -> tuple[list[float], list[float], T]:
+    """Wall and CPU seconds of every repeat after a warmup, result of the last one"""
+    result = run()
+    wall: list[float] = []
+    cpu: list[float] = []
+    for _ in range(repeats):
+        wall_started, cpu_started = time.perf_counter(), time.process_time()
+        result = run()
+        wall.append(time.perf_counter() - wall_started)
+        cpu.append(time.process_time() - cpu_started)
+    return wall, cpu, result
+
+
+async def timed_async(
+    run: typing.Callable[[], typing.Awaitable[T]],
+    repeats: int,
+) -> tuple[list[float], list[float], T]:
+    """Same as timed for coroutines, CPU seconds are of the whole process"""
+    result = await run()
+    wall: list[float] = []
+    cpu: list[float] = []
+    for _ in range(repeats):
+        wall_started, cpu_started = time.perf_counter(), time.process_time()
+        result = await run()
+        wall.append(time.perf_counter() - wall_started)
+        cpu.append(time.process_time() - cpu_started)
+    return wall, cpu, result
+
+
+def environment(**extra: typing.Any) -> dict[str, typing.Any]:
+    return {
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        **extra,
+    }
+
+
+def add_arguments(
+    parser: argparse.ArgumentParser,
+    output: str,
+    repeats: int | None = None,
+) -> None:
+    """Arguments every benchmark has: results file, a previous one to compare and repeats"""
+    if repeats is not None:
+        parser.add_argument(
+            "--repeats",
+            type=int,
+            default=repeats,
+            help="measured runs after a warmup",
+        )
+    parser.add_argument(
+        "--output",
+        type=pathlib.Path,
+        default=pathlib.Path(output),
+        help="JSON results file",
+    )
+    parser.add_argument(
+        "--compare",
+        type=pathlib.Path,
+        default=None,
+        help="previous results file",
+    )
+
+
+def write_results(
+    path: pathlib.Path,
+    environment: dict[str, typing.Any],
+    results: list[dict[str, typing.Any]],
+) -> None:
+    path.write_text(
+        json.dumps({"environment": environment, "results": results}, indent=2),
+    )
+
+
+def read_baseline(
+    path: pathlib.Path | None,
+    *key: str,
+) -> dict[tuple, dict[str, typing.Any]]:
+    """Results of a previous run by values of the key fields"""
+    if path is None:
+        return {}
+    return {
+        tuple(result[field] for field in key): result
+        for result in json.loads(path.read_text())["results"]
+    }
+
+
+def p50_change(
+    result: dict[str, typing.Any],
+    baseline: dict[tuple, dict[str, typing.Any]],
+    *key: str,
+) -> str:
+    compared = baseline.get(tuple(result[field] for field in key))
+    if not compared:
+        return "-"
+    return f"{result['latency_ms']['p50'] / compared['latency_ms']['p50'] - 1:+.1%}"
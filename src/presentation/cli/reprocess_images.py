@@ -0,0 +1,152 @@
+"""
+Reprocesses stored images: regenerates blurhash and perceptual hash with current
+parameters, or width variants and encodings too. Images are streamed in id order
+and the last reprocessed id is saved to the checkpoint file after every batch,
+so an interrupted run resumes where it stopped.
+
+Run from src/: python -m presentation.cli.reprocess_images [blurhash|variants] [options]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import pathlib
+import time
+import uuid
+
+import dotenv
+
+import settings
+from infrastructure import dependencies as infrastructure_dependencies
+from infrastructure.persistent.postgres import connection as postgres_connection
+from infrastructure.services import image_processor
+from infrastructure.storages import s3
+from presentation import dependencies
+from service.interfaces import unit_of_work
+from service.models.commands.images import reprocess_images
+
+dotenv.load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Reprocess stored images")
+    parser.add_argument(
+        "mode",
+        choices=("blurhash", "variants"),
+        nargs="?",
+        default="blurhash",
+        help="blurhash: blurhash and perceptual hash only; variants: also width variants "
+        "and encodings",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="reprocess every ready image, not only the ones missing blurhash or variants",
+    )
+    parser.add_argument("--batch-size", type=int, default=100, help="images per update")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.image_processing_settings.workers,
+        help="images downloaded and processed at once",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="at most this many images per second",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="stop after this many images",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=pathlib.Path,
+        default=pathlib.Path("reprocess_images.checkpoint"),
+        help="file with the last reprocessed image id, resumed from when it exists",
+    )
+    return parser.parse_args()
+
+
+def _read_checkpoint(path: pathlib.Path) -> uuid.UUID | None:
+    if not path.exists():
+        return None
+    return uuid.UUID(path.read_text().strip())
+
+
+def _write_checkpoint(path: pathlib.Path, image_id: uuid.UUID) -> None:
+    temporary = path.with_name(f".{path.name}")
+    temporary.write_text(str(image_id))
+    os.replace(temporary, path)
+
+
+async def _reprocess(args: argparse.Namespace) -> None:
+    mediator = dependencies.request_mediator_factory()
+    uow_factory = await infrastructure_dependencies.compiled_container.resolve(
+        unit_of_work.UoWFactory,
+    )
+    after = _read_checkpoint(args.checkpoint)
+    if after is not None:
+        logger.info(f"Resuming after image {after}")
+
+    started = time.monotonic()
+    total = reprocessed = missing = failed = 0
+    # Cursor stays open in its own transaction, batches are saved in separate ones
+    async with uow_factory() as uow:
+        async for images in uow.images_repository.iter_for_reprocessing(
+            after=after,
+            batch_size=args.batch_size,
+            missing_blurhash=not args.all and args.mode == "blurhash",
+            missing_variants=not args.all and args.mode == "variants",
+        ):
+            if args.limit is not None:
+                images = images[: args.limit - total]
+            result = await mediator.send(
+                reprocess_images.ReprocessImages(
+                    images=images,
+                    variants=args.mode == "variants",
+                    concurrency=args.concurrency,
+                ),
+            )
+            _write_checkpoint(args.checkpoint, images[-1].image_id)
+
+            total += len(images)
+            reprocessed += result.reprocessed
+            missing += result.missing
+            failed += result.failed
+            elapsed = time.monotonic() - started
+            logger.info(
+                f"{total} images: {reprocessed} reprocessed, {missing} missing, "
+                f"{failed} failed, {total / elapsed:.1f} images/s",
+            )
+
+            if args.limit is not None and total >= args.limit:
+                break
+            if args.rate is not None:
+                # Sleep until the average rate falls to the limit
+                await asyncio.sleep(max(0.0, total / args.rate - elapsed))
+
+
+async def main() -> None:
+    args = _parse_args()
+    await postgres_connection.init_pool()
+    dependencies.compile_dependencies()
+    image_processor.start_executor()
+    try:
+        await _reprocess(args)
+    finally:
+        infrastructure_dependencies.compiled_container.close()
+        image_processor.shutdown_executor()
+        s3.close()
+        await postgres_connection.close_pool()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.Logging().LEVEL)
+    asyncio.run(main())
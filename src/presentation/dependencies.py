@@ -1,25 +1,80 @@
 import functools
+import typing
 
 import cqrs
 from cqrs.events import bootstrap as event_bootstrap
-from cqrs.requests import bootstrap as request_bootstrap
+from cqrs.middlewares import base as middlewares, logging as logging_middleware
+from cqrs.requests import bootstrap as request_bootstrap, map as request_map
 
 from infrastructure import dependencies
+from presentation import mediator
+from presentation.api import settings
 from service import mapping
+from service.interfaces.services import iam_service as iam_service_interface
+
+
+RequestsMapper = typing.Callable[[request_map.RequestMap], None]
+
+
+def build_request_mediator(
+    commands_mapper: RequestsMapper,
+    queries_mapper: RequestsMapper,
+    queries_fast_path: bool,
+) -> cqrs.RequestMediator:
+    if not queries_fast_path:
+        return request_bootstrap.bootstrap(
+            di_container=dependencies.compiled_container,
+            commands_mapper=commands_mapper,
+            queries_mapper=queries_mapper,
+            domain_events_mapper=mapping.init_events,
+        )
+
+    event_emitter = request_bootstrap.setup_event_emitter(
+        dependencies.compiled_container,
+        mapping.init_events,
+    )
+    requests = request_map.RequestMap()
+    commands_mapper(requests)
+    queries_mapper(requests)
+    queries = request_map.RequestMap()
+    queries_mapper(queries)
+    middleware_chain = middlewares.MiddlewareChain()
+    middleware_chain.add(logging_middleware.LoggingMiddleware())
+    return mediator.QueriesFastPathMediator(
+        request_map=requests,
+        queries_map=queries,
+        container=dependencies.compiled_container,
+        event_emitter=event_emitter,
+        middleware_chain=middleware_chain,
+        event_map=event_emitter._event_map,
+    )
 
 
 @functools.lru_cache
 def request_mediator_factory() -> cqrs.RequestMediator:
-    return request_bootstrap.bootstrap(
-        di_container=dependencies.container,
-        commands_mapper=mapping.init_requests,
-        domain_events_mapper=mapping.init_events,
+    return build_request_mediator(
+        mapping.init_requests,
+        mapping.init_queries,
+        settings.api_settings.mediator_queries_fast_path,
     )
 
 
 @functools.lru_cache
 def event_mediator_factor() -> cqrs.EventMediator:
     return event_bootstrap.bootstrap(
-        di_container=dependencies.container,
+        di_container=dependencies.compiled_container,
         events_mapper=mapping.init_events,
     )
+
+
+def compile_dependencies() -> None:
+    """
+    Solves dependency graphs of IAM service and all request handlers at startup
+    """
+    requests = request_map.RequestMap()
+    mapping.init_requests(requests)
+    mapping.init_queries(requests)
+    dependencies.compiled_container.compile(
+        iam_service_interface.IAMService,
+        *(handler for handler in requests.values() if isinstance(handler, type)),
+    )
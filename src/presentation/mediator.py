@@ -0,0 +1,63 @@
+import typing
+
+import cqrs
+from cqrs.middlewares import base as middlewares
+from cqrs.requests import map as request_map
+
+from infrastructure import dependencies
+
+
+class QueriesFastPathMediator(cqrs.RequestMediator):
+    """
+    Request mediator sending queries straight to their handlers.
+
+    Queries handlers have no events and keep no per-request state, so they are resolved
+    once, wrapped into the middlewares once and reused, and events processing is skipped.
+    Reused handlers live until the container generation changes: the container is closed
+    on shutdown before the Postgres pool, so handlers never outlive the pool they got.
+    Other requests go through the regular mediator pipeline.
+    """
+
+    def __init__(
+        self,
+        *args: typing.Any,
+        queries_map: request_map.RequestMap,
+        container: dependencies.CompiledContainer,
+        middleware_chain: middlewares.MiddlewareChain | None = None,
+        **kwargs: typing.Any,
+    ) -> None:
+        super().__init__(
+            *args,
+            container=container,
+            middleware_chain=middleware_chain,
+            **kwargs,
+        )
+        self._queries_map = queries_map
+        self._queries_container = container
+        self._middleware_chain = middleware_chain or middlewares.MiddlewareChain()
+        self._queries_handles: dict[type, typing.Callable] = {}
+        self._queries_generation = container.generation
+
+    async def _get_query_handle(self, handler_type: type) -> typing.Callable:
+        if self._queries_generation != self._queries_container.generation:
+            self._queries_handles.clear()
+            self._queries_generation = self._queries_container.generation
+        handle = self._queries_handles.get(handler_type)
+        if handle is None:
+            handler = await self._queries_container.resolve(handler_type)
+            if handler.events:
+                raise TypeError(
+                    f"{handler_type.__name__} has events and cannot be sent by fast path",
+                )
+            handle = self._queries_handles.setdefault(
+                handler_type,
+                self._middleware_chain.wrap(handler.handle),
+            )
+        return handle
+
+    async def send(self, request: cqrs.IRequest) -> typing.Any:
+        handler_type = self._queries_map.get(type(request))
+        if handler_type is None or not isinstance(handler_type, type):
+            return await super().send(request)
+        handle = await self._get_query_handle(handler_type)
+        return await handle(request)
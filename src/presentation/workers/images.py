@@ -0,0 +1,105 @@
+"""
+Images worker: processes images uploaded directly to storage or accepted
+for asynchronous processing by POST /feeds/images?async=true, and periodically
+sweeps images pending for too long.
+
+Run from src/: python -m presentation.workers.images
+"""
+
+import asyncio
+import datetime
+import logging
+
+import dotenv
+
+import settings
+from infrastructure import dependencies as infrastructure_dependencies
+from infrastructure.persistent.postgres import connection as postgres_connection
+from infrastructure.services import image_processor
+from infrastructure.storages import s3
+from presentation import dependencies
+from presentation.api import settings as api_settings
+from service.interfaces import queues
+from service.models.commands.images import process_uploaded_image
+
+dotenv.load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Seconds to block on empty queue before checking again
+_POLL_TIMEOUT = 5
+
+
+async def _consume(queue: queues.UploadedImagesQueue) -> None:
+    mediator = dependencies.request_mediator_factory()
+    while True:
+        image_id = await queue.get(timeout=_POLL_TIMEOUT)
+        if image_id is None:
+            continue
+        try:
+            await mediator.send(
+                process_uploaded_image.ProcessUploadedImage(
+                    image_id=image_id,
+                    max_bytes=api_settings.api_settings.max_image_bytes,
+                ),
+            )
+        except Exception:
+            # Left pending: the sweep queues it again
+            logger.exception(f"Failed to process uploaded image {image_id}")
+        await queue.ack(image_id)
+
+
+async def _sweep() -> None:
+    image_processing_settings = settings.image_processing_settings
+    mediator = dependencies.request_mediator_factory()
+    while True:
+        try:
+            result: process_uploaded_image.SweepPendingImagesResponse = (
+                await mediator.send(
+                    process_uploaded_image.SweepPendingImages(
+                        stale_after=datetime.timedelta(
+                            seconds=image_processing_settings.pending_stale_after,
+                        ),
+                        abandon_after=datetime.timedelta(
+                            seconds=image_processing_settings.pending_abandon_after,
+                        ),
+                    ),
+                )
+            )
+        except Exception:
+            logger.exception("Failed to sweep pending images")
+        else:
+            if result.requeued or result.failed or result.acknowledged:
+                logger.info(
+                    f"Pending images swept: {result.requeued} queued again, "
+                    f"{result.failed} failed, {result.acknowledged} acknowledged",
+                )
+        await asyncio.sleep(image_processing_settings.pending_sweep_interval)
+
+
+async def main() -> None:
+    await postgres_connection.init_pool()
+    dependencies.compile_dependencies()
+    image_processor.start_executor()
+    try:
+        queue = await infrastructure_dependencies.compiled_container.resolve(
+            queues.UploadedImagesQueue,
+        )
+        # One consumer per processing worker keeps the process pool busy
+        await asyncio.gather(
+            _sweep(),
+            *(
+                _consume(queue)
+                for _ in range(settings.image_processing_settings.workers)
+            ),
+        )
+    finally:
+        infrastructure_dependencies.compiled_container.close()
+        image_processor.shutdown_executor()
+        s3.close()
+        await postgres_connection.close_pool()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.Logging().LEVEL)
+    asyncio.run(main())
@@ -58,3 +58,27 @@ class AlreadyFollowing(Exception):
 class CannotFollowSelf(Exception):
     def __init__(self, account_id: str):
         super().__init__(f"User {account_id} cannot follow themselves")
+
+
+class ImageProcessingOverloaded(Exception):
+    def __init__(self, queue_size: int):
+        super().__init__(
+            f"Too many images are being processed (queue size {queue_size}), try again later",
+        )
+
+
+class ImageProcessingTimeout(Exception):
+    def __init__(self, timeout: float):
+        super().__init__(f"Image processing did not finish in {timeout} seconds")
+
+
+class UnsupportedImageFormat(Exception):
+    def __init__(self):
+        super().__init__(
+            "Image format is not supported, expected JPEG, PNG, GIF, WebP, BMP, TIFF",
+        )
+
+
+class ImageDimensionsTooLarge(Exception):
+    def __init__(self, max_pixels: int):
+        super().__init__(f"Image is larger than {max_pixels} pixels")
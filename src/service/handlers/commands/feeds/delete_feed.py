@@ -4,7 +4,7 @@ import cqrs
 from cqrs.events import event
 
 from service import exceptions
-from service.interfaces import unit_of_work
+from service.interfaces import cache, unit_of_work
 from service.models.commands.feeds import delete_feed as delete_feed_model
 
 
@@ -12,8 +12,10 @@ class DeleteFeedHandler(cqrs.RequestHandler[delete_feed_model.DeleteFeed, None])
     def __init__(
         self,
         uow_factory: unit_of_work.UoWFactory,
+        fragments_cache: cache.FeedFragmentsCache,
     ):
         self.uow = uow_factory()
+        self.fragments_cache = fragments_cache
         self._events = []
 
     @property
@@ -31,3 +33,5 @@ class DeleteFeedHandler(cqrs.RequestHandler[delete_feed_model.DeleteFeed, None])
 
             await self.uow.feeds_repository.delete(request.feed_id)
             await self.uow.commit()
+
+        await self.fragments_cache.invalidate(request.feed_id)
@@ -27,7 +27,8 @@ class PostFeedHandler(
     async def handle(self, request: post_feed.PostFeed) -> post_feed.PostFeedResponse:
         new_feed_id = uuid.uuid4()
         async with self.uow:
-            images = await self.uow.images_repository.get_many(*request.images)
+            # Pending images are accepted and shown as not ready until processed
+            images = await self.uow.images_repository.lock_many(*request.images)
 
             if len(images) != len(request.images):
                 difference = set(request.images) - set([im.image_id for im in images])
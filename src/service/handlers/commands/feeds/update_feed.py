@@ -6,7 +6,7 @@ from cqrs.events import event
 
 from domain.entities import feed as feed_entity
 from service import exceptions
-from service.interfaces import unit_of_work
+from service.interfaces import cache, unit_of_work
 from service.models.commands.feeds import update_feed as update_feed_model
 
 
@@ -19,8 +19,10 @@ class UpdateFeedHandler(
     def __init__(
         self,
         uow_factory: unit_of_work.UoWFactory,
+        fragments_cache: cache.FeedFragmentsCache,
     ):
         self.uow = uow_factory()
+        self.fragments_cache = fragments_cache
         self._events = []
 
     @property
@@ -42,7 +44,8 @@ class UpdateFeedHandler(
                     feed_id=request.feed_id,
                 )
 
-            images = await self.uow.images_repository.get_many(*request.images)
+            # Pending images are accepted and shown as not ready until processed
+            images = await self.uow.images_repository.lock_many(*request.images)
             if len(images) != len(request.images):
                 difference = set(request.images) - set([im.image_id for im in images])
                 raise exceptions.ImageNotFound(image_id=difference.pop())
@@ -75,4 +78,6 @@ class UpdateFeedHandler(
             )
             await self.uow.commit()
 
+        await self.fragments_cache.invalidate(new_feed.feed_id)
+
         return update_feed_model.UpdateFeedResponse(feed=new_feed)
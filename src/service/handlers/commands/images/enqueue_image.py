@@ -0,0 +1,60 @@
+import typing
+import uuid
+
+import cqrs
+from cqrs.events import event
+
+from domain.entities import images as images_entity
+from service.helpers.image import filenames
+from service.interfaces import queues, unit_of_work
+from service.interfaces.storages import images_storage as images_storage_interface
+from service.models.commands.images import enqueue_image
+
+
+class EnqueueImageHandler(
+    cqrs.RequestHandler[enqueue_image.EnqueueImage, enqueue_image.EnqueueImageResponse],
+):
+    """
+    Accepts upload without processing it: stores the original the same way as direct uploads
+    and queues it for the images worker. The image is pending until the worker marks it ready
+    """
+
+    def __init__(
+        self,
+        image_storage: images_storage_interface.ImagesStorage,
+        uow_factory: unit_of_work.UoWFactory,
+        uploaded_images_queue: queues.UploadedImagesQueue,
+    ):
+        self.image_storage = image_storage
+        self.uow_factory = uow_factory
+        self.uploaded_images_queue = uploaded_images_queue
+
+    @property
+    def events(self) -> typing.List[event.Event]:
+        return []
+
+    async def handle(
+        self,
+        request: enqueue_image.EnqueueImage,
+    ) -> enqueue_image.EnqueueImageResponse:
+        image_id = uuid.uuid4()
+        uploaded_filename = filenames.uploaded(request.uploader, image_id)
+        [url] = await self.image_storage.upload(
+            images_storage_interface.Image(
+                image=request.image,
+                filename=uploaded_filename,
+            ),
+        )
+        image = images_entity.Image(
+            image_id=image_id,
+            uploader=request.uploader,
+            # Replaced with processed image URL once the image is ready
+            url=url,
+            ready=False,
+        )
+        async with self.uow_factory() as uow:
+            await uow.images_repository.add_pending(image)
+            await uow.commit()
+
+        await self.uploaded_images_queue.put(image_id)
+        return enqueue_image.EnqueueImageResponse(image=image)
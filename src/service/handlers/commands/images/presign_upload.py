@@ -0,0 +1,83 @@
+import typing
+import uuid
+
+import cqrs
+from cqrs.events import event
+
+from domain.entities import images as images_entity
+from service import exceptions
+from service.helpers.image import filenames
+from service.interfaces import queues, unit_of_work
+from service.interfaces.storages import images_storage as images_storage_interface
+from service.models.commands.images import presign_upload
+
+
+class PresignImageUploadHandler(
+    cqrs.RequestHandler[
+        presign_upload.PresignImageUpload,
+        presign_upload.PresignImageUploadResponse,
+    ],
+):
+    def __init__(
+        self,
+        image_storage: images_storage_interface.ImagesStorage,
+        uow_factory: unit_of_work.UoWFactory,
+    ):
+        self.image_storage = image_storage
+        self.uow = uow_factory()
+
+    @property
+    def events(self) -> typing.List[event.Event]:
+        return []
+
+    async def handle(
+        self,
+        request: presign_upload.PresignImageUpload,
+    ) -> presign_upload.PresignImageUploadResponse:
+        image_id = uuid.uuid4()
+        uploaded_filename = filenames.uploaded(request.uploader, image_id)
+        presigned_upload = await self.image_storage.presign_upload(
+            uploaded_filename,
+            request.max_bytes,
+        )
+        async with self.uow:
+            await self.uow.images_repository.add_pending(
+                images_entity.Image(
+                    image_id=image_id,
+                    uploader=request.uploader,
+                    # Replaced with processed image URL once the image is ready
+                    url=self.image_storage.get_url(uploaded_filename),
+                ),
+            )
+            await self.uow.commit()
+
+        return presign_upload.PresignImageUploadResponse(
+            image_id=image_id,
+            upload_url=presigned_upload.url,
+            expires_in=presigned_upload.expires_in,
+            upload_fields=presigned_upload.fields,
+        )
+
+
+class CompleteImageUploadHandler(
+    cqrs.RequestHandler[presign_upload.CompleteImageUpload, None],
+):
+    def __init__(
+        self,
+        uow_factory: unit_of_work.UoWFactory,
+        uploaded_images_queue: queues.UploadedImagesQueue,
+    ):
+        self.uow = uow_factory()
+        self.uploaded_images_queue = uploaded_images_queue
+
+    @property
+    def events(self) -> typing.List[event.Event]:
+        return []
+
+    async def handle(self, request: presign_upload.CompleteImageUpload) -> None:
+        async with self.uow:
+            image = await self.uow.images_repository.get_pending(request.image_id)
+        if image is None or image.uploader != request.uploader:
+            raise exceptions.ImageNotFound(image_id=request.image_id)
+
+        await self.uploaded_images_queue.put(request.image_id)
@@ -0,0 +1,198 @@
+import datetime
+import logging
+import typing
+import uuid
+
+import cqrs
+from cqrs.events import event
+
+from domain.entities import images as images_entity
+from service import exceptions
+from service.helpers.image import dedup, filenames, store
+from service.interfaces import queues, unit_of_work
+from service.interfaces.services import image_processor as image_processor_interface
+from service.interfaces.storages import images_storage as images_storage_interface
+from service.models.commands.images import process_uploaded_image
+
+logger = logging.getLogger(__name__)
+
+# The uploaded file itself cannot be processed, processing it again fails the same way
+_UNPROCESSABLE = (exceptions.UnsupportedImageFormat, exceptions.ImageDimensionsTooLarge)
+
+
+class ProcessUploadedImageHandler(
+    cqrs.RequestHandler[process_uploaded_image.ProcessUploadedImage, None],
+):
+    """
+    Finishes direct or asynchronous upload: transcodes the original uploaded by the client,
+    stores processed JPEG with its width variants, saves blurhash and marks image ready.
+    Image which cannot be processed or is larger than max_bytes is marked failed,
+    on other errors it stays pending and SweepPendingImagesHandler queues it again
+    """
+
+    def __init__(
+        self,
+        image_storage: images_storage_interface.ImagesStorage,
+        uow_factory: unit_of_work.UoWFactory,
+        image_processor: image_processor_interface.ImageProcessor,
+    ):
+        self.image_storage = image_storage
+        self.uow_factory = uow_factory
+        self.image_processor = image_processor
+
+    @property
+    def events(self) -> typing.List[event.Event]:
+        return []
+
+    async def handle(
+        self,
+        request: process_uploaded_image.ProcessUploadedImage,
+    ) -> None:
+        async with self.uow_factory() as uow:
+            image = await uow.images_repository.get_pending(request.image_id)
+        if image is None:
+            logger.warning(f"Image {request.image_id} is not pending, skipped")
+            return
+
+        uploaded_filename = filenames.uploaded(image.uploader, image.image_id)
+        if request.max_bytes is not None:
+            # Checked before downloading: the file is read into memory in full
+            size = await self.image_storage.size(uploaded_filename)
+            if size is None:
+                logger.warning(f"Image {request.image_id} was not uploaded, skipped")
+                return
+            if size > request.max_bytes:
+                logger.warning(
+                    f"Image {request.image_id} of {size} bytes is larger than "
+                    f"{request.max_bytes}, failed",
+                )
+                await self._fail(image.image_id, uploaded_filename)
+                return
+
+        original = await self.image_storage.download(uploaded_filename)
+        if original is None:
+            logger.warning(f"Image {request.image_id} was not uploaded, skipped")
+            return
+
+        content_hash = dedup.content_hash(original)
+        async with self.uow_factory() as uow:
+            same_images = await uow.images_repository.get_by_content_hashes(
+                content_hash,
+            )
+        same_image = same_images.get(content_hash)
+
+        if same_image is not None:
+            dedup.dedup_metrics.hit(len(original))
+            url, blurhash_value = same_image.url, same_image.blurhash
+            variants, encodings = same_image.variants, same_image.encodings
+            perceptual_hash = same_image.perceptual_hash
+        else:
+            dedup.dedup_metrics.miss()
+            try:
+                processed_image = await self.image_processor.process(original)
+            except _UNPROCESSABLE as e:
+                logger.warning(
+                    f"Image {request.image_id} cannot be processed, failed: {e}",
+                )
+                await self._fail(image.image_id, uploaded_filename)
+                return
+            url, variants, encodings = await store.store_processed(
+                self.image_storage,
+                content_hash,
+                processed_image,
+            )
+            blurhash_value = processed_image.blurhash
+            perceptual_hash = processed_image.perceptual_hash
+
+        async with self.uow_factory() as uow:
+            await uow.images_repository.mark_ready(
+                image.image_id,
+                url,
+                blurhash_value,
+                content_hash,
+                variants,
+                encodings,
+                perceptual_hash,
+            )
+            await uow.commit()
+
+        await self.image_storage.delete(uploaded_filename)
+
+    async def _fail(self, image_id: uuid.UUID, uploaded_filename: str) -> None:
+        async with self.uow_factory() as uow:
+            await uow.images_repository.mark_failed(image_id)
+            await uow.commit()
+        await self.image_storage.delete(uploaded_filename)
+
+
+class SweepPendingImagesHandler(
+    cqrs.RequestHandler[
+        process_uploaded_image.SweepPendingImages,
+        process_uploaded_image.SweepPendingImagesResponse,
+    ],
+):
+    """
+    Recovers images which never become ready by themselves: queues again images pending
+    for too long, lost by crashed workers, failed to process or whose upload was not
+    completed, and marks failed the ones whose upload can no longer be completed.
+    Acknowledges images crashed workers left being processed after finishing them
+    """
+
+    def __init__(
+        self,
+        image_storage: images_storage_interface.ImagesStorage,
+        uow_factory: unit_of_work.UoWFactory,
+        uploaded_images_queue: queues.UploadedImagesQueue,
+    ):
+        self.image_storage = image_storage
+        self.uow_factory = uow_factory
+        self.uploaded_images_queue = uploaded_images_queue
+
+    @property
+    def events(self) -> typing.List[event.Event]:
+        return []
+
+    async def handle(
+        self,
+        request: process_uploaded_image.SweepPendingImages,
+    ) -> process_uploaded_image.SweepPendingImagesResponse:
+        acknowledged = 0
+        for image_id in await self.uploaded_images_queue.processing():
+            async with self.uow_factory() as uow:
+                image = await uow.images_repository.get_pending(image_id)
+            if image is None:
+                await self.uploaded_images_queue.ack(image_id)
+                acknowledged += 1
+
+        abandoned_before = (
+            datetime.datetime.now(datetime.timezone.utc) - request.abandon_after
+        )
+        requeued = 0
+        failed_images: list[images_entity.Image] = []
+        # Locked images are being swept by another worker
+        async with self.uow_factory() as uow:
+            for image in await uow.images_repository.lock_stale_pending(
+                request.stale_after,
+                request.limit,
+            ):
+                if image.uploaded_at < abandoned_before:
+                    logger.warning(
+                        f"Upload of image {image.image_id} was not completed, failed",
+                    )
+                    await uow.images_repository.mark_failed(image.image_id)
+                    failed_images.append(image)
+                else:
+                    await self.uploaded_images_queue.requeue(image.image_id)
+                    requeued += 1
+            await uow.commit()
+
+        for image in failed_images:
+            await self.uploaded_images_queue.ack(image.image_id)
+            await self.image_storage.delete(
+                filenames.uploaded(image.uploader, image.image_id),
+            )
+        return process_uploaded_image.SweepPendingImagesResponse(
+            requeued=requeued,
+            failed=len(failed_images),
+            acknowledged=acknowledged,
+        )
@@ -0,0 +1,143 @@
+import asyncio
+import dataclasses
+import logging
+import typing
+
+import cqrs
+from cqrs.events import event
+
+from domain.entities import images as images_entity
+from service.helpers.image import dedup, filenames, store
+from service.interfaces import unit_of_work
+from service.interfaces.services import image_processor as image_processor_interface
+from service.interfaces.storages import images_storage as images_storage_interface
+from service.models.commands.images import reprocess_images
+
+logger = logging.getLogger(__name__)
+
+
+class ReprocessImagesHandler(
+    cqrs.RequestHandler[
+        reprocess_images.ReprocessImages,
+        reprocess_images.ReprocessImagesResponse,
+    ],
+):
+    """
+    Regenerates blurhash and perceptual hash of stored images with current parameters,
+    optionally their width variants and encodings, and saves them in one batched update.
+    Images sharing processed file are processed once, failures are logged and skipped.
+    """
+
+    def __init__(
+        self,
+        image_storage: images_storage_interface.ImagesStorage,
+        uow_factory: unit_of_work.UoWFactory,
+        image_processor: image_processor_interface.ImageProcessor,
+    ):
+        self.image_storage = image_storage
+        self.uow_factory = uow_factory
+        self.image_processor = image_processor
+
+    @property
+    def events(self) -> typing.List[event.Event]:
+        return []
+
+    async def handle(
+        self,
+        request: reprocess_images.ReprocessImages,
+    ) -> reprocess_images.ReprocessImagesResponse:
+        semaphore = asyncio.Semaphore(request.concurrency)
+        # Processed filename -> reprocessing of the file shared by images in the batch
+        in_batch: dict[str, asyncio.Future[images_entity.Image | None]] = {}
+
+        async def reprocess(image: images_entity.Image) -> images_entity.Image | None:
+            filename = filenames.processed(
+                image.uploader,
+                image.image_id,
+                image.content_hash,
+            )
+            if filename not in in_batch:
+                in_batch[filename] = asyncio.ensure_future(
+                    self._reprocess(image, filename, request.variants, semaphore),
+                )
+            reprocessed = await in_batch[filename]
+            if reprocessed is None:
+                return None
+            return dataclasses.replace(
+                image,
+                url=reprocessed.url,
+                blurhash=reprocessed.blurhash,
+                content_hash=reprocessed.content_hash,
+                variants=reprocessed.variants,
+                encodings=reprocessed.encodings,
+                perceptual_hash=reprocessed.perceptual_hash,
+            )
+
+        results = await asyncio.gather(
+            *(reprocess(image) for image in request.images),
+            return_exceptions=True,
+        )
+
+        reprocessed_images: list[images_entity.Image] = []
+        missing = failed = 0
+        for image, result in zip(request.images, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to reprocess image {image.image_id}: {result!r}")
+                failed += 1
+            elif result is None:
+                missing += 1
+            else:
+                reprocessed_images.append(result)
+
+        async with self.uow_factory() as uow:
+            await uow.images_repository.update_processed(*reprocessed_images)
+            await uow.commit()
+
+        return reprocess_images.ReprocessImagesResponse(
+            reprocessed=len(reprocessed_images),
+            missing=missing,
+            failed=failed,
+        )
+
+    async def _reprocess(
+        self,
+        image: images_entity.Image,
+        filename: str,
+        variants: bool,
+        semaphore: asyncio.Semaphore,
+    ) -> images_entity.Image | None:
+        async with semaphore:
+            processed_file = await self.image_storage.download(filename)
+            if processed_file is None:
+                logger.warning(
+                    f"Processed file {filename} of image {image.image_id} is missing",
+                )
+                return None
+
+            if not variants:
+                blurhash_value, perceptual_hash = await self.image_processor.hashes(
+                    processed_file,
+                )
+                return dataclasses.replace(
+                    image,
+                    blurhash=blurhash_value,
+                    perceptual_hash=perceptual_hash,
+                )
+
+            # Images uploaded before content hashing move to content addressed files
+            content_hash = image.content_hash or dedup.content_hash(processed_file)
+            processed_image = await self.image_processor.process(processed_file)
+            url, image_variants, encodings = await store.store_processed(
+                self.image_storage,
+                content_hash,
+                processed_image,
+            )
+            return dataclasses.replace(
+                image,
+                url=url,
+                blurhash=processed_image.blurhash,
+                content_hash=content_hash,
+                variants=image_variants,
+                encodings=encodings,
+                perceptual_hash=processed_image.perceptual_hash,
+            )
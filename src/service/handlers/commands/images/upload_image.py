@@ -1,4 +1,3 @@
-import io
 import typing
 import uuid
 
@@ -6,8 +5,9 @@ import cqrs
 from cqrs.events import event
 
 from domain.entities import images as images_entity
-from service.helpers.image import blurhash, transcode
+from service.helpers.image import dedup, store
 from service.interfaces import unit_of_work
+from service.interfaces.services import image_processor as image_processor_interface
 from service.interfaces.storages import images_storage as images_storage_interface
 from service.models.commands.images import upload_image
 
@@ -19,9 +19,11 @@ class UploadImageHandler(
         self,
         image_storage: images_storage_interface.ImagesStorage,
         uow_factory: unit_of_work.UoWFactory,
+        image_processor: image_processor_interface.ImageProcessor,
     ):
         self.image_storage = image_storage
-        self.uow = uow_factory()
+        self.image_processor = image_processor
+        self.uow_factory = uow_factory
         self._events = []
 
     @property
@@ -32,24 +34,41 @@ class UploadImageHandler(
         self,
         request: upload_image.UploadImage,
     ) -> upload_image.UploadImageResponse:
-        transcode_image = transcode.transcode_to_jpeg(io.BytesIO(request.image))
-        transcode_image.seek(0)
-        blurhash_value = blurhash.generate_blurhash(transcode_image)
-
-        image_id = uuid.uuid4()
-        image_for_uploading = images_storage_interface.Image(
-            image=transcode_image.read(),
-            filename=f"{request.uploader}/{image_id}.jpg",
-        )
-        [url] = await self.image_storage.upload(image_for_uploading)
+        content_hash = dedup.content_hash(request.image)
+        async with self.uow_factory() as uow:
+            same_images = await uow.images_repository.get_by_content_hashes(
+                content_hash,
+            )
+        same_image = same_images.get(content_hash)
+
+        if same_image is not None:
+            dedup.dedup_metrics.hit(len(request.image))
+            url, blurhash_value = same_image.url, same_image.blurhash
+            variants, encodings = same_image.variants, same_image.encodings
+            perceptual_hash = same_image.perceptual_hash
+        else:
+            dedup.dedup_metrics.miss()
+            processed_image = await self.image_processor.process(request.image)
+            url, variants, encodings = await store.store_processed(
+                self.image_storage,
+                content_hash,
+                processed_image,
+            )
+            blurhash_value = processed_image.blurhash
+            perceptual_hash = processed_image.perceptual_hash
+
         uploaded_image = images_entity.Image(
-            image_id=image_id,
+            image_id=uuid.uuid4(),
             uploader=request.uploader,
             url=url,
             blurhash=blurhash_value,
+            content_hash=content_hash,
+            variants=variants,
+            encodings=encodings,
+            perceptual_hash=perceptual_hash,
         )
-        async with self.uow:
-            await self.uow.images_repository.add(uploaded_image)
-            await self.uow.commit()
+        async with self.uow_factory() as uow:
+            await uow.images_repository.add(uploaded_image)
+            await uow.commit()
 
         return upload_image.UploadImageResponse(image=uploaded_image)
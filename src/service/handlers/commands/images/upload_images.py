@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import typing
+import uuid
+
+import cqrs
+from cqrs.events import event
+
+from domain.entities import images as images_entity
+from service.helpers.image import dedup, store
+from service.interfaces import unit_of_work
+from service.interfaces.services import image_processor as image_processor_interface
+from service.interfaces.storages import images_storage as images_storage_interface
+from service.models.commands.images import upload_images
+
+logger = logging.getLogger(__name__)
+
+# Stored image of content hash: url, blurhash, variants, encodings
+_StoredImage: typing.TypeAlias = tuple[
+    str,
+    str | None,
+    tuple[images_entity.ImageVariant, ...],
+    tuple[images_entity.ImageEncoding, ...],
+    int | None,
+]
+
+
+class UploadImagesHandler(
+    cqrs.RequestHandler[upload_images.UploadImages, upload_images.UploadImagesResponse],
+):
+    def __init__(
+        self,
+        image_storage: images_storage_interface.ImagesStorage,
+        uow_factory: unit_of_work.UoWFactory,
+        image_processor: image_processor_interface.ImageProcessor,
+    ):
+        self.image_storage = image_storage
+        self.image_processor = image_processor
+        self.uow_factory = uow_factory
+
+    @property
+    def events(self) -> typing.List[event.Event]:
+        return []
+
+    async def handle(
+        self,
+        request: upload_images.UploadImages,
+    ) -> upload_images.UploadImagesResponse:
+        content_hashes = [dedup.content_hash(image) for image in request.images]
+        async with self.uow_factory() as uow:
+            same_images = await uow.images_repository.get_by_content_hashes(
+                *set(content_hashes),
+            )
+
+        # Only the first of the same files in the batch is processed
+        new_images: dict[str, bytes] = {}
+        for content_hash, image in zip(content_hashes, request.images):
+            if content_hash in same_images or content_hash in new_images:
+                dedup.dedup_metrics.hit(len(image))
+            else:
+                dedup.dedup_metrics.miss()
+                new_images[content_hash] = image
+
+        stored: dict[str, _StoredImage] = {
+            content_hash: (
+                image.url,
+                image.blurhash,
+                image.variants,
+                image.encodings,
+                image.perceptual_hash,
+            )
+            for content_hash, image in same_images.items()
+        }
+        processed_images: dict[str, image_processor_interface.ProcessedImage] = {}
+        semaphore = asyncio.Semaphore(request.concurrency)
+
+        async def process_and_store(content_hash: str, image: bytes) -> None:
+            # The request keeps at most concurrency images in the image processor queue,
+            # so a large batch is not rejected as overload by itself
+            async with semaphore:
+                processed_image = await self.image_processor.process(image)
+            processed_images[content_hash] = processed_image
+            url, variants, encodings = await store.store_processed(
+                self.image_storage,
+                content_hash,
+                processed_image,
+            )
+            stored[content_hash] = (
+                url,
+                processed_image.blurhash,
+                variants,
+                encodings,
+                processed_image.perceptual_hash,
+            )
+
+        try:
+            try:
+                # The first failure cancels processing and storing of the other images
+                async with asyncio.TaskGroup() as task_group:
+                    for content_hash, image in new_images.items():
+                        task_group.create_task(process_and_store(content_hash, image))
+            except ExceptionGroup as group:
+                raise group.exceptions[0]
+
+            uploaded_images = [
+                images_entity.Image(
+                    image_id=uuid.uuid4(),
+                    uploader=request.uploader,
+                    url=stored[content_hash][0],
+                    blurhash=stored[content_hash][1],
+                    content_hash=content_hash,
+                    variants=stored[content_hash][2],
+                    encodings=stored[content_hash][3],
+                    perceptual_hash=stored[content_hash][4],
+                )
+                for content_hash in content_hashes
+            ]
+            async with self.uow_factory() as uow:
+                await uow.images_repository.add_many(*uploaded_images)
+                await uow.commit()
+        except BaseException:
+            await self._delete_stored(processed_images)
+            raise
+
+        return upload_images.UploadImagesResponse(images=uploaded_images)
+
+    async def _delete_stored(
+        self,
+        processed_images: dict[str, image_processor_interface.ProcessedImage],
+    ) -> None:
+        """
+        Deletes files of the failed upload, the ones it may have stored. Files are content
+        addressed: those an upload of the same content has committed meanwhile are kept
+        """
+        if not processed_images:
+            return
+        try:
+            async with self.uow_factory() as uow:
+                committed = await uow.images_repository.get_by_content_hashes(
+                    *processed_images,
+                )
+            await asyncio.gather(
+                *(
+                    store.delete_processed(
+                        self.image_storage,
+                        content_hash,
+                        processed_image,
+                    )
+                    for content_hash, processed_image in processed_images.items()
+                    if content_hash not in committed
+                ),
+            )
+        except Exception as e:
+            logger.error(f"Failed to delete stored files of failed upload: {e!r}")
@@ -3,15 +3,47 @@ import typing
 import cqrs
 from cqrs.events import event
 
-from service.interfaces import unit_of_work
+from domain.entities import feed as feed_entity
+from service.helpers.feeds import fragments
+from service.interfaces import cache, unit_of_work
 from service.models.queries.feeds import get_feeds
 
 
+async def _assemble_feeds(
+    uow: unit_of_work.UoW,
+    fragments_cache: cache.FeedFragmentsCache,
+    states: list[feed_entity.FeedState],
+    image_format: str | None = None,
+) -> list[bytes]:
+    """
+    Splices feeds states into cached fragments. Content of feeds missing in cache is loaded from storage.
+    """
+    versions = {state.feed_id: state.version for state in states}
+    cached = await fragments_cache.get_many(versions, image_format)
+
+    missing = [feed_id for feed_id in versions if feed_id not in cached]
+    if missing:
+        rendered = {
+            feed.feed_id: (versions[feed.feed_id], fragments.render(feed, image_format))
+            for feed in await uow.feeds_repository.get_by_ids(missing)
+        }
+        await fragments_cache.set_many(rendered, image_format)
+        cached.update(
+            (feed_id, fragment) for feed_id, (_, fragment) in rendered.items()
+        )
+
+    return [
+        fragments.splice(cached[state.feed_id], state)
+        for state in states
+        if state.feed_id in cached
+    ]
+
+
 class GetAccountFeedsHandler(
     cqrs.RequestHandler[get_feeds.GetAccountFeeds, get_feeds.GetAccountFeedsResponse],
 ):
     def __init__(self, uow_factory: unit_of_work.UoWFactory):
-        self.uow = uow_factory()
+        self.uow_factory = uow_factory
 
     @property
     def events(self) -> typing.List[event.Event]:
@@ -21,11 +53,11 @@ class GetAccountFeedsHandler(
         self,
         request: get_feeds.GetAccountFeeds,
     ) -> get_feeds.GetAccountFeedsResponse:
-        async with self.uow:
+        async with self.uow_factory() as uow:
             (
                 account_feeds,
                 total_count,
-            ) = await self.uow.feeds_repository.get_account_feeds(
+            ) = await uow.feeds_repository.get_account_feeds(
                 request.account_id,
                 limit=request.limit,
                 offset=request.offset,
@@ -44,7 +76,7 @@ class GetFeedsHandler(
     cqrs.RequestHandler[get_feeds.GetFeeds, get_feeds.GetFeedsResponse],
 ):
     def __init__(self, uow_factory: unit_of_work.UoWFactory):
-        self.uow = uow_factory()
+        self.uow_factory = uow_factory
 
     @property
     def events(self) -> typing.List[event.Event]:
@@ -54,9 +86,152 @@ class GetFeedsHandler(
         self,
         request: get_feeds.GetFeeds,
     ) -> get_feeds.GetFeedsResponse:
-        async with self.uow:
-            feeds = await self.uow.feeds_repository.get_by_ids(
+        async with self.uow_factory() as uow:
+            feeds = await uow.feeds_repository.get_by_ids(
                 request.feed_ids,
                 current_account_id=request.current_account_id,
             )
             return get_feeds.GetFeedsResponse(feeds=feeds)
+
+
+class GetAccountFeedsJsonHandler(
+    cqrs.RequestHandler[
+        get_feeds.GetAccountFeedsJson,
+        get_feeds.GetAccountFeedsJsonResponse,
+    ],
+):
+    def __init__(self, uow_factory: unit_of_work.UoWFactory):
+        self.uow_factory = uow_factory
+
+    @property
+    def events(self) -> typing.List[event.Event]:
+        return []
+
+    async def handle(
+        self,
+        request: get_feeds.GetAccountFeedsJson,
+    ) -> get_feeds.GetAccountFeedsJsonResponse:
+        async with self.uow_factory() as uow:
+            (
+                account_feeds,
+                total_count,
+            ) = await uow.feeds_repository.get_account_feeds_json(
+                request.account_id,
+                limit=request.limit,
+                offset=request.offset,
+                current_account_id=request.current_account_id,
+                image_format=request.image_format,
+            )
+            return get_feeds.GetAccountFeedsJsonResponse(
+                account_id=request.account_id,
+                feeds=account_feeds,
+                limit=request.limit,
+                offset=request.offset,
+                total_count=total_count,
+            )
+
+
+class GetFeedsJsonHandler(
+    cqrs.RequestHandler[get_feeds.GetFeedsJson, get_feeds.GetFeedsJsonResponse],
+):
+    def __init__(self, uow_factory: unit_of_work.UoWFactory):
+        self.uow_factory = uow_factory
+
+    @property
+    def events(self) -> typing.List[event.Event]:
+        return []
+
+    async def handle(
+        self,
+        request: get_feeds.GetFeedsJson,
+    ) -> get_feeds.GetFeedsJsonResponse:
+        async with self.uow_factory() as uow:
+            feeds = await uow.feeds_repository.get_by_ids_json(
+                request.feed_ids,
+                current_account_id=request.current_account_id,
+                image_format=request.image_format,
+            )
+            return get_feeds.GetFeedsJsonResponse(feeds=feeds)
+
+
+class GetAccountFeedsFragmentsHandler(
+    cqrs.RequestHandler[
+        get_feeds.GetAccountFeedsFragments,
+        get_feeds.GetAccountFeedsFragmentsResponse,
+    ],
+):
+    def __init__(
+        self,
+        uow_factory: unit_of_work.UoWFactory,
+        fragments_cache: cache.FeedFragmentsCache,
+    ):
+        self.uow_factory = uow_factory
+        self.fragments_cache = fragments_cache
+
+    @property
+    def events(self) -> typing.List[event.Event]:
+        return []
+
+    async def handle(
+        self,
+        request: get_feeds.GetAccountFeedsFragments,
+    ) -> get_feeds.GetAccountFeedsFragmentsResponse:
+        async with self.uow_factory() as uow:
+            (
+                states,
+                total_count,
+            ) = await uow.feeds_repository.get_account_feed_states(
+                request.account_id,
+                limit=request.limit,
+                offset=request.offset,
+                current_account_id=request.current_account_id,
+            )
+            return get_feeds.GetAccountFeedsFragmentsResponse(
+                account_id=request.account_id,
+                feeds=await _assemble_feeds(
+                    uow,
+                    self.fragments_cache,
+                    states,
+                    request.image_format,
+                ),
+                limit=request.limit,
+                offset=request.offset,
+                total_count=total_count,
+            )
+
+
+class GetFeedsFragmentsHandler(
+    cqrs.RequestHandler[
+        get_feeds.GetFeedsFragments,
+        get_feeds.GetFeedsFragmentsResponse,
+    ],
+):
+    def __init__(
+        self,
+        uow_factory: unit_of_work.UoWFactory,
+        fragments_cache: cache.FeedFragmentsCache,
+    ):
+        self.uow_factory = uow_factory
+        self.fragments_cache = fragments_cache
+
+    @property
+    def events(self) -> typing.List[event.Event]:
+        return []
+
+    async def handle(
+        self,
+        request: get_feeds.GetFeedsFragments,
+    ) -> get_feeds.GetFeedsFragmentsResponse:
+        async with self.uow_factory() as uow:
+            states = await uow.feeds_repository.get_states_by_ids(
+                request.feed_ids,
+                current_account_id=request.current_account_id,
+            )
+            return get_feeds.GetFeedsFragmentsResponse(
+                feeds=await _assemble_feeds(
+                    uow,
+                    self.fragments_cache,
+                    states,
+                    request.image_format,
+                ),
+            )
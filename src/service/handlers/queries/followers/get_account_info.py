@@ -14,7 +14,7 @@ class GetAccountInfoHandler(
     ],
 ):
     def __init__(self, uow_factory: unit_of_work.UoWFactory):
-        self.uow = uow_factory()
+        self.uow_factory = uow_factory
 
     @property
     def events(self) -> typing.List[event.Event]:
@@ -24,12 +24,12 @@ class GetAccountInfoHandler(
         self,
         request: get_account_info_model.GetAccountInfo,
     ) -> get_account_info_model.GetAccountInfoResponse:
-        async with self.uow:
+        async with self.uow_factory() as uow:
             (
                 followers_count,
                 following_count,
                 feeds_count,
-            ) = await self.uow.feeds_repository.get_account_info_counts(
+            ) = await uow.feeds_repository.get_account_info_counts(
                 request.account_id,
             )
             return get_account_info_model.GetAccountInfoResponse(
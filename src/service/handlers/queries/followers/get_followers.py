@@ -14,7 +14,7 @@ class GetFollowersHandler(
     ],
 ):
     def __init__(self, uow_factory: unit_of_work.UoWFactory):
-        self.uow = uow_factory()
+        self.uow_factory = uow_factory
 
     @property
     def events(self) -> typing.List[event.Event]:
@@ -24,8 +24,8 @@ class GetFollowersHandler(
         self,
         request: get_followers_model.GetFollowers,
     ) -> get_followers_model.GetFollowersResponse:
-        async with self.uow:
-            followers, total_count = await self.uow.followers_repository.get_followers(
+        async with self.uow_factory() as uow:
+            followers, total_count = await uow.followers_repository.get_followers(
                 request.account_id,
                 limit=request.limit,
                 offset=request.offset,
@@ -14,7 +14,7 @@ class GetFollowingHandler(
     ],
 ):
     def __init__(self, uow_factory: unit_of_work.UoWFactory):
-        self.uow = uow_factory()
+        self.uow_factory = uow_factory
 
     @property
     def events(self) -> typing.List[event.Event]:
@@ -24,8 +24,8 @@ class GetFollowingHandler(
         self,
         request: get_following_model.GetFollowing,
     ) -> get_following_model.GetFollowingResponse:
-        async with self.uow:
-            following, total_count = await self.uow.followers_repository.get_following(
+        async with self.uow_factory() as uow:
+            following, total_count = await uow.followers_repository.get_following(
                 request.account_id,
                 limit=request.limit,
                 offset=request.offset,
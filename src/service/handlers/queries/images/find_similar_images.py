@@ -0,0 +1,57 @@
+import typing
+
+import cqrs
+from cqrs.events import event
+
+from service import exceptions
+from service.interfaces import unit_of_work
+from service.models.queries.images import find_similar_images
+
+
+class FindSimilarImagesHandler(
+    cqrs.RequestHandler[
+        find_similar_images.FindSimilarImages,
+        find_similar_images.FindSimilarImagesResponse,
+    ],
+):
+    """
+    Near-duplicates of the image by perceptual hash: resized or recompressed copies.
+    Only images bound to feeds or uploaded by the account are looked up and found
+    """
+
+    def __init__(self, uow_factory: unit_of_work.UoWFactory):
+        self.uow_factory = uow_factory
+
+    @property
+    def events(self) -> typing.List[event.Event]:
+        return []
+
+    async def handle(
+        self,
+        request: find_similar_images.FindSimilarImages,
+    ) -> find_similar_images.FindSimilarImagesResponse:
+        async with self.uow_factory() as uow:
+            image = await uow.images_repository.get_by_id(request.image_id)
+            if image is None or (
+                image.feed_id is None and image.uploader != request.account_id
+            ):
+                raise exceptions.ImageNotFound(image_id=request.image_id)
+            if image.perceptual_hash is None:
+                # Not processed yet or uploaded before perceptual hashes
+                return find_similar_images.FindSimilarImagesResponse(images=[])
+
+            similar = await uow.images_repository.find_similar(
+                image.perceptual_hash,
+                request.max_distance,
+                # The image itself is found too
+                request.limit + 1,
+                visible_to=request.account_id,
+            )
+
+        return find_similar_images.FindSimilarImagesResponse(
+            images=[
+                find_similar_images.SimilarImage(image=similar_image, distance=distance)
+                for similar_image, distance in similar
+                if similar_image.image_id != image.image_id
+            ][: request.limit],
+        )
@@ -0,0 +1,31 @@
+import typing
+
+import cqrs
+from cqrs.events import event
+
+from service import exceptions
+from service.interfaces import unit_of_work
+from service.models.queries.images import get_image
+
+
+class GetImageHandler(
+    cqrs.RequestHandler[get_image.GetImage, get_image.GetImageResponse],
+):
+    """Image of the uploader, pending, failed or ready"""
+
+    def __init__(self, uow_factory: unit_of_work.UoWFactory):
+        self.uow_factory = uow_factory
+
+    @property
+    def events(self) -> typing.List[event.Event]:
+        return []
+
+    async def handle(self, request: get_image.GetImage) -> get_image.GetImageResponse:
+        async with self.uow_factory() as uow:
+            image = await uow.images_repository.get_by_id(request.image_id)
+            if image is None or image.uploader != request.uploader:
+                raise exceptions.ImageNotFound(image_id=request.image_id)
+            failed = not image.ready and await uow.images_repository.is_failed(
+                image.image_id,
+            )
+        return get_image.GetImageResponse(image=image, failed=failed)
@@ -0,0 +1,113 @@
+import asyncio
+import typing
+
+import cqrs
+from cqrs.events import event
+
+from domain.entities import images as images_entity
+from service import exceptions
+from service.helpers.image import filenames, formats, resized
+from service.interfaces import cache, unit_of_work
+from service.interfaces.services import image_processor as image_processor_interface
+from service.interfaces.storages import images_storage as images_storage_interface
+from service.models.queries.images import get_resized_image
+
+# Cache key -> in-flight resize shared by concurrent requests of the same image
+_in_flight_resizes: dict[str, asyncio.Future[bytes]] = {}
+
+
+def _source_filename(image: images_entity.Image, width: int | None) -> str:
+    """Smallest stored JPEG still covering the width: a variant or the processed image"""
+    if image.content_hash is not None and width is not None:
+        for variant in image.variants:
+            if variant.width >= width:
+                return filenames.variant(image.content_hash, variant.width)
+    return filenames.processed(image.uploader, image.image_id, image.content_hash)
+
+
+class GetResizedImageHandler(
+    cqrs.RequestHandler[
+        get_resized_image.GetResizedImage,
+        get_resized_image.GetResizedImageResponse,
+    ],
+):
+    """
+    Resizes and re-encodes stored image on first request, then serves it from cache.
+    Concurrent requests of the same missing image wait for a single resize.
+    Cache key and ETag are of the image as last processed, processing it again renews them
+    """
+
+    def __init__(
+        self,
+        uow_factory: unit_of_work.UoWFactory,
+        image_storage: images_storage_interface.ImagesStorage,
+        image_processor: image_processor_interface.ImageProcessor,
+        resized_images_cache: cache.ResizedImagesCache,
+    ):
+        self.uow_factory = uow_factory
+        self.image_storage = image_storage
+        self.image_processor = image_processor
+        self.resized_images_cache = resized_images_cache
+
+    @property
+    def events(self) -> typing.List[event.Event]:
+        return []
+
+    async def handle(
+        self,
+        request: get_resized_image.GetResizedImage,
+    ) -> get_resized_image.GetResizedImageResponse:
+        async with self.uow_factory() as uow:
+            processed = await uow.images_repository.get_processed(request.image_id)
+        if processed is None:
+            raise exceptions.ImageNotFound(image_id=request.image_id)
+        stored_image, processed_at = processed
+
+        key = resized.cache_key(
+            request.image_id,
+            processed_at,
+            request.width,
+            request.image_format,
+        )
+        etag = resized.etag(key)
+        image = None
+        if not resized.etag_matches(etag, request.if_none_match):
+            image = await self.resized_images_cache.get(key)
+            if image is None:
+                resize = _in_flight_resizes.get(key)
+                if resize is None:
+                    resize = asyncio.ensure_future(
+                        self._resize(request, stored_image, key),
+                    )
+                    _in_flight_resizes[key] = resize
+                    resize.add_done_callback(
+                        lambda _: _in_flight_resizes.pop(key, None),
+                    )
+                # shield: cancellation of one waiter must not cancel resize for the others
+                image = await asyncio.shield(resize)
+
+        return get_resized_image.GetResizedImageResponse(
+            image=image,
+            content_type=formats.content_type(request.image_format),
+            etag=etag,
+        )
+
+    async def _resize(
+        self,
+        request: get_resized_image.GetResizedImage,
+        stored_image: images_entity.Image,
+        key: str,
+    ) -> bytes:
+        source = await self.image_storage.download(
+            _source_filename(stored_image, request.width),
+        )
+        if source is None:
+            raise exceptions.ImageNotFound(image_id=request.image_id)
+
+        image = await self.image_processor.resize(
+            source,
+            request.width,
+            request.image_format,
+        )
+        await self.resized_images_cache.put(key, image)
+        return image
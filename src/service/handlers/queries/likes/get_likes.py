@@ -15,7 +15,7 @@ class GetLikesHandler(
         self,
         uow_factory: unit_of_work.UoWFactory,
     ):
-        self.uow = uow_factory()
+        self.uow_factory = uow_factory
 
     @property
     def events(self) -> typing.List[event.Event]:
@@ -25,12 +25,12 @@ class GetLikesHandler(
         self,
         request: get_likes_model.GetLikes,
     ) -> get_likes_model.GetLikesResponse:
-        async with self.uow:
-            if not await self.uow.feeds_repository.exists(request.feed_id):
+        async with self.uow_factory() as uow:
+            if not await uow.feeds_repository.exists(request.feed_id):
                 raise exceptions.FeedNotFound(feed_id=request.feed_id)
 
             # Получаем лайки
-            total_count, likes = await self.uow.likes_repository.get_by_feed_id(
+            total_count, likes = await uow.likes_repository.get_by_feed_id(
                 request.feed_id,
                 limit=request.limit,
                 offset=request.offset,
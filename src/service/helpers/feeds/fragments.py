@@ -0,0 +1,100 @@
+"""
+Serialized feed JSON fragments.
+
+Fragment is a JSON object of responses_schema.Feed without viewer dependent and
+frequently changing fields (has_followed, has_liked, likes_count, views_count).
+These fields are spliced into fragment on response assembling, at their places
+in responses_schema.Feed keys order.
+"""
+
+import typing
+import uuid
+
+import orjson
+
+from domain.entities import feed as feed_entity, images as images_entity
+
+_TRUE = b"true"
+_FALSE = b"false"
+
+# has_followed goes before created_at, the rest before images_count (the last key)
+_CREATED_AT = b',"created_at":'
+_IMAGES_COUNT = b',"images_count":'
+
+
+# pydantic renders UTC datetimes with "Z" suffix
+DUMPS_OPTIONS = orjson.OPT_UTC_Z
+
+
+def json_default(value: typing.Any) -> typing.Any:
+    """orjson default of feed JSON, shared with presentation.api.serializers"""
+    # orjson serializes exactly uuid.UUID, asyncpg returns its subclass
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError
+
+
+def ordered_image(
+    image: images_entity.Image,
+    image_format: str | None = None,
+) -> dict[str, typing.Any]:
+    """
+    Serializes image as responses_schema.OrderedImage, the same in fragments and in feeds
+    serialized by presentation.api.serializers
+    """
+    url, variants = image.in_format(image_format)
+    return {
+        "image": {
+            "uuid": image.image_id,
+            "url": url,
+            "blurhash": image.blurhash,
+            "variants": [
+                {"width": variant.width, "url": variant.url} for variant in variants
+            ],
+            "ready": image.ready,
+        },
+        "order": image.order,
+    }
+
+
+def render(feed: feed_entity.Feed, image_format: str | None = None) -> bytes:
+    """Renders fragment with image URLs of image_format encoding where the image has one"""
+    images = [ordered_image(image, image_format) for image in feed.images]
+    return orjson.dumps(
+        {
+            "uuid": feed.feed_id,
+            "account_id": feed.account_id,
+            "created_at": feed.created_at,
+            "updated_at": feed.updated_at,
+            "text": feed.text,
+            "images": images,
+            "images_count": len(images),
+        },
+        default=json_default,
+        option=DUMPS_OPTIONS,
+    )
+
+
+def splice(fragment: bytes, state: feed_entity.FeedState) -> bytes:
+    """
+    Inserts state into fragment, giving the same bytes as serializing the whole feed.
+    Keys are found by search: string values before created_at (uuid, account_id) cannot
+    contain its unescaped quotes, and only digits follow images_count
+    """
+    created_at = fragment.index(_CREATED_AT)
+    images_count = fragment.rindex(_IMAGES_COUNT)
+    return b"".join(
+        (
+            fragment[:created_at],
+            b',"has_followed":',
+            _TRUE if state.has_followed else _FALSE,
+            fragment[created_at:images_count],
+            b',"has_liked":',
+            _TRUE if state.has_liked else _FALSE,
+            b',"likes_count":',
+            str(state.likes_count).encode(),
+            b',"views_count":',
+            str(state.views_count).encode(),
+            fragment[images_count:],
+        ),
+    )
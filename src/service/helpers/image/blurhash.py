@@ -1,5 +1,6 @@
 import io
 import logging
+import math
 
 import blurhash
 import numpy as np
@@ -11,30 +12,136 @@ COMPONENTS_X = 4
 COMPONENTS_Y = 3
 RESOLUTION = 100
 
+_BASE83_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
 
-def generate_blurhash(image_bytes: io.BytesIO) -> str:
-    logger.debug("Generating blurhash for image")
+# sRGB 0-255 -> linear, computed with the reference conversion
+_SRGB_TO_LINEAR = np.array(
+    [blurhash.srgb_to_linear(value) for value in range(256)],
+    dtype=np.float64,
+)
 
-    image_bytes.seek(0)
-    image_data = image_bytes.getvalue()
-    image_bytes.seek(0)
 
-    if not simplejpeg.is_jpeg(image_data):
-        raise ValueError("Input image must be JPEG format")
+def _base83_encode(value: int, length: int) -> str:
+    return "".join(
+        _BASE83_ALPHABET[value // 83 ** (length - i) % 83] for i in range(1, length + 1)
+    )
+
+
+def _sign_pow(value: float, exp: float) -> float:
+    return math.copysign(math.pow(abs(value), exp), value)
+
+
+def _quantize_ac(value: float, norm_factor: float) -> int:
+    return int(
+        max(
+            0.0,
+            min(18.0, math.floor(_sign_pow(value / norm_factor, 0.5) * 9.0 + 9.5)),
+        ),
+    )
+
+
+def _cos_table(components: int, size: int) -> np.ndarray:
+    # math.cos with the reference argument order keeps the basis bit-identical
+    return np.array(
+        [
+            [math.cos(math.pi * float(i) * float(x) / float(size)) for x in range(size)]
+            for i in range(components)
+        ],
+        dtype=np.float64,
+    )
+
+
+def encode(image: np.ndarray, components_x: int, components_y: int) -> str:
+    """
+    Vectorized blurhash.encode of (height, width, 3) sRGB uint8 image.
+
+    Output is identical to blurhash.encode: basis and conversions use the same float
+    operations and components are summed sequentially in the same row-major order.
+    """
+    if not (1 <= components_x <= 9 and 1 <= components_y <= 9):
+        raise ValueError("x and y component counts must be between 1 and 9 inclusive.")
+
+    height, width = image.shape[:2]
+    pixels = height * width
+    image_linear = _SRGB_TO_LINEAR[image[:, :, :3]].reshape(pixels, 3)
+    cos_x = _cos_table(components_x, width)
+    cos_y = _cos_table(components_y, height)
+    scale = float(width) * float(height)
 
-    height, width, _, _ = simplejpeg.decode_jpeg_header(image_data)
-    rgb_data: np.ndarray = simplejpeg.decode_jpeg(image_data)
+    components = []
+    for j in range(components_y):
+        for i in range(components_x):
+            norm_factor = 1.0 if (i == 0 and j == 0) else 2.0
+            basis = (norm_factor * cos_x[i])[np.newaxis, :] * cos_y[j][:, np.newaxis]
+            weighted = basis.reshape(pixels, 1) * image_linear
+            # cumsum accumulates sequentially, as the reference python loop does
+            component = np.cumsum(weighted, axis=0)[-1] / scale
+            components.append(component.tolist())
 
-    height_scale = int(height) / RESOLUTION
-    width_scale = int(width) / RESOLUTION
+    max_ac_component = max(
+        (abs(value) for component in components[1:] for value in component),
+        default=0.0,
+    )
+    dc_value = (
+        (blurhash.linear_to_srgb(components[0][0]) << 16)
+        + (blurhash.linear_to_srgb(components[0][1]) << 8)
+        + blurhash.linear_to_srgb(components[0][2])
+    )
+    quant_max_ac_component = int(
+        max(0, min(82, math.floor(max_ac_component * 166 - 0.5))),
+    )
+    ac_component_norm_factor = float(quant_max_ac_component + 1) / 166.0
 
-    resized_image = np.empty((RESOLUTION, RESOLUTION, 3), dtype=np.uint8)
+    result = _base83_encode((components_x - 1) + (components_y - 1) * 9, 1)
+    result += _base83_encode(quant_max_ac_component, 1)
+    result += _base83_encode(dc_value, 4)
+    for r, g, b in components[1:]:
+        ac_value = (
+            _quantize_ac(r, ac_component_norm_factor) * 19 * 19
+            + _quantize_ac(g, ac_component_norm_factor) * 19
+            + _quantize_ac(b, ac_component_norm_factor)
+        )
+        result += _base83_encode(ac_value, 2)
+    return result
 
-    for y in range(RESOLUTION):
-        for x in range(RESOLUTION):
-            original_y = int(y * height_scale)
-            original_x = int(x * width_scale)
-            resized_image[y, x] = rgb_data[original_y, original_x][:3]
+
+def resize_nearest(rgb_data: np.ndarray, resolution: int = RESOLUTION) -> np.ndarray:
+    """
+    Nearest-neighbour resize to resolution x resolution by gathering index arrays.
+    Samples the same pixels as int(y * height / resolution), int(x * width / resolution).
+    """
+    height, width = rgb_data.shape[:2]
+    rows = (np.arange(resolution) * (height / resolution)).astype(np.intp)
+    columns = (np.arange(resolution) * (width / resolution)).astype(np.intp)
+    return rgb_data[rows[:, np.newaxis], columns[np.newaxis, :], :3]
+
+
+def generate_blurhash_from_rgb(rgb_data: np.ndarray) -> str:
+    """
+    Blurhash of already decoded (height, width, 3) image, e.g. a downscaled preview:
+    RESOLUTION pixels on each side are enough.
+    """
+    return encode(resize_nearest(rgb_data), COMPONENTS_X, COMPONENTS_Y)
+
+
+def generate_blurhash_from_jpeg(image_data: bytes | memoryview) -> str:
+    logger.debug("Generating blurhash for image")
+
+    if not simplejpeg.is_jpeg(image_data):
+        raise ValueError("Input image must be JPEG format")
+
+    # libjpeg-turbo DCT scaling: decodes straight into the smallest scale (down to 1/8)
+    # still covering RESOLUTION x RESOLUTION, full size image is never allocated
+    rgb_data: np.ndarray = simplejpeg.decode_jpeg(
+        image_data,
+        fastdct=True,
+        min_height=RESOLUTION,
+        min_width=RESOLUTION,
+    )
 
     logger.debug("Blurhash generated")
-    return blurhash.encode(resized_image, COMPONENTS_X, COMPONENTS_Y)
+    return generate_blurhash_from_rgb(rgb_data)
+
+
+def generate_blurhash(image_bytes: io.BytesIO) -> str:
+    return generate_blurhash_from_jpeg(image_bytes.getbuffer())
@@ -0,0 +1,30 @@
+import hashlib
+
+
+def content_hash(image: bytes | memoryview) -> str:
+    """sha256 of uploaded file content, hex encoded"""
+    return hashlib.sha256(image).hexdigest()
+
+
+class DedupMetrics:
+    """Counters of content-hash deduplication of uploads."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    def hit(self, size: int) -> None:
+        self.hits += 1
+        self.bytes_saved += size
+
+    def miss(self) -> None:
+        self.misses += 1
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+dedup_metrics = DedupMetrics()
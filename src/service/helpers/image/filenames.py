@@ -0,0 +1,28 @@
+import uuid
+
+
+def uploaded(uploader: str, image_id: uuid.UUID) -> str:
+    """Storage filename of the original uploaded directly by the client"""
+    return f"uploads/{uploader}/{image_id}"
+
+
+def by_content_hash(content_hash: str, extension: str = "jpg") -> str:
+    """Storage filename of the processed image shared by all uploads of the same content"""
+    return f"{content_hash[:2]}/{content_hash}.{extension}"
+
+
+def variant(content_hash: str, width: int, extension: str = "jpg") -> str:
+    """Storage filename of the processed image downscaled to width, stored next to the original"""
+    return f"{content_hash[:2]}/{content_hash}_{width}.{extension}"
+
+
+def legacy(uploader: str, image_id: uuid.UUID) -> str:
+    """Storage filename of the processed JPEG of images uploaded before content hashing"""
+    return f"{uploader}/{image_id}.jpg"
+
+
+def processed(uploader: str, image_id: uuid.UUID, content_hash: str | None) -> str:
+    """Storage filename of the processed JPEG, legacy one when uploaded before content hashing"""
+    if content_hash is None:
+        return legacy(uploader, image_id)
+    return by_content_hash(content_hash)
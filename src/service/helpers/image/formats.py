@@ -0,0 +1,42 @@
+"""
+Modern image formats served next to JPEG to clients supporting them.
+"""
+
+import functools
+import io
+import typing
+
+import PIL.Image
+
+WEBP = "webp"
+AVIF = "avif"
+
+EXTENSIONS = {
+    WEBP: "webp",
+    AVIF: "avif",
+}
+
+
+@functools.cache
+def available(image_format: str) -> bool:
+    """Whether installed Pillow can encode the format (AVIF needs Pillow 11.3+ or its plugin)"""
+    if image_format not in EXTENSIONS:
+        return False
+    PIL.Image.init()
+    return image_format.upper() in PIL.Image.SAVE
+
+
+def encode(
+    rgb_image: PIL.Image.Image,
+    image_format: str,
+    options: typing.Mapping[str, typing.Any],
+) -> bytes:
+    """Encodes image with Pillow save options of the format, e.g. quality and method/speed"""
+    encoded = io.BytesIO()
+    rgb_image.save(encoded, format=image_format.upper(), **options)
+    return encoded.getvalue()
+
+
+def content_type(image_format: str | None) -> str:
+    """Media type of the format, JPEG when None"""
+    return f"image/{image_format}" if image_format is not None else "image/jpeg"
@@ -0,0 +1,61 @@
+"""
+Cheap checks of uploaded images by their header, before they are read in full or decoded.
+"""
+
+import io
+
+import PIL.Image
+
+from service import exceptions
+
+# Formats accepted for upload, by magic bytes
+_MAGIC = (
+    b"\xff\xd8\xff",  # JPEG
+    b"\x89PNG\r\n\x1a\n",
+    b"GIF87a",
+    b"GIF89a",
+    b"BM",
+    b"II*\x00",  # TIFF, little endian
+    b"MM\x00*",  # TIFF, big endian
+)
+
+
+def _is_supported(head: bytes | memoryview) -> bool:
+    head = bytes(head[:12])
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return True
+    return head.startswith(_MAGIC)
+
+
+def _dimensions(data: bytes | memoryview, max_pixels: int) -> tuple[int, int] | None:
+    """Declared width and height, None if the header is not complete in data"""
+    try:
+        with PIL.Image.open(io.BytesIO(data)) as image:
+            return image.size
+    except PIL.Image.DecompressionBombError:
+        # Pillow own limit is twice its MAX_IMAGE_PIXELS, far above any sane max_pixels
+        raise exceptions.ImageDimensionsTooLarge(max_pixels)
+    except (PIL.UnidentifiedImageError, OSError):
+        return None
+
+
+def check(data: bytes | memoryview, max_pixels: int, complete: bool = True) -> bool:
+    """
+    Checks magic bytes and declared dimensions of image, never decodes pixels.
+    data may be only the beginning of the file when not complete.
+    Returns whether dimensions were checked: False if the header does not fit
+    the incomplete data, the check has to be repeated with the whole file.
+    :raises UnsupportedImageFormat: if data is not an image of accepted format
+    :raises ImageDimensionsTooLarge: if the image declares more than max_pixels pixels
+    """
+    if not _is_supported(data):
+        raise exceptions.UnsupportedImageFormat()
+    size = _dimensions(data, max_pixels)
+    if size is None:
+        if complete:
+            raise exceptions.UnsupportedImageFormat()
+        return False
+    width, height = size
+    if width * height > max_pixels:
+        raise exceptions.ImageDimensionsTooLarge(max_pixels)
+    return True
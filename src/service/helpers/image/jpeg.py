@@ -0,0 +1,146 @@
+import re
+import typing
+
+import simplejpeg
+
+_SOI = b"\xff\xd8"
+_SOS = 0xDA
+_EOI = 0xD9
+_COM = 0xFE
+_APP0 = 0xE0
+_APP1 = 0xE1
+_APP2 = 0xE2
+_APP14 = 0xEE
+_APP15 = 0xEF
+_BASELINE_SOF = (0xC0, 0xC1)
+_ANY_SOF = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Markers without length: TEM and RST0-RST7
+_STANDALONE = frozenset([0x01, *range(0xD0, 0xD8)])
+# Marker ending entropy coded data: 0xFF not followed by stuffed zero, RST or fill byte
+_SCAN_END = re.compile(rb"\xff(?=[^\x00\xd0-\xd7\xff])")
+_EXIF = b"Exif\x00\x00"
+_ORIENTATION_TAG = 0x0112
+_BYTEORDERS: dict[bytes, typing.Literal["little", "big"]] = {
+    b"II": "little",
+    b"MM": "big",
+}
+
+
+def _keep_segment(marker: int, payload: memoryview) -> bool:
+    if marker == _COM:
+        return False
+    if _APP0 < marker <= _APP15:
+        # ICC profile and Adobe color transform affect decoded colors, EXIF/XMP/IPTC do not
+        if marker == _APP2:
+            return bytes(payload[:12]) == b"ICC_PROFILE\x00"
+        return marker == _APP14 and bytes(payload[:5]) == b"Adobe"
+    return True
+
+
+def _orientation(payload: memoryview) -> int:
+    """EXIF orientation from APP1 payload, 1 (upright) when absent or malformed"""
+    if bytes(payload[:6]) != _EXIF:
+        return 1
+    tiff = payload[6:]
+    byteorder = _BYTEORDERS.get(bytes(tiff[:2]))
+    if byteorder is None or len(tiff) < 8:
+        return 1
+    ifd = int.from_bytes(tiff[4:8], byteorder)
+    if ifd + 2 > len(tiff):
+        return 1
+    entries = int.from_bytes(tiff[ifd : ifd + 2], byteorder)
+    for entry in range(ifd + 2, min(ifd + 2 + entries * 12, len(tiff) - 11), 12):
+        if int.from_bytes(tiff[entry : entry + 2], byteorder) == _ORIENTATION_TAG:
+            return int.from_bytes(tiff[entry + 8 : entry + 10], byteorder)
+    return 1
+
+
+def _strip(data: memoryview) -> tuple[bytes, int | None, int]:
+    """
+    Returns JPEG without metadata segments and data after EOI, its SOF marker
+    and EXIF orientation
+    """
+    if bytes(data[:2]) != _SOI:
+        raise ValueError("Not a JPEG")
+
+    kept: list[memoryview] = [data[:2]]
+    sof: int | None = None
+    orientation = 1
+    position = 2
+    size = len(data)
+    while position < size:
+        if data[position] != 0xFF:
+            raise ValueError("Malformed JPEG: marker expected")
+        while position < size and data[position] == 0xFF:
+            position += 1
+        if position >= size:
+            raise ValueError("Malformed JPEG: truncated marker")
+        marker = data[position]
+        position += 1
+
+        if marker in _STANDALONE:
+            kept.append(data[position - 2 : position])
+            continue
+        if marker == _EOI:
+            # Trailers after the image (MPF secondary images, Motion Photo video) are dropped
+            kept.append(data[position - 2 : position])
+            break
+        if position + 2 > size:
+            raise ValueError("Malformed JPEG: truncated segment")
+        end = position + int.from_bytes(data[position : position + 2], "big")
+        if end > size:
+            raise ValueError("Malformed JPEG: truncated segment")
+
+        if marker in _ANY_SOF:
+            sof = marker
+        elif marker == _APP1:
+            orientation = _orientation(data[position + 2 : end])
+        if _keep_segment(marker, data[position + 2 : end]):
+            kept.append(data[position - 2 : end])
+        if marker == _SOS:
+            # Entropy coded data up to the next marker is copied as is
+            scan_end = _SCAN_END.search(data, end)
+            if scan_end is None:
+                kept.append(data[end:])
+                break
+            kept.append(data[end : scan_end.start()])
+            position = scan_end.start()
+            continue
+        position = end
+
+    return b"".join(kept), sof, orientation
+
+
+def strip_metadata(data: bytes | memoryview) -> bytes:
+    """
+    Losslessly drops EXIF, XMP, IPTC, comments and trailers after EOI from JPEG,
+    compressed image data is copied as is.
+    :raises ValueError: if data is not a well-formed JPEG
+    """
+    stripped, _, _ = _strip(memoryview(data))
+    return stripped
+
+
+def passthrough(
+    data: bytes | memoryview,
+    fits: typing.Callable[[int, int, int], bool] | None = None,
+) -> bytes | None:
+    """
+    Returns metadata-stripped JPEG if the upload is already an upright baseline YCbCr JPEG
+    that can be served without re-encoding, None if it has to be transcoded.
+    fits(width, height, stripped size) rejects JPEGs too large to be stored as is.
+    """
+    view = memoryview(data)
+    if not simplejpeg.is_jpeg(view):
+        return None
+    try:
+        height, width, colorspace, _ = simplejpeg.decode_jpeg_header(view)
+        stripped, sof, orientation = _strip(view)
+    except ValueError:
+        return None
+    # Orientation lives in EXIF, which is stripped: rotated images are transcoded upright
+    if colorspace != "YCbCr" or sof not in _BASELINE_SOF or orientation != 1:
+        return None
+    if fits is not None and not fits(int(width), int(height), len(stripped)):
+        return None
+    return stripped
@@ -0,0 +1,85 @@
+"""
+64-bit difference hash (dHash) of images for near-duplicate search. Resized or
+recompressed copies of an image have hashes within a small Hamming distance.
+
+Hashes are searched with multi-index hashing: the hash is split into 4 chunks
+of 16 bits, and by pigeonhole a hash within distance d of the query matches
+at least one query chunk within d // 4 bits. Candidates are looked up by chunk
+values, then filtered by the full distance.
+"""
+
+import itertools
+
+import numpy as np
+import PIL.Image
+import simplejpeg
+
+BITS = 64
+CHUNKS = 4
+CHUNK_BITS = BITS // CHUNKS
+# Chunk values to look up grow combinatorially with d // 4
+MAX_DISTANCE = 11
+
+_HASH_SIZE = (9, 8)
+# Chunk shifts from the most significant one
+_SHIFTS = tuple(range(BITS - CHUNK_BITS, -1, -CHUNK_BITS))
+_CHUNK_MASK = (1 << CHUNK_BITS) - 1
+_UNSIGNED_MASK = (1 << BITS) - 1
+
+
+def _signed(value: int) -> int:
+    """Stored as signed 64-bit integer, Postgres BIGINT"""
+    return value - (1 << BITS) if value >= 1 << (BITS - 1) else value
+
+
+def dhash(image: PIL.Image.Image | np.ndarray) -> int:
+    """
+    Compares brightness of horizontally adjacent pixels of the image shrunk to 9x8.
+    Takes Pillow image or RGB/grayscale pixels, returns signed 64-bit hash
+    """
+    if isinstance(image, np.ndarray):
+        image = PIL.Image.fromarray(image)
+    pixels = np.asarray(
+        image.convert("L").resize(_HASH_SIZE, PIL.Image.Resampling.BOX),
+        dtype=np.int16,
+    )
+    bits = np.packbits(pixels[:, 1:] > pixels[:, :-1])
+    return _signed(int.from_bytes(bits.tobytes(), "big"))
+
+
+def dhash_jpeg(image_data: bytes | memoryview) -> int:
+    """dhash of JPEG decoded in grayscale with DCT scaling, without full size decode"""
+    return dhash(
+        simplejpeg.decode_jpeg(
+            image_data,
+            colorspace="GRAY",
+            min_width=32,
+            min_height=32,
+        )[
+            :,
+            :,
+            0,
+        ],
+    )
+
+
+def distance(first: int, second: int) -> int:
+    """Hamming distance of two hashes"""
+    return ((first ^ second) & _UNSIGNED_MASK).bit_count()
+
+
+def chunks(value: int) -> tuple[int, ...]:
+    """16-bit chunks of the hash, most significant first"""
+    return tuple((value >> shift) & _CHUNK_MASK for shift in _SHIFTS)
+
+
+def chunk_candidates(value: int, max_distance: int) -> list[list[int]]:
+    """For each chunk of the hash, chunk values a hash within max_distance may match"""
+    if not 0 <= max_distance <= MAX_DISTANCE:
+        raise ValueError(f"Distance must be from 0 to {MAX_DISTANCE}")
+    masks = [
+        sum(1 << bit for bit in bits)
+        for flips in range(max_distance // CHUNKS + 1)
+        for bits in itertools.combinations(range(CHUNK_BITS), flips)
+    ]
+    return [[chunk ^ mask for mask in masks] for chunk in chunks(value)]
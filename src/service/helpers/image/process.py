@@ -0,0 +1,106 @@
+import io
+import typing
+
+import simplejpeg
+
+from service.helpers.image import (
+    blurhash,
+    formats,
+    jpeg,
+    perceptual,
+    transcode,
+    variants,
+)
+from service.interfaces.services import image_processor
+
+
+def process_image(
+    image: bytes | memoryview,
+    variant_widths: typing.Sequence[int] = (),
+    encodings: typing.Mapping[str, typing.Mapping[str, typing.Any]] | None = None,
+    jpeg_policy: transcode.JpegPolicy = transcode.JpegPolicy(),
+) -> image_processor.ProcessedImage:
+    """
+    Transcodes image into JPEG, generates its blurhash, perceptual hash and width variants.
+    encodings maps modern formats to encode the image and its variants into to Pillow save options.
+    CPU bound, runs in worker processes.
+    Upright baseline JPEGs within jpeg_policy limits are only stripped of metadata,
+    without decoding and re-encoding.
+    """
+    encodings = encodings or {}
+    passthrough_image = jpeg.passthrough(image, jpeg_policy.fits)
+    if passthrough_image is not None:
+        jpeg_image = passthrough_image
+        blurhash_value = blurhash.generate_blurhash_from_jpeg(passthrough_image)
+        perceptual_hash = perceptual.dhash_jpeg(passthrough_image)
+        if encodings:
+            # Other formats of the full size image need it decoded anyway
+            rgb_image = transcode.decode_jpeg(passthrough_image)
+            resized = variants.resize(rgb_image, variant_widths)
+        else:
+            rgb_image = None
+            resized = variants.resize_jpeg(passthrough_image, variant_widths)
+    else:
+        transcoded_image, preview, rgb_image = transcode.transcode_to_jpeg_with_preview(
+            io.BytesIO(image),
+            preview_min_size=blurhash.RESOLUTION,
+            policy=jpeg_policy,
+        )
+        jpeg_image = transcoded_image.getvalue()
+        blurhash_value = blurhash.generate_blurhash_from_rgb(preview)
+        perceptual_hash = perceptual.dhash(preview)
+        resized = variants.resize(rgb_image, variant_widths)
+
+    return image_processor.ProcessedImage(
+        image=jpeg_image,
+        blurhash=blurhash_value,
+        variants={
+            width: variants.encode_jpeg(variant) for width, variant in resized.items()
+        },
+        encodings={
+            image_format: image_processor.EncodedImage(
+                image=formats.encode(rgb_image, image_format, options),
+                variants={
+                    width: formats.encode(variant, image_format, options)
+                    for width, variant in resized.items()
+                },
+            )
+            for image_format, options in encodings.items()
+            if rgb_image is not None
+        },
+        perceptual_hash=perceptual_hash,
+    )
+
+
+def resize_image(
+    image: bytes,
+    width: int | None,
+    image_format: str | None = None,
+    options: typing.Mapping[str, typing.Any] | None = None,
+) -> bytes:
+    """
+    Downscales processed JPEG to width (never upscales) and encodes it into image_format
+    with Pillow save options, JPEG when None. CPU bound, runs in worker processes.
+    """
+    _, source_width, _, _ = simplejpeg.decode_jpeg_header(image)
+    if width is None or width >= int(source_width):
+        # Full size: no width requested or the image is not wider
+        if image_format is None:
+            return image
+        rgb_image = transcode.decode_jpeg(image)
+    else:
+        rgb_image = variants.resize_jpeg(image, [width]).get(width)
+        if rgb_image is None:
+            rgb_image = variants.resize(transcode.decode_jpeg(image), [width])[width]
+
+    if image_format is None:
+        return variants.encode_jpeg(rgb_image)
+    return formats.encode(rgb_image, image_format, options or {})
+
+
+def hash_image(image: bytes) -> tuple[str, int]:
+    """
+    Blurhash and perceptual hash of processed JPEG, with the current blurhash parameters.
+    CPU bound, runs in worker processes.
+    """
+    return blurhash.generate_blurhash_from_jpeg(image), perceptual.dhash_jpeg(image)
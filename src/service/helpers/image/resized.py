@@ -0,0 +1,44 @@
+"""
+Images resized on demand: allowed widths, cache keys and ETags.
+"""
+
+import datetime
+import hashlib
+import typing
+import uuid
+
+# Bump when resizing or encoding settings change the output, so caches and ETags are renewed
+VERSION = 1
+
+
+def snap_width(width: int | None, widths: typing.Sequence[int]) -> int | None:
+    """Rounds requested width up to the nearest allowed one, down to the widest if above all"""
+    if width is None:
+        return None
+    return min((w for w in widths if w >= width), default=max(widths))
+
+
+def cache_key(
+    image_id: uuid.UUID,
+    processed_at: datetime.datetime,
+    width: int | None,
+    image_format: str | None,
+) -> str:
+    """
+    Key of the image as processed at processed_at: processing again renews it,
+    resized images cached before are never read again and get evicted
+    """
+    version = f"{VERSION}.{processed_at.timestamp():.6f}"
+    return f"v{version}/{image_id}/{width or 'full'}.{image_format or 'jpeg'}"
+
+
+def etag(key: str) -> str:
+    """Strong ETag: the same key always renders into the same bytes"""
+    return '"' + hashlib.sha256(key.encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(etag_value: str, if_none_match: str | None) -> bool:
+    """Whether If-None-Match header lists the ETag"""
+    if if_none_match is None:
+        return False
+    return etag_value in (tag.strip() for tag in if_none_match.split(","))
@@ -0,0 +1,105 @@
+import asyncio
+import typing
+
+from domain.entities import images as images_entity
+from service.helpers.image import filenames, formats
+from service.interfaces.services import image_processor
+from service.interfaces.storages import images_storage
+
+
+def _storage_images(
+    content_hash: str,
+    image: bytes,
+    variants: dict[int, bytes],
+    extension: str,
+) -> list[images_storage.Image]:
+    return [
+        images_storage.Image(
+            image=image,
+            filename=filenames.by_content_hash(content_hash, extension),
+        ),
+        *(
+            images_storage.Image(
+                image=variant,
+                filename=filenames.variant(content_hash, width, extension),
+            )
+            for width, variant in variants.items()
+        ),
+    ]
+
+
+def _processed_storage_images(
+    content_hash: str,
+    processed_image: image_processor.ProcessedImage,
+) -> list[images_storage.Image]:
+    storage_images = _storage_images(
+        content_hash,
+        processed_image.image,
+        processed_image.variants,
+        "jpg",
+    )
+    for image_format, encoded in processed_image.encodings.items():
+        storage_images += _storage_images(
+            content_hash,
+            encoded.image,
+            encoded.variants,
+            formats.EXTENSIONS[image_format],
+        )
+    return storage_images
+
+
+def _stored_variants(
+    variants: dict[int, bytes],
+    urls: typing.Iterator[str],
+) -> tuple[images_entity.ImageVariant, ...]:
+    return tuple(
+        images_entity.ImageVariant(width=width, url=url)
+        for width, url in zip(variants, urls)
+    )
+
+
+async def store_processed(
+    storage: images_storage.ImagesStorage,
+    content_hash: str,
+    processed_image: image_processor.ProcessedImage,
+) -> tuple[
+    str,
+    tuple[images_entity.ImageVariant, ...],
+    tuple[images_entity.ImageEncoding, ...],
+]:
+    """
+    Uploads processed JPEG with its width variants and their other format encodings
+    in one batch, returns URL of the image, its variants and encodings
+    """
+    storage_images = _processed_storage_images(content_hash, processed_image)
+    # URLs come in the order of storage_images, variants take as many as they have
+    urls = iter(await storage.upload(*storage_images))
+
+    url = next(urls)
+    variants = _stored_variants(processed_image.variants, urls)
+    encodings = tuple(
+        images_entity.ImageEncoding(
+            format=image_format,
+            url=next(urls),
+            variants=_stored_variants(encoded.variants, urls),
+        )
+        for image_format, encoded in processed_image.encodings.items()
+    )
+    return url, variants, encodings
+
+
+async def delete_processed(
+    storage: images_storage.ImagesStorage,
+    content_hash: str,
+    processed_image: image_processor.ProcessedImage,
+) -> None:
+    """Deletes every file store_processed uploads, whether it was uploaded or not"""
+    await asyncio.gather(
+        *(
+            storage.delete(storage_image.filename)
+            for storage_image in _processed_storage_images(
+                content_hash,
+                processed_image,
+            )
+        ),
+    )
@@ -1,13 +1,145 @@
+import dataclasses
 import io
 import logging
+import math
 
+import numpy as np
 import PIL.Image
+import PIL.ImageOps
+import simplejpeg
 
 logging.getLogger("PIL").setLevel(logging.ERROR)
 
 
-def transcode_to_jpeg(file_object: io.BytesIO) -> io.BytesIO:
-    jpeg_image_bytes = io.BytesIO()
-    PIL.Image.open(file_object).convert("RGB").save(jpeg_image_bytes, format="JPEG")
-    jpeg_image_bytes.seek(0)
-    return io.BytesIO(jpeg_image_bytes.getvalue())
+@dataclasses.dataclass(frozen=True)
+class JpegPolicy:
+    """
+    How stored JPEGs are encoded. Quality is lowered by binary search down to min_quality
+    until the image fits max_bytes. Zero max_long_edge or max_bytes means no limit
+    """
+
+    max_long_edge: int = 0
+    quality: int = 75
+    min_quality: int = 75
+    max_bytes: int = 0
+    progressive: bool = False
+    subsampling: str = "4:2:0"
+
+    def fits(self, width: int, height: int, size: int) -> bool:
+        """Whether a JPEG of these dimensions and byte size can be stored as is"""
+        if self.max_long_edge and max(width, height) > self.max_long_edge:
+            return False
+        return not self.max_bytes or size <= self.max_bytes
+
+
+def _preview_factor(size: tuple[int, int], min_size: int) -> int:
+    width, height = size
+    return max(1, min(width // min_size, height // min_size, 8))
+
+
+def _open_rgb(
+    file_object: io.BytesIO,
+    max_long_edge: int,
+) -> tuple[PIL.Image.Image, bytes | None]:
+    """
+    Decodes image upright (EXIF orientation applied) into RGB fitting max_long_edge.
+    Returns it with ICC profile, the only metadata kept
+    """
+    with PIL.Image.open(file_object) as image:
+        if max_long_edge and max(image.size) > max_long_edge:
+            # JPEG is decoded with DCT scaling straight into the nearest size covering the limit
+            scale = max_long_edge / max(image.size)
+            image.draft(
+                "RGB",
+                (math.ceil(image.width * scale), math.ceil(image.height * scale)),
+            )
+        icc_profile = image.info.get("icc_profile")
+        # Not None unless transposed in place
+        upright = PIL.ImageOps.exif_transpose(image) or image
+        rgb_image = upright.convert("RGB")
+    if max_long_edge and max(rgb_image.size) > max_long_edge:
+        rgb_image.thumbnail(
+            (max_long_edge, max_long_edge),
+            PIL.Image.Resampling.LANCZOS,
+        )
+    return rgb_image, icc_profile
+
+
+def _save_jpeg(
+    rgb_image: PIL.Image.Image,
+    quality: int,
+    policy: JpegPolicy,
+    icc_profile: bytes | None,
+) -> bytes:
+    encoded = io.BytesIO()
+    rgb_image.save(
+        encoded,
+        format="JPEG",
+        quality=quality,
+        optimize=True,
+        progressive=policy.progressive,
+        subsampling=policy.subsampling,
+        icc_profile=icc_profile,
+    )
+    return encoded.getvalue()
+
+
+def encode_jpeg(
+    rgb_image: PIL.Image.Image,
+    policy: JpegPolicy,
+    icc_profile: bytes | None = None,
+) -> bytes:
+    """
+    Encodes image with the highest quality between policy min_quality and quality
+    that fits max_bytes, with min_quality if none does
+    """
+    encoded = _save_jpeg(rgb_image, policy.quality, policy, icc_profile)
+    if not policy.max_bytes or len(encoded) <= policy.max_bytes:
+        return encoded
+
+    fitting: bytes | None = None
+    smallest = encoded
+    low, high = policy.min_quality, policy.quality - 1
+    while low <= high:
+        quality = (low + high) // 2
+        encoded = _save_jpeg(rgb_image, quality, policy, icc_profile)
+        if len(encoded) <= policy.max_bytes:
+            fitting = encoded
+            low = quality + 1
+        else:
+            smallest = encoded
+            high = quality - 1
+    # Nothing fits: the last too large candidate was encoded with min_quality
+    return fitting if fitting is not None else smallest
+
+
+def transcode_to_jpeg(
+    file_object: io.BytesIO,
+    policy: JpegPolicy = JpegPolicy(),
+) -> io.BytesIO:
+    rgb_image, icc_profile = _open_rgb(file_object, policy.max_long_edge)
+    return io.BytesIO(encode_jpeg(rgb_image, policy, icc_profile))
+
+
+def transcode_to_jpeg_with_preview(
+    file_object: io.BytesIO,
+    preview_min_size: int,
+    policy: JpegPolicy = JpegPolicy(),
+) -> tuple[io.BytesIO, np.ndarray, PIL.Image.Image]:
+    """
+    Transcodes image into JPEG according to policy and hands over a box-downscaled RGB preview
+    (at least preview_min_size on each side, at most 1/8 of the image)
+    and the decoded RGB image, so consumers of small images and other
+    encodings never decode the full size JPEG again.
+    EXIF orientation is applied, EXIF and other metadata except ICC profile are dropped.
+    """
+    rgb_image, icc_profile = _open_rgb(file_object, policy.max_long_edge)
+    jpeg_image_bytes = io.BytesIO(encode_jpeg(rgb_image, policy, icc_profile))
+    preview = np.asarray(
+        rgb_image.reduce(_preview_factor(rgb_image.size, preview_min_size)),
+    )
+    return jpeg_image_bytes, preview, rgb_image
+
+
+def decode_jpeg(image_data: bytes | memoryview) -> PIL.Image.Image:
+    return PIL.Image.fromarray(simplejpeg.decode_jpeg(image_data))
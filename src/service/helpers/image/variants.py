@@ -0,0 +1,64 @@
+import typing
+
+import numpy as np
+import PIL.Image
+import simplejpeg
+
+QUALITY = 80
+
+
+def _widths_below(widths: typing.Iterable[int], width: int) -> list[int]:
+    """Variant widths smaller than the image, widest first. Wider ones would only upscale"""
+    return sorted({w for w in widths if 0 < w < width}, reverse=True)
+
+
+def resize(
+    rgb_image: PIL.Image.Image,
+    widths: typing.Iterable[int],
+) -> dict[int, PIL.Image.Image]:
+    """
+    Downscales RGB image to each of the widths keeping aspect ratio.
+    Each variant is resized from the previous wider one, not from the full size image.
+    Returns width -> image, ascending by width.
+    """
+    return _resize(rgb_image, _widths_below(widths, rgb_image.width))
+
+
+def _resize(
+    rgb_image: PIL.Image.Image,
+    widths: list[int],
+) -> dict[int, PIL.Image.Image]:
+    """Widths are widest first, none wider than the image. The image's own width is kept as is"""
+    resized: dict[int, PIL.Image.Image] = {}
+    source = rgb_image
+    for width in widths:
+        if width != source.width:
+            height = max(1, round(rgb_image.height * width / rgb_image.width))
+            source = source.resize(
+                (width, height),
+                PIL.Image.Resampling.LANCZOS,
+                reducing_gap=2.0,
+            )
+        resized[width] = source
+    return dict(sorted(resized.items()))
+
+
+def resize_jpeg(
+    image_data: bytes | memoryview,
+    widths: typing.Iterable[int],
+) -> dict[int, PIL.Image.Image]:
+    """
+    Same as resize for JPEG. Decodes with DCT scaling straight into
+    the smallest scale still covering the widest variant.
+    """
+    _, width, _, _ = simplejpeg.decode_jpeg_header(image_data)
+    # Widths below the full size image: the decoded scale may be exactly the widest one
+    widths = _widths_below(widths, int(width))
+    if not widths:
+        return {}
+    rgb_data = simplejpeg.decode_jpeg(image_data, min_width=widths[0])
+    return _resize(PIL.Image.fromarray(rgb_data), widths)
+
+
+def encode_jpeg(rgb_image: PIL.Image.Image) -> bytes:
+    return simplejpeg.encode_jpeg(np.asarray(rgb_image), quality=QUALITY)
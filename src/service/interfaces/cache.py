@@ -1,5 +1,6 @@
 import abc
 import typing
+import uuid
 
 
 class CacheService(abc.ABC):
@@ -76,3 +77,78 @@ class CacheService(abc.ABC):
             Number of deleted keys
         """
         raise NotImplementedError
+
+
+class FeedFragmentsCache(abc.ABC):
+    """Abstract interface for cache of serialized viewer independent feed JSON."""
+
+    @abc.abstractmethod
+    async def get_many(
+        self,
+        versions: dict[uuid.UUID, str],
+        image_format: str | None = None,
+    ) -> dict[uuid.UUID, bytes]:
+        """
+        Get fragments of given feed versions.
+
+        Args:
+            versions: Feed id to feed content version mapping
+            image_format: Format of image URLs in fragments, None for JPEG
+
+        Returns:
+            Feed id to fragment mapping, only for found fragments of actual versions
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def set_many(
+        self,
+        fragments: dict[uuid.UUID, tuple[str, bytes]],
+        image_format: str | None = None,
+    ) -> None:
+        """
+        Set fragments.
+
+        Args:
+            fragments: Feed id to (feed content version, fragment) mapping
+            image_format: Format of image URLs in fragments, None for JPEG
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def invalidate(self, *feed_ids: uuid.UUID) -> None:
+        """
+        Drop fragments of given feeds in all image formats.
+
+        Args:
+            feed_ids: Feed ids
+        """
+        raise NotImplementedError
+
+
+class ResizedImagesCache(abc.ABC):
+    """Abstract interface for size bounded cache of images resized on demand."""
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """
+        Get resized image.
+
+        Args:
+            key: Resized image key, see service.helpers.image.resized.cache_key
+
+        Returns:
+            Encoded image or None if not cached
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def put(self, key: str, image: bytes) -> None:
+        """
+        Cache resized image, evicting least recently used ones over the size limit.
+
+        Args:
+            key: Resized image key
+            image: Encoded image
+        """
+        raise NotImplementedError
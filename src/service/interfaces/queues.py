@@ -0,0 +1,61 @@
+import abc
+import uuid
+
+
+class UploadedImagesQueue(abc.ABC):
+    """
+    Queue of images uploaded directly to storage and waiting for processing.
+    Taken images stay in the queue as being processed until acknowledged,
+    so images of a crashed worker are not lost.
+    """
+
+    @abc.abstractmethod
+    async def put(self, image_id: uuid.UUID) -> None:
+        """
+        Enqueues uploaded image for processing.
+
+        Args:
+            image_id: Pending image id
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get(self, timeout: int) -> uuid.UUID | None:
+        """
+        Waits for the next uploaded image and keeps it as being processed until ack.
+
+        Args:
+            timeout: Maximum wait in whole seconds
+
+        Returns:
+            Pending image id or None if nothing was enqueued in time
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def ack(self, image_id: uuid.UUID) -> None:
+        """
+        Removes taken image from the images being processed, once it is ready or failed.
+
+        Args:
+            image_id: Image id returned by get
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def processing(self) -> list[uuid.UUID]:
+        """
+        Returns:
+            Images taken and not acknowledged yet, by live or crashed workers
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def requeue(self, image_id: uuid.UUID) -> None:
+        """
+        Enqueues image again to be taken next, whether it is waiting, being processed or lost.
+
+        Args:
+            image_id: Pending image id
+        """
+        raise NotImplementedError
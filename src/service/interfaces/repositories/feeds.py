@@ -62,6 +62,58 @@ class IFeedsRepository(abc.ABC):
         """
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def get_by_ids_json(
+        self,
+        feed_ids: list[uuid.UUID],
+        current_account_id: str | None = None,
+        image_format: str | None = None,
+    ) -> list[str]:
+        """
+        Same as get_by_ids, but returns feeds already rendered into response JSON by storage.
+        Image URLs are of image_format encoding where the image has one, JPEG otherwise
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_account_feeds_json(
+        self,
+        account_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        current_account_id: str | None = None,
+        image_format: str | None = None,
+    ) -> tuple[list[str], int]:
+        """
+        Same as get_account_feeds, but returns feeds already rendered into response JSON by storage.
+        Image URLs are of image_format encoding where the image has one, JPEG otherwise
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_states_by_ids(
+        self,
+        feed_ids: list[uuid.UUID],
+        current_account_id: str | None = None,
+    ) -> list[feed_entity.FeedState]:
+        """
+        Returns feeds states (viewer flags, counters, content version) by ids without feeds content
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_account_feed_states(
+        self,
+        account_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        current_account_id: str | None = None,
+    ) -> tuple[list[feed_entity.FeedState], int]:
+        """
+        Returns (account feeds states, total count) without feeds content
+        """
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def count_feeds(self, account_id: str) -> int:
         """
@@ -1,4 +1,6 @@
 import abc
+import datetime
+import typing
 import uuid
 
 from domain.entities import images
@@ -13,6 +15,81 @@ class IImageRepository(abc.ABC):
         """
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def add_many(self, *image: images.Image) -> None:
+        """
+        Saves many new images info into storage in one statement
+        :raises service.exceptions.ImageAlreadyExists:
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def add_pending(self, image: images.Image) -> None:
+        """
+        Saves info of image being uploaded directly to storage, not processed yet
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_pending(self, image_id: uuid.UUID) -> images.Image | None:
+        """
+        Returns not processed yet image info by id
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def mark_ready(
+        self,
+        image_id: uuid.UUID,
+        url: str,
+        blurhash: str | None,
+        content_hash: str | None = None,
+        variants: tuple[images.ImageVariant, ...] = (),
+        encodings: tuple[images.ImageEncoding, ...] = (),
+        perceptual_hash: int | None = None,
+    ) -> None:
+        """
+        Saves processing results and marks image ready.
+        Content version of the feed the image is bound to changes
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def mark_failed(self, image_id: uuid.UUID) -> None:
+        """
+        Marks pending image failed: it cannot be processed and will never be ready
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def is_failed(self, image_id: uuid.UUID) -> bool:
+        """
+        Returns whether processing of the image failed
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def lock_stale_pending(
+        self,
+        pending_for: datetime.timedelta,
+        limit: int,
+    ) -> list[images.Image]:
+        """
+        Returns images pending for longer than pending_for, oldest first, locked until
+        the transaction ends. Images locked by another transaction are skipped
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_by_content_hashes(
+        self,
+        *content_hash: str,
+    ) -> dict[str, images.Image]:
+        """
+        Returns content hash -> any ready image with the same uploaded content
+        """
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def get_by_id(self, image_id: uuid.UUID) -> images.Image | None:
         """
@@ -23,7 +100,64 @@ class IImageRepository(abc.ABC):
     @abc.abstractmethod
     async def get_many(self, *image_id: uuid.UUID) -> list[images.Image]:
         """
-        Returns many images by id
+        Returns many ready (processed) images by id
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_processed(
+        self,
+        image_id: uuid.UUID,
+    ) -> tuple[images.Image, datetime.datetime] | None:
+        """
+        Returns ready image by id with the time it was last processed:
+        its stored files change only then
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def find_similar(
+        self,
+        perceptual_hash: int,
+        max_distance: int,
+        limit: int,
+        visible_to: str | None = None,
+    ) -> list[tuple[images.Image, int]]:
+        """
+        Returns ready images with perceptual hash within Hamming max_distance
+        with their distance, nearest first.
+        visible_to limits them to images bound to feeds or uploaded by the account
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def lock_many(self, *image_id: uuid.UUID) -> list[images.Image]:
+        """
+        Returns many images by id, pending included, locked until the end of transaction
+        so that processing of pending ones does not interleave with binding them to feeds
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def iter_for_reprocessing(
+        self,
+        after: uuid.UUID | None = None,
+        batch_size: int = 100,
+        missing_blurhash: bool = False,
+        missing_variants: bool = False,
+    ) -> typing.AsyncIterator[list[images.Image]]:
+        """
+        Yields ready images in batches ordered by id, starting after the given id.
+        missing_blurhash and missing_variants limit them to images without those
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def update_processed(self, *image: images.Image) -> None:
+        """
+        Saves reprocessing results of ready images: URL, blurhash, content hash,
+        variants, encodings and perceptual hash, leaving feed binding as is.
+        Content version of the feeds the images are bound to changes
         """
         raise NotImplementedError
 
@@ -0,0 +1,59 @@
+import abc
+import dataclasses
+
+
+@dataclasses.dataclass(frozen=True)
+class EncodedImage:
+    image: bytes = dataclasses.field(repr=False)
+    # width -> image downscaled to that width, ascending by width
+    variants: dict[int, bytes] = dataclasses.field(default_factory=dict, repr=False)
+
+
+@dataclasses.dataclass(frozen=True)
+class ProcessedImage:
+    image: bytes = dataclasses.field(repr=False)
+    blurhash: str
+    # width -> JPEG downscaled to that width, ascending by width
+    variants: dict[int, bytes] = dataclasses.field(default_factory=dict, repr=False)
+    # format (webp, avif) -> the image and its variants in that format
+    encodings: dict[str, EncodedImage] = dataclasses.field(default_factory=dict)
+    # service.helpers.image.perceptual dHash
+    perceptual_hash: int | None = None
+
+
+class ImageProcessor(abc.ABC):
+    @abc.abstractmethod
+    async def process(self, image: bytes) -> ProcessedImage:
+        """
+        Transcodes uploaded image into JPEG and enabled modern formats,
+        generates its blurhash and width variants
+        :raises: service.exceptions.UnsupportedImageFormat
+        :raises: service.exceptions.ImageDimensionsTooLarge
+        :raises: service.exceptions.ImageProcessingOverloaded
+        :raises: service.exceptions.ImageProcessingTimeout
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def resize(
+        self,
+        image: bytes,
+        width: int | None,
+        image_format: str | None = None,
+    ) -> bytes:
+        """
+        Downscales processed JPEG to width (full size when None, never upscales)
+        and encodes it into image_format, JPEG when None
+        :raises: service.exceptions.ImageProcessingOverloaded
+        :raises: service.exceptions.ImageProcessingTimeout
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def hashes(self, image: bytes) -> tuple[str, int]:
+        """
+        Generates blurhash and perceptual hash of processed JPEG
+        :raises: service.exceptions.ImageProcessingOverloaded
+        :raises: service.exceptions.ImageProcessingTimeout
+        """
+        raise NotImplementedError
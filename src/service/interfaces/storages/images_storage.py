@@ -8,8 +8,44 @@ class Image:
     filename: str = dataclasses.field(default="")
 
 
+@dataclasses.dataclass(frozen=True)
+class PresignedUpload:
+    url: str
+    expires_in: int
+    # Form fields to POST along with the file
+    fields: dict[str, str] = dataclasses.field(default_factory=dict)
+
+
 class ImagesStorage(abc.ABC):
     @abc.abstractmethod
     async def upload(self, *images: Image) -> list[str]:
         """Uploads images to storage and returns its URL"""
         raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_url(self, filename: str) -> str:
+        """Returns download URL of the file"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def presign_upload(self, filename: str, max_bytes: int) -> PresignedUpload:
+        """
+        Returns URL and form fields the client can POST the file of at most max_bytes to
+        directly, and their lifetime in seconds. Larger files are rejected by the storage
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def size(self, filename: str) -> int | None:
+        """Returns file size in bytes without reading it, None if there is no such file"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def download(self, filename: str) -> bytes | None:
+        """Returns file content, None if there is no such file"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete(self, filename: str) -> None:
+        """Deletes file. Idempotent: does not raise if the file does not exist"""
+        raise NotImplementedError
@@ -9,7 +9,14 @@ from service.handlers.commands.followers import (
     follow as follow_handler,
     unfollow as unfollow_handler,
 )
-from service.handlers.commands.images import upload_image as upload_image_handler
+from service.handlers.commands.images import (
+    enqueue_image as enqueue_image_handler,
+    presign_upload as presign_upload_handler,
+    process_uploaded_image as process_uploaded_image_handler,
+    reprocess_images as reprocess_images_handler,
+    upload_image as upload_image_handler,
+    upload_images as upload_images_handler,
+)
 from service.handlers.commands.likes import (
     like_feed as like_feed_handler,
     unlike_feed as unlike_feed_handler,
@@ -21,6 +28,11 @@ from service.handlers.queries.followers import (
     get_followers as get_followers_handler,
     get_following as get_following_handler,
 )
+from service.handlers.queries.images import (
+    find_similar_images as find_similar_images_handler,
+    get_image as get_image_handler,
+    get_resized_image as get_resized_image_handler,
+)
 from service.handlers.queries.likes import get_likes as get_likes_handler
 from service.models.commands.feeds import (
     delete_feed as delete_feed_model,
@@ -31,7 +43,14 @@ from service.models.commands.followers import (
     follow as follow_model,
     unfollow as unfollow_model,
 )
-from service.models.commands.images import upload_image as upload_image_model
+from service.models.commands.images import (
+    enqueue_image as enqueue_image_model,
+    presign_upload as presign_upload_model,
+    process_uploaded_image as process_uploaded_image_model,
+    reprocess_images as reprocess_images_model,
+    upload_image as upload_image_model,
+    upload_images as upload_images_model,
+)
 from service.models.commands.likes import (
     like_feed as like_feed_model,
     unlike_feed as unlike_feed_model,
@@ -45,13 +64,45 @@ from service.models.queries.followers import (
     get_followers as get_followers_model,
     get_following as get_following_model,
 )
+from service.models.queries.images import (
+    find_similar_images as find_similar_images_model,
+    get_image as get_image_model,
+    get_resized_image as get_resized_image_model,
+)
 from service.models.queries.likes import get_likes as get_likes_model
 
 
 def init_requests(mapper: RequestMap) -> None:
-    # commands
     mapper.bind(post_feed_model.PostFeed, post_feed_handler.PostFeedHandler)
     mapper.bind(upload_image_model.UploadImage, upload_image_handler.UploadImageHandler)
+    mapper.bind(
+        enqueue_image_model.EnqueueImage,
+        enqueue_image_handler.EnqueueImageHandler,
+    )
+    mapper.bind(
+        upload_images_model.UploadImages,
+        upload_images_handler.UploadImagesHandler,
+    )
+    mapper.bind(
+        presign_upload_model.PresignImageUpload,
+        presign_upload_handler.PresignImageUploadHandler,
+    )
+    mapper.bind(
+        presign_upload_model.CompleteImageUpload,
+        presign_upload_handler.CompleteImageUploadHandler,
+    )
+    mapper.bind(
+        process_uploaded_image_model.ProcessUploadedImage,
+        process_uploaded_image_handler.ProcessUploadedImageHandler,
+    )
+    mapper.bind(
+        process_uploaded_image_model.SweepPendingImages,
+        process_uploaded_image_handler.SweepPendingImagesHandler,
+    )
+    mapper.bind(
+        reprocess_images_model.ReprocessImages,
+        reprocess_images_handler.ReprocessImagesHandler,
+    )
     mapper.bind(update_feed_model.UpdateFeed, update_feed_handler.UpdateFeedHandler)
     mapper.bind(delete_feed_model.DeleteFeed, delete_feed_handler.DeleteFeedHandler)
     mapper.bind(follow_model.Follow, follow_handler.FollowHandler)
@@ -59,7 +110,12 @@ def init_requests(mapper: RequestMap) -> None:
     mapper.bind(like_feed_model.LikeFeed, like_feed_handler.LikeFeedHandler)
     mapper.bind(unlike_feed_model.UnlikeFeed, unlike_feed_handler.UnlikeFeedHandler)
     mapper.bind(view_feeds_model.ViewFeeds, view_feeds_handler.ViewFeedsHandler)
-    # queries
+
+
+def init_queries(mapper: RequestMap) -> None:
+    """
+    Queries handlers: no events, no per-request state, safe to reuse between requests
+    """
     mapper.bind(
         get_feeds_model.GetAccountFeeds,
         get_feeds_handler.GetAccountFeedsHandler,
@@ -68,6 +124,22 @@ def init_requests(mapper: RequestMap) -> None:
         get_feeds_model.GetFeeds,
         get_feeds_handler.GetFeedsHandler,
     )
+    mapper.bind(
+        get_feeds_model.GetAccountFeedsJson,
+        get_feeds_handler.GetAccountFeedsJsonHandler,
+    )
+    mapper.bind(
+        get_feeds_model.GetFeedsJson,
+        get_feeds_handler.GetFeedsJsonHandler,
+    )
+    mapper.bind(
+        get_feeds_model.GetAccountFeedsFragments,
+        get_feeds_handler.GetAccountFeedsFragmentsHandler,
+    )
+    mapper.bind(
+        get_feeds_model.GetFeedsFragments,
+        get_feeds_handler.GetFeedsFragmentsHandler,
+    )
     mapper.bind(
         get_likes_model.GetLikes,
         get_likes_handler.GetLikesHandler,
@@ -84,6 +156,18 @@ def init_requests(mapper: RequestMap) -> None:
         get_account_info_model.GetAccountInfo,
         get_account_info_handler.GetAccountInfoHandler,
     )
+    mapper.bind(
+        get_image_model.GetImage,
+        get_image_handler.GetImageHandler,
+    )
+    mapper.bind(
+        find_similar_images_model.FindSimilarImages,
+        find_similar_images_handler.FindSimilarImagesHandler,
+    )
+    mapper.bind(
+        get_resized_image_model.GetResizedImage,
+        get_resized_image_handler.GetResizedImageHandler,
+    )
 
 
 def init_events(mapper: EventMap) -> None:
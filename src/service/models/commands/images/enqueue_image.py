@@ -0,0 +1,16 @@
+import dataclasses
+
+import cqrs
+
+from domain.entities import images
+
+
+@dataclasses.dataclass
+class EnqueueImage(cqrs.DCRequest):
+    uploader: str
+    image: bytes = dataclasses.field(default=b"", repr=False)
+
+
+@dataclasses.dataclass
+class EnqueueImageResponse(cqrs.DCResponse):
+    image: images.Image
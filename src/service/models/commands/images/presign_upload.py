@@ -0,0 +1,25 @@
+import dataclasses
+import uuid
+
+import cqrs
+
+
+@dataclasses.dataclass
+class PresignImageUpload(cqrs.DCRequest):
+    uploader: str
+    # Storage rejects larger uploaded files
+    max_bytes: int
+
+
+@dataclasses.dataclass
+class PresignImageUploadResponse(cqrs.DCResponse):
+    image_id: uuid.UUID
+    upload_url: str
+    expires_in: int
+    upload_fields: dict[str, str] = dataclasses.field(default_factory=dict)
+
+
+@dataclasses.dataclass
+class CompleteImageUpload(cqrs.DCRequest):
+    uploader: str
+    image_id: uuid.UUID
@@ -0,0 +1,29 @@
+import dataclasses
+import datetime
+import uuid
+
+import cqrs
+
+
+@dataclasses.dataclass
+class ProcessUploadedImage(cqrs.DCRequest):
+    image_id: uuid.UUID
+    # Larger uploaded files are failed before downloading, None for unbounded
+    max_bytes: int | None = None
+
+
+@dataclasses.dataclass
+class SweepPendingImages(cqrs.DCRequest):
+    # Pending longer: a worker lost the image, or its upload was not completed
+    stale_after: datetime.timedelta
+    # Pending longer: the upload can no longer be completed
+    abandon_after: datetime.timedelta
+    limit: int = 100
+
+
+@dataclasses.dataclass
+class SweepPendingImagesResponse(cqrs.DCResponse):
+    requeued: int
+    failed: int
+    # Left being processed by crashed workers after they finished
+    acknowledged: int
@@ -0,0 +1,24 @@
+import dataclasses
+
+import cqrs
+
+from domain.entities import images as images_entity
+
+
+@dataclasses.dataclass
+class ReprocessImages(cqrs.DCRequest):
+    images: list[images_entity.Image] = dataclasses.field(
+        default_factory=list,
+        repr=False,
+    )
+    # Regenerate width variants and encodings too, not only blurhash and perceptual hash
+    variants: bool = False
+    concurrency: int = 4
+
+
+@dataclasses.dataclass
+class ReprocessImagesResponse(cqrs.DCResponse):
+    reprocessed: int
+    # Processed file is not in storage
+    missing: int
+    failed: int
@@ -0,0 +1,18 @@
+import dataclasses
+
+import cqrs
+
+from domain.entities import images
+
+
+@dataclasses.dataclass
+class UploadImages(cqrs.DCRequest):
+    uploader: str
+    images: list[bytes] = dataclasses.field(default_factory=list, repr=False)
+    # Images of the request processed at once
+    concurrency: int = 4
+
+
+@dataclasses.dataclass
+class UploadImagesResponse(cqrs.DCResponse):
+    images: list[images.Image]
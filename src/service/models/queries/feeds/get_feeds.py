@@ -32,3 +32,67 @@ class GetFeeds(cqrs.DCRequest):
 @dataclasses.dataclass
 class GetFeedsResponse(cqrs.DCResponse):
     feeds: list[feed.Feed] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass
+class GetAccountFeedsJson(cqrs.DCRequest):
+    account_id: str
+    limit: int
+    offset: int
+    current_account_id: str | None = None
+    # Format of image URLs, None for JPEG
+    image_format: str | None = None
+
+
+@dataclasses.dataclass
+class GetAccountFeedsJsonResponse(cqrs.DCResponse):
+    account_id: str
+    feeds: list[str] = dataclasses.field(default_factory=list, repr=False)
+    limit: int = 0
+    offset: int = 0
+    total_count: int = 0
+
+
+@dataclasses.dataclass
+class GetFeedsJson(cqrs.DCRequest):
+    feed_ids: list[uuid.UUID]
+    current_account_id: str | None = None
+    # Format of image URLs, None for JPEG
+    image_format: str | None = None
+
+
+@dataclasses.dataclass
+class GetFeedsJsonResponse(cqrs.DCResponse):
+    feeds: list[str] = dataclasses.field(default_factory=list, repr=False)
+
+
+@dataclasses.dataclass
+class GetAccountFeedsFragments(cqrs.DCRequest):
+    account_id: str
+    limit: int
+    offset: int
+    current_account_id: str | None = None
+    # Format of image URLs, None for JPEG
+    image_format: str | None = None
+
+
+@dataclasses.dataclass
+class GetAccountFeedsFragmentsResponse(cqrs.DCResponse):
+    account_id: str
+    feeds: list[bytes] = dataclasses.field(default_factory=list, repr=False)
+    limit: int = 0
+    offset: int = 0
+    total_count: int = 0
+
+
+@dataclasses.dataclass
+class GetFeedsFragments(cqrs.DCRequest):
+    feed_ids: list[uuid.UUID]
+    current_account_id: str | None = None
+    # Format of image URLs, None for JPEG
+    image_format: str | None = None
+
+
+@dataclasses.dataclass
+class GetFeedsFragmentsResponse(cqrs.DCResponse):
+    feeds: list[bytes] = dataclasses.field(default_factory=list, repr=False)
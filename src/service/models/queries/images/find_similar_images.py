@@ -0,0 +1,26 @@
+import dataclasses
+import uuid
+
+import cqrs
+
+from domain.entities import images
+
+
+@dataclasses.dataclass
+class FindSimilarImages(cqrs.DCRequest):
+    account_id: str
+    image_id: uuid.UUID
+    # Hamming distance of perceptual hashes, at most service.helpers.image.perceptual.MAX_DISTANCE
+    max_distance: int = 6
+    limit: int = 20
+
+
+@dataclasses.dataclass(frozen=True)
+class SimilarImage:
+    image: images.Image
+    distance: int
+
+
+@dataclasses.dataclass
+class FindSimilarImagesResponse(cqrs.DCResponse):
+    images: list[SimilarImage]
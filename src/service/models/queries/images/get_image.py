@@ -0,0 +1,19 @@
+import dataclasses
+import uuid
+
+import cqrs
+
+from domain.entities import images
+
+
+@dataclasses.dataclass
+class GetImage(cqrs.DCRequest):
+    uploader: str
+    image_id: uuid.UUID
+
+
+@dataclasses.dataclass
+class GetImageResponse(cqrs.DCResponse):
+    image: images.Image
+    # Processing failed, the image will never be ready
+    failed: bool = False
@@ -0,0 +1,23 @@
+import dataclasses
+import uuid
+
+import cqrs
+
+
+@dataclasses.dataclass
+class GetResizedImage(cqrs.DCRequest):
+    image_id: uuid.UUID
+    # Allowed width, see service.helpers.image.resized.snap_width. None for full size
+    width: int | None = None
+    # None for JPEG
+    image_format: str | None = None
+    # If-None-Match header: the image is not resized nor read when it lists its ETag
+    if_none_match: str | None = None
+
+
+@dataclasses.dataclass
+class GetResizedImageResponse(cqrs.DCResponse):
+    # None when not modified: If-None-Match lists the ETag
+    image: bytes | None = dataclasses.field(repr=False)
+    content_type: str
+    etag: str
@@ -47,8 +47,161 @@ class JWT(pydantic_settings.BaseSettings, case_sensitive=False):
         default="kupidon-apis",
         description="Audience токена (должен совпадать с IAM)",
     )
+    cache_max_size: int = pydantic.Field(
+        default=10_000,
+        description="Максимальное число проверенных токенов в кэше (0 - кэш выключен)",
+    )
+    cache_ttl_seconds: int = pydantic.Field(
+        default=300,
+        description="Максимальное время жизни проверенного токена в кэше (не дольше exp токена)",
+    )
 
     model_config = pydantic_settings.SettingsConfigDict(env_prefix="JWT_")
 
 
+class IAM(pydantic_settings.BaseSettings, case_sensitive=False):
+    """
+    Настройки проверки access-токенов через запрос в IAM (HttpIAMService).
+    """
+
+    max_connections: int = pydantic.Field(
+        default=100,
+        description="Максимальное число соединений с IAM",
+    )
+    max_keepalive_connections: int = pydantic.Field(
+        default=20,
+        description="Максимальное число keep-alive соединений с IAM",
+    )
+    keepalive_expiry: float = pydantic.Field(
+        default=30.0,
+        description="Время жизни простаивающего keep-alive соединения, секунды",
+    )
+    timeout: float = pydantic.Field(
+        default=2.0,
+        description="Таймаут одной попытки запроса, секунды",
+    )
+    retries: int = pydantic.Field(
+        default=3,
+        description="Максимальное число повторов запроса",
+    )
+    backoff_factor: float = pydantic.Field(
+        default=0.1,
+        description="Коэффициент экспоненциальной задержки между повторами",
+    )
+    deadline: float = pydantic.Field(
+        default=5.0,
+        description="Общий дедлайн проверки токена вместе с повторами, секунды",
+    )
+    cache_max_size: int = pydantic.Field(
+        default=10_000,
+        description="Максимальное число проверенных токенов в кэше (0 - кэш выключен)",
+    )
+    cache_ttl_seconds: int = pydantic.Field(
+        default=60,
+        description="Время жизни проверенного токена в кэше",
+    )
+
+    model_config = pydantic_settings.SettingsConfigDict(env_prefix="IAM_")
+
+
+class ImageProcessing(pydantic_settings.BaseSettings, case_sensitive=False):
+    """
+    Настройки пула процессов для перекодирования изображений и генерации blurhash.
+    """
+
+    workers: int = pydantic.Field(
+        default=2,
+        description="Число процессов-обработчиков изображений",
+    )
+    max_queue_size: int = pydantic.Field(
+        default=32,
+        description="Максимальное число изображений, ожидающих свободный процесс",
+    )
+    timeout: float = pydantic.Field(
+        default=10.0,
+        description=(
+            "Таймаут обработки одного изображения (без ожидания в очереди), секунды. "
+            "Процесс не прерывается и занимает слот, пока не доработает изображение"
+        ),
+    )
+    variant_widths: list[int] = pydantic.Field(
+        default=[320, 640, 1080],
+        description="Ширины уменьшенных копий изображения, генерируемых при загрузке, пиксели",
+    )
+    formats: list[str] = pydantic.Field(
+        default=["webp"],
+        description=(
+            "Современные форматы (webp, avif) в порядке предпочтения, в которые дополнительно к JPEG "
+            "кодируются изображение и его уменьшенные копии. Недоступные в Pillow форматы пропускаются"
+        ),
+    )
+    webp_quality: int = pydantic.Field(default=80, description="Качество WebP, 0-100")
+    webp_method: int = pydantic.Field(
+        default=4,
+        description="Усилие кодировщика WebP, 0 (быстро) - 6 (меньше размер)",
+    )
+    avif_quality: int = pydantic.Field(default=60, description="Качество AVIF, 0-100")
+    avif_speed: int = pydantic.Field(
+        default=6,
+        description="Скорость кодировщика AVIF, 0 (меньше размер) - 10 (быстро)",
+    )
+    max_pixels: int = pydantic.Field(
+        default=50_000_000,
+        description="Максимальное число пикселей (ширина x высота) загружаемого изображения, проверяется по заголовку до декодирования",
+    )
+    max_long_edge: int = pydantic.Field(
+        default=2560,
+        description="Максимальная длина длинной стороны сохраняемого изображения, пиксели. 0 - без ограничения",
+    )
+    jpeg_quality: int = pydantic.Field(
+        default=85,
+        description="Качество JPEG, 0-100. Снижается до jpeg_min_quality, чтобы уложиться в jpeg_max_bytes",
+    )
+    jpeg_min_quality: int = pydantic.Field(
+        default=60,
+        description="Минимальное качество JPEG при подборе под jpeg_max_bytes",
+    )
+    jpeg_max_bytes: int = pydantic.Field(
+        default=800_000,
+        description="Целевой размер JPEG, байты. 0 - без ограничения",
+    )
+    jpeg_progressive: bool = pydantic.Field(
+        default=True,
+        description="Прогрессивный JPEG (с оптимизированными таблицами Хаффмана)",
+    )
+    jpeg_subsampling: str = pydantic.Field(
+        default="4:2:0",
+        description="Прореживание цветности JPEG: 4:4:4, 4:2:2 или 4:2:0",
+    )
+    resize_widths: list[int] = pydantic.Field(
+        default=[160, 320, 480, 640, 1080, 1440, 2048],
+        description=(
+            "Ширины, до которых изображения уменьшаются по запросу. Запрошенная ширина "
+            "округляется вверх до ближайшей из списка, чтобы ограничить число копий в кэше"
+        ),
+    )
+    pending_sweep_interval: float = pydantic.Field(
+        default=60.0,
+        description="Период проверки давно ожидающих обработки изображений воркером, секунды",
+    )
+    pending_stale_after: float = pydantic.Field(
+        default=600.0,
+        description=(
+            "Изображение, ожидающее обработки дольше, снова ставится в очередь: воркер упал, "
+            "обработка не удалась или загрузка не подтверждена, секунды"
+        ),
+    )
+    pending_abandon_after: float = pydantic.Field(
+        default=86400.0,
+        description=(
+            "Изображение, ожидающее обработки дольше, помечается неудачным (failed). "
+            "Должно быть больше срока жизни ссылки на загрузку, секунды"
+        ),
+    )
+
+    model_config = pydantic_settings.SettingsConfigDict(env_prefix="IMAGE_PROCESSING_")
+
+
 jwt_settings = JWT()
+iam_settings = IAM()
+image_processing_settings = ImageProcessing()
@@ -0,0 +1,69 @@
+"""
+Tests run from the repository root: pytest -c ./tests/pytest-config.ini
+
+Tests using postgres_connection need a database with migrations/ddl applied,
+its DSN in TEST_POSTGRES_DSN. They are skipped without it. Every test runs
+in a transaction rolled back afterwards.
+"""
+
+import os
+import typing
+
+import pytest
+
+# Settings read at import require it, tests never connect to Redis
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+
+import asyncpg  # noqa: E402
+
+from infrastructure.persistent.postgres.repositories import (  # noqa: E402
+    feeds as feeds_repository,
+    images as images_repository,
+)
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+async def postgres_connection() -> typing.AsyncIterator[asyncpg.Connection]:
+    dsn = os.environ.get("TEST_POSTGRES_DSN")
+    if not dsn:
+        pytest.skip("TEST_POSTGRES_DSN is not set")
+    connection = await asyncpg.connect(dsn)
+    transaction = connection.transaction()
+    await transaction.start()
+    try:
+        yield connection
+    finally:
+        await transaction.rollback()
+        await connection.close()
+
+
+class ConnectionUoW:
+    """UoW over the test connection: commits are left to the rolled back test transaction"""
+
+    def __init__(self, connection: asyncpg.Connection):
+        self.feeds_repository = feeds_repository.PostgresFeedsRepository(connection)
+        self.images_repository = images_repository.PostgresImagesRepository(connection)
+
+    async def __aenter__(self) -> typing.Self:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+    async def commit(self) -> None:
+        pass
+
+    async def rollback(self) -> None:
+        pass
+
+
+@pytest.fixture
+def uow_factory(
+    postgres_connection: asyncpg.Connection,
+) -> typing.Callable[[], ConnectionUoW]:
+    return lambda: ConnectionUoW(postgres_connection)
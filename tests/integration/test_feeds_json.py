@@ -0,0 +1,256 @@
+"""
+Golden tests of Postgres-rendered feed JSON: passthrough responses must be
+byte for byte the same as responses serialized from entities.
+"""
+
+import datetime
+import uuid
+
+import asyncpg
+import orjson
+import pytest
+
+from domain.entities import images as images_entity
+from infrastructure.persistent.postgres import columns, records
+from infrastructure.persistent.postgres.repositories import feeds as feeds_repository
+from presentation.api import serializers
+from service.handlers.queries.feeds import get_feeds as get_feeds_handler
+from service.models.queries.feeds import get_feeds
+
+pytestmark = pytest.mark.anyio
+
+ACCOUNT_ID = "golden-account"
+VIEWER_ID = "golden-viewer"
+
+_UTC = datetime.timezone.utc
+
+
+async def _insert_feed(
+    connection: asyncpg.Connection,
+    created_at: datetime.datetime,
+    updated_at: datetime.datetime | None,
+    text: str,
+) -> uuid.UUID:
+    feed_id = uuid.uuid4()
+    await connection.execute(
+        "INSERT INTO feeds (feed_id, account_id, created_at, updated_at, text) "
+        "VALUES ($1, $2, $3, $4, $5)",
+        feed_id,
+        ACCOUNT_ID,
+        created_at,
+        updated_at,
+        text,
+    )
+    return feed_id
+
+
+async def _insert_image(
+    connection: asyncpg.Connection,
+    feed_id: uuid.UUID,
+    order: int,
+    blurhash: str | None,
+    variants: tuple[images_entity.ImageVariant, ...] = (),
+    encodings: tuple[images_entity.ImageEncoding, ...] = (),
+    status: str = "ready",
+) -> None:
+    await connection.execute(
+        'INSERT INTO images (image_id, feed_id, uploader, url, blurhash, "order", variants, '
+        "encodings, status) VALUES ($1, $2, $3, $4, $5, $6, $7::json, $8::json, $9)",
+        uuid.uuid4(),
+        feed_id,
+        ACCOUNT_ID,
+        f"https://storage/{feed_id}/{order}.jpg",
+        blurhash,
+        order,
+        columns.dump_variants(variants),
+        columns.dump_encodings(encodings),
+        status,
+    )
+
+
+@pytest.fixture
+async def feed_ids(postgres_connection: asyncpg.Connection) -> list[uuid.UUID]:
+    # Zero and non-zero microseconds, no updated_at, escaped and non-ASCII text
+    whole_second = await _insert_feed(
+        postgres_connection,
+        datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=_UTC),
+        datetime.datetime(2024, 1, 3, 0, 0, 0, tzinfo=_UTC),
+        'Quotes " and \\ backslash\nnew line, привет \U0001f600',
+    )
+    fractional = await _insert_feed(
+        postgres_connection,
+        datetime.datetime(2024, 1, 2, 3, 4, 5, 120, tzinfo=_UTC),
+        None,
+        "",
+    )
+    without_images = await _insert_feed(
+        postgres_connection,
+        datetime.datetime(2023, 12, 31, 23, 59, 59, 999999, tzinfo=_UTC),
+        None,
+        "no images",
+    )
+
+    variants = (
+        images_entity.ImageVariant(width=320, url="https://storage/v_320.jpg"),
+        images_entity.ImageVariant(width=640, url="https://storage/v_640.jpg"),
+    )
+    webp = images_entity.ImageEncoding(
+        format="webp",
+        url="https://storage/v.webp",
+        variants=(
+            images_entity.ImageVariant(width=320, url="https://storage/v_320.webp"),
+        ),
+    )
+    await _insert_image(postgres_connection, whole_second, 1, None, variants, (webp,))
+    await _insert_image(
+        postgres_connection,
+        whole_second,
+        0,
+        "LEHV6nWB2yk8pyo0adR*.7kCMdnj",
+    )
+    await _insert_image(postgres_connection, fractional, 0, None, status="pending")
+    await _insert_image(
+        postgres_connection,
+        fractional,
+        1,
+        None,
+        variants,
+        status="failed",
+    )
+
+    await postgres_connection.execute(
+        "INSERT INTO likes (feed_id, account_id) VALUES ($1, $2)",
+        whole_second,
+        VIEWER_ID,
+    )
+    await postgres_connection.execute(
+        "INSERT INTO followers (follower, follow_for) VALUES ($1, $2)",
+        VIEWER_ID,
+        ACCOUNT_ID,
+    )
+    return [whole_second, fractional, without_images]
+
+
+@pytest.fixture(params=["dataclass", "record"])
+def read_entities(
+    request: pytest.FixtureRequest,
+    monkeypatch: pytest.MonkeyPatch,
+) -> str:
+    """Entities path with both read mappers, POSTGRES_LAZY_READ_ENTITIES off and on"""
+    if request.param == "record":
+        monkeypatch.setattr(feeds_repository, "_read_image", records.RecordImage)
+        monkeypatch.setattr(feeds_repository, "_read_feed", records.RecordFeed)
+    return request.param
+
+
+def _dumps(content: object) -> bytes:
+    return serializers.ORJSONResponse(content).body
+
+
+@pytest.mark.parametrize("viewer", [None, VIEWER_ID])
+@pytest.mark.parametrize("image_format", [None, "webp"])
+async def test_feeds_json_equals_entities_serialization(
+    uow_factory,
+    feed_ids: list[uuid.UUID],
+    read_entities: str,
+    viewer: str | None,
+    image_format: str | None,
+) -> None:
+    entities = await get_feeds_handler.GetFeedsHandler(uow_factory).handle(
+        get_feeds.GetFeeds(feed_ids=feed_ids, current_account_id=viewer),
+    )
+    passthrough = await get_feeds_handler.GetFeedsJsonHandler(uow_factory).handle(
+        get_feeds.GetFeedsJson(
+            feed_ids=feed_ids,
+            current_account_id=viewer,
+            image_format=image_format,
+        ),
+    )
+
+    expected = _dumps(
+        serializers.envelope(
+            serializers.feeds(
+                [
+                    serializers.feed(feed, image_format=image_format)
+                    for feed in entities.feeds
+                ],
+            ),
+        ),
+    )
+    actual = _dumps(
+        serializers.envelope(
+            serializers.feeds(serializers.feed_fragments(passthrough.feeds)),
+        ),
+    )
+    assert len(entities.feeds) == len(feed_ids)
+    assert actual == expected
+
+
+@pytest.mark.parametrize("image_format", [None, "webp"])
+async def test_account_feeds_json_equals_entities_serialization(
+    uow_factory,
+    feed_ids: list[uuid.UUID],
+    read_entities: str,
+    image_format: str | None,
+) -> None:
+    entities = await get_feeds_handler.GetAccountFeedsHandler(uow_factory).handle(
+        get_feeds.GetAccountFeeds(
+            account_id=ACCOUNT_ID,
+            limit=2,
+            offset=0,
+            current_account_id=VIEWER_ID,
+        ),
+    )
+    passthrough = await get_feeds_handler.GetAccountFeedsJsonHandler(
+        uow_factory,
+    ).handle(
+        get_feeds.GetAccountFeedsJson(
+            account_id=ACCOUNT_ID,
+            limit=2,
+            offset=0,
+            current_account_id=VIEWER_ID,
+            image_format=image_format,
+        ),
+    )
+
+    expected = _dumps(
+        serializers.page(
+            [
+                serializers.feed(feed, image_format=image_format)
+                for feed in entities.feeds
+            ],
+            limit=2,
+            offset=0,
+            count=entities.total_count,
+        ),
+    )
+    actual = _dumps(
+        serializers.page(
+            serializers.feed_fragments(passthrough.feeds),
+            limit=2,
+            offset=0,
+            count=passthrough.total_count,
+        ),
+    )
+    assert passthrough.total_count == entities.total_count == len(feed_ids)
+    assert actual == expected
+
+
+@pytest.mark.parametrize("image_format", [None, "webp"])
+async def test_not_ready_images_have_no_urls(
+    uow_factory,
+    feed_ids: list[uuid.UUID],
+    image_format: str | None,
+) -> None:
+    passthrough = await get_feeds_handler.GetFeedsJsonHandler(uow_factory).handle(
+        get_feeds.GetFeedsJson(feed_ids=feed_ids, image_format=image_format),
+    )
+
+    images = [
+        ordered["image"]
+        for feed in passthrough.feeds
+        for ordered in orjson.loads(feed)["images"]
+    ]
+    not_ready = [image for image in images if not image["ready"]]
+    assert len(not_ready) == 2
+    assert all(image["url"] is None and image["variants"] == [] for image in not_ready)
@@ -0,0 +1,197 @@
+"""
+Images which never become ready by themselves: unprocessable and oversized uploads
+are failed, the sweep queues stale pending images again and fails abandoned uploads.
+"""
+
+import datetime
+import uuid
+
+import pytest
+
+from domain.entities import images as images_entity
+from service import exceptions
+from service.handlers.commands.images import process_uploaded_image as process_handler
+from service.handlers.queries.images import get_image as get_image_handler
+from service.helpers.image import filenames
+from service.interfaces import queues
+from service.interfaces.services import image_processor
+from service.interfaces.storages import images_storage
+from service.models.commands.images import process_uploaded_image
+from service.models.queries.images import get_image
+
+pytestmark = pytest.mark.anyio
+
+UPLOADER = "pending-uploader"
+
+_UTC = datetime.timezone.utc
+
+
+class Queue(queues.UploadedImagesQueue):
+    def __init__(self, processing: list[uuid.UUID]) -> None:
+        self.queued: list[uuid.UUID] = []
+        self.taken = list(processing)
+
+    async def put(self, image_id: uuid.UUID) -> None:
+        self.queued.append(image_id)
+
+    async def get(self, timeout: int) -> uuid.UUID | None:
+        raise NotImplementedError
+
+    async def ack(self, image_id: uuid.UUID) -> None:
+        if image_id in self.taken:
+            self.taken.remove(image_id)
+
+    async def processing(self) -> list[uuid.UUID]:
+        return list(self.taken)
+
+    async def requeue(self, image_id: uuid.UUID) -> None:
+        if image_id in self.taken:
+            self.taken.remove(image_id)
+        self.queued.append(image_id)
+
+
+class Storage(images_storage.ImagesStorage):
+    def __init__(self, files: dict[str, bytes]) -> None:
+        self.files = files
+        self.downloaded: list[str] = []
+
+    async def upload(self, *images: images_storage.Image) -> list[str]:
+        raise NotImplementedError
+
+    def get_url(self, filename: str) -> str:
+        return f"https://storage/{filename}"
+
+    async def presign_upload(
+        self,
+        filename: str,
+        max_bytes: int,
+    ) -> images_storage.PresignedUpload:
+        raise NotImplementedError
+
+    async def size(self, filename: str) -> int | None:
+        file = self.files.get(filename)
+        return None if file is None else len(file)
+
+    async def download(self, filename: str) -> bytes | None:
+        self.downloaded.append(filename)
+        return self.files.get(filename)
+
+    async def delete(self, filename: str) -> None:
+        self.files.pop(filename, None)
+
+
+class UnsupportedProcessor(image_processor.ImageProcessor):
+    async def process(self, image: bytes) -> image_processor.ProcessedImage:
+        raise exceptions.UnsupportedImageFormat()
+
+    async def resize(
+        self,
+        image: bytes,
+        width: int | None,
+        image_format: str | None = None,
+    ) -> bytes:
+        raise NotImplementedError
+
+    async def hashes(self, image: bytes) -> tuple[str, int]:
+        raise NotImplementedError
+
+
+async def _add_pending(
+    uow_factory,
+    pending_for: datetime.timedelta,
+) -> images_entity.Image:
+    image = images_entity.Image(
+        image_id=uuid.uuid4(),
+        uploader=UPLOADER,
+        url="https://storage/uploaded",
+        uploaded_at=datetime.datetime.now(_UTC) - pending_for,
+        ready=False,
+    )
+    async with uow_factory() as uow:
+        await uow.images_repository.add_pending(image)
+    return image
+
+
+async def _get_image(
+    uow_factory,
+    image: images_entity.Image,
+) -> get_image.GetImageResponse:
+    return await get_image_handler.GetImageHandler(uow_factory).handle(
+        get_image.GetImage(uploader=UPLOADER, image_id=image.image_id),
+    )
+
+
+async def test_unprocessable_upload_is_failed(uow_factory) -> None:
+    image = await _add_pending(uow_factory, datetime.timedelta())
+    uploaded_filename = filenames.uploaded(UPLOADER, image.image_id)
+    storage = Storage({uploaded_filename: b"not an image"})
+
+    await process_handler.ProcessUploadedImageHandler(
+        image_storage=storage,
+        uow_factory=uow_factory,
+        image_processor=UnsupportedProcessor(),
+    ).handle(process_uploaded_image.ProcessUploadedImage(image_id=image.image_id))
+
+    status = await _get_image(uow_factory, image)
+    assert not status.image.ready
+    assert status.failed
+    assert uploaded_filename not in storage.files
+
+
+async def test_oversized_upload_is_failed_before_download(uow_factory) -> None:
+    image = await _add_pending(uow_factory, datetime.timedelta())
+    uploaded_filename = filenames.uploaded(UPLOADER, image.image_id)
+    storage = Storage({uploaded_filename: b"larger than limit"})
+
+    await process_handler.ProcessUploadedImageHandler(
+        image_storage=storage,
+        uow_factory=uow_factory,
+        image_processor=UnsupportedProcessor(),
+    ).handle(
+        process_uploaded_image.ProcessUploadedImage(
+            image_id=image.image_id,
+            max_bytes=10,
+        ),
+    )
+
+    assert (await _get_image(uow_factory, image)).failed
+    assert storage.downloaded == []
+    assert uploaded_filename not in storage.files
+
+
+async def test_sweep_requeues_stale_and_fails_abandoned(uow_factory) -> None:
+    fresh = await _add_pending(uow_factory, datetime.timedelta(minutes=1))
+    stale = await _add_pending(uow_factory, datetime.timedelta(hours=1))
+    abandoned = await _add_pending(uow_factory, datetime.timedelta(days=2))
+    finished = await _add_pending(uow_factory, datetime.timedelta(minutes=1))
+    async with uow_factory() as uow:
+        await uow.images_repository.mark_ready(
+            finished.image_id,
+            "https://storage/ready",
+            None,
+        )
+    # A crashed worker took the stale image, another one finished an image before ack
+    queue = Queue(processing=[stale.image_id, fresh.image_id, finished.image_id])
+    abandoned_filename = filenames.uploaded(UPLOADER, abandoned.image_id)
+    storage = Storage({abandoned_filename: b"uploaded, never completed"})
+
+    result = await process_handler.SweepPendingImagesHandler(
+        image_storage=storage,
+        uow_factory=uow_factory,
+        uploaded_images_queue=queue,
+    ).handle(
+        process_uploaded_image.SweepPendingImages(
+            stale_after=datetime.timedelta(minutes=10),
+            abandon_after=datetime.timedelta(days=1),
+        ),
+    )
+
+    # Other pending images of the database are swept too
+    assert stale.image_id in queue.queued
+    assert fresh.image_id not in queue.queued and abandoned.image_id not in queue.queued
+    assert result.requeued == len(queue.queued)
+    assert result.acknowledged == 1
+    assert queue.taken == [fresh.image_id]
+    assert (await _get_image(uow_factory, abandoned)).failed
+    assert not (await _get_image(uow_factory, stale)).failed
+    assert abandoned_filename not in storage.files
@@ -0,0 +1,151 @@
+"""
+Images resized on demand are versioned by processing: ETags and cache keys change when
+the image is processed again, unknown and pending images are never served, even as 304.
+"""
+
+import dataclasses
+import uuid
+
+import pytest
+
+from domain.entities import images as images_entity
+from service import exceptions
+from service.handlers.queries.images import (
+    get_resized_image as get_resized_image_handler,
+)
+from service.interfaces import cache
+from service.interfaces.services import image_processor
+from service.interfaces.storages import images_storage
+from service.models.queries.images import get_resized_image
+
+pytestmark = pytest.mark.anyio
+
+UPLOADER = "resized-uploader"
+
+
+class Storage(images_storage.ImagesStorage):
+    def __init__(self) -> None:
+        self.image = b"processed"
+
+    async def upload(self, *images: images_storage.Image) -> list[str]:
+        raise NotImplementedError
+
+    def get_url(self, filename: str) -> str:
+        return f"https://storage/{filename}"
+
+    async def presign_upload(
+        self,
+        filename: str,
+        max_bytes: int,
+    ) -> images_storage.PresignedUpload:
+        raise NotImplementedError
+
+    async def size(self, filename: str) -> int | None:
+        return len(self.image)
+
+    async def download(self, filename: str) -> bytes | None:
+        return self.image
+
+    async def delete(self, filename: str) -> None:
+        raise NotImplementedError
+
+
+class Processor(image_processor.ImageProcessor):
+    async def process(self, image: bytes) -> image_processor.ProcessedImage:
+        raise NotImplementedError
+
+    async def resize(
+        self,
+        image: bytes,
+        width: int | None,
+        image_format: str | None = None,
+    ) -> bytes:
+        return image + f" at {width}".encode()
+
+    async def hashes(self, image: bytes) -> tuple[str, int]:
+        raise NotImplementedError
+
+
+class Cache(cache.ResizedImagesCache):
+    def __init__(self) -> None:
+        self.images: dict[str, bytes] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self.images.get(key)
+
+    async def put(self, key: str, image: bytes) -> None:
+        self.images[key] = image
+
+
+def _handler(
+    uow_factory,
+    storage: Storage,
+) -> get_resized_image_handler.GetResizedImageHandler:
+    return get_resized_image_handler.GetResizedImageHandler(
+        uow_factory=uow_factory,
+        image_storage=storage,
+        image_processor=Processor(),
+        resized_images_cache=Cache(),
+    )
+
+
+async def _add(uow_factory) -> images_entity.Image:
+    image = images_entity.Image(
+        image_id=uuid.uuid4(),
+        uploader=UPLOADER,
+        url="https://storage/processed.jpg",
+    )
+    async with uow_factory() as uow:
+        await uow.images_repository.add(image)
+    return image
+
+
+async def test_reprocessed_image_gets_new_etag_and_bytes(uow_factory) -> None:
+    image = await _add(uow_factory)
+    storage = Storage()
+    handler = _handler(uow_factory, storage)
+    request = get_resized_image.GetResizedImage(image_id=image.image_id, width=320)
+    first = await handler.handle(request)
+
+    not_modified = await handler.handle(
+        dataclasses.replace(request, if_none_match=first.etag),
+    )
+    storage.image = b"reprocessed"
+    async with uow_factory() as uow:
+        await uow.images_repository.update_processed(image)
+    reprocessed = await handler.handle(
+        dataclasses.replace(request, if_none_match=first.etag),
+    )
+
+    assert first.image == b"processed at 320"
+    assert not_modified.image is None and not_modified.etag == first.etag
+    assert reprocessed.image == b"reprocessed at 320"
+    assert reprocessed.etag != first.etag
+
+
+@pytest.mark.parametrize("pending", [False, True], ids=["unknown", "pending"])
+async def test_not_ready_image_is_not_found_despite_etag(
+    uow_factory,
+    pending: bool,
+) -> None:
+    handler = _handler(uow_factory, Storage())
+    image = await _add(uow_factory)
+    served = await handler.handle(
+        get_resized_image.GetResizedImage(image_id=image.image_id),
+    )
+    image_id = uuid.uuid4()
+    if pending:
+        image_id = image.image_id
+        async with uow_factory() as uow:
+            await uow.images_repository.conn.execute(
+                "UPDATE images SET status = 'pending' WHERE image_id = $1",
+                image_id,
+            )
+
+    with pytest.raises(exceptions.ImageNotFound):
+        await handler.handle(
+            get_resized_image.GetResizedImage(
+                image_id=image_id,
+                if_none_match=served.etag,
+            ),
+        )
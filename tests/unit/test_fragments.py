@@ -0,0 +1,141 @@
+"""
+Feeds assembled from cached fragments must be byte for byte the same as feeds
+serialized from entities.
+"""
+
+import datetime
+import uuid
+
+import asyncpg.pgproto.pgproto
+import pytest
+
+from domain.entities import feed as feed_entity, images as images_entity
+from presentation.api import serializers
+from service.helpers.feeds import fragments
+
+_UTC = datetime.timezone.utc
+
+
+def _feed(
+    feed_id: uuid.UUID,
+    text: str,
+    updated_at: datetime.datetime | None,
+) -> feed_entity.Feed:
+    variant = images_entity.ImageVariant(width=320, url="https://storage/a_320.jpg")
+    webp = images_entity.ImageEncoding(
+        format="webp",
+        url="https://storage/a.webp",
+        variants=(
+            images_entity.ImageVariant(width=320, url="https://storage/a_320.webp"),
+        ),
+    )
+    return feed_entity.Feed(
+        feed_id=feed_id,
+        # Looks like the keys fragments are split at
+        account_id='account ,"created_at": ,"images_count":1',
+        has_followed=True,
+        has_liked=False,
+        text=text,
+        created_at=datetime.datetime(2024, 1, 2, 3, 4, 5, 120, tzinfo=_UTC),
+        updated_at=updated_at,
+        likes_count=12,
+        views_count=345,
+        images=[
+            images_entity.Image(
+                image_id=uuid.UUID("6b0f5c3e-1a44-4d70-9d0e-3a7f1f0b6c11"),
+                uploader="account",
+                url="https://storage/a.jpg",
+                blurhash=None,
+                order=0,
+                variants=(variant,),
+                encodings=(webp,),
+            ),
+            images_entity.Image(
+                image_id=uuid.UUID("0c2f4e0a-7b1d-4e6f-8a3c-5d9e2b1f4a77"),
+                uploader="account",
+                url="https://storage/b.jpg",
+                blurhash="LEHV6nWB2yk8pyo0adR*.7kCMdnj",
+                order=1,
+                ready=False,
+            ),
+        ],
+    )
+
+
+FEEDS = [
+    _feed(
+        uuid.UUID("3f1d2c4b-5a6e-4f70-8b9c-0d1e2f3a4b5c"),
+        'text with "images_count": 5 and ,"created_at": inside',
+        datetime.datetime(2024, 1, 3, tzinfo=_UTC),
+    ),
+    # asyncpg returns UUIDs as its own subclass
+    _feed(
+        asyncpg.pgproto.pgproto.UUID("9a8b7c6d-5e4f-4a3b-9c2d-1e0f9a8b7c6d"),
+        "",
+        None,
+    ),
+]
+
+
+def _state(feed: feed_entity.Feed) -> feed_entity.FeedState:
+    return feed_entity.FeedState(
+        feed_id=feed.feed_id,
+        updated_at=feed.updated_at,
+        has_followed=feed.has_followed,
+        has_liked=feed.has_liked,
+        likes_count=feed.likes_count,
+        views_count=feed.views_count,
+    )
+
+
+def _dumps(content: object) -> bytes:
+    return serializers.ORJSONResponse(content).body
+
+
+@pytest.mark.parametrize("image_format", [None, "webp"])
+def test_spliced_feeds_equal_entities_serialization(image_format: str | None) -> None:
+    spliced = [
+        fragments.splice(fragments.render(feed, image_format), _state(feed))
+        for feed in FEEDS
+    ]
+
+    expected = _dumps(
+        serializers.envelope(
+            serializers.feeds(
+                [serializers.feed(feed, image_format=image_format) for feed in FEEDS],
+            ),
+        ),
+    )
+    actual = _dumps(
+        serializers.envelope(serializers.feeds(serializers.feed_fragments(spliced))),
+    )
+    assert actual == expected
+
+
+def test_fragment_spliced_with_another_state() -> None:
+    feed = FEEDS[0]
+    state = feed_entity.FeedState(
+        feed_id=feed.feed_id,
+        has_followed=False,
+        has_liked=True,
+        likes_count=0,
+        views_count=1_000_000,
+    )
+    spliced = fragments.splice(fragments.render(feed), state)
+
+    expected = serializers.feed(feed)
+    expected.update(
+        has_followed=False,
+        has_liked=True,
+        likes_count=0,
+        views_count=1_000_000,
+    )
+    assert spliced == _dumps(expected)
+
+
+def test_not_ready_image_has_no_urls() -> None:
+    image = fragments.ordered_image(FEEDS[0].images[1], "webp")["image"]
+
+    assert image["url"] is None
+    assert image["variants"] == []
+    assert image["ready"] is False
@@ -0,0 +1,38 @@
+"""
+A pool whose worker process died is replaced, images after it are processed.
+"""
+
+import concurrent.futures.process
+import os
+import typing
+
+import pytest
+
+from infrastructure.services import image_processor
+
+pytestmark = pytest.mark.anyio
+
+
+def _double(value: int) -> int:
+    return 2 * value
+
+
+@pytest.fixture
+def processor() -> typing.Iterator[image_processor.ProcessPoolImageProcessor]:
+    image_processor.start_executor()
+    try:
+        yield image_processor.ProcessPoolImageProcessor()
+    finally:
+        image_processor.shutdown_executor()
+
+
+async def test_broken_pool_is_replaced(
+    processor: image_processor.ProcessPoolImageProcessor,
+) -> None:
+    broken_pools = image_processor.image_processing_metrics.broken_pools
+
+    with pytest.raises(concurrent.futures.process.BrokenProcessPool):
+        await processor._run(os._exit, 1)
+
+    assert await processor._run(_double, 21) == 42
+    assert image_processor.image_processing_metrics.broken_pools == broken_pools + 1
@@ -0,0 +1,51 @@
+"""
+Stripped JPEG keeps the compressed image as is and drops metadata and trailers after EOI.
+"""
+
+import io
+
+import numpy as np
+import PIL.Image
+import pytest
+
+from service.helpers.image import jpeg
+
+# Secondary image of MPF or Motion Photo video appended after EOI, ending in FFD9 itself
+TRAILER = b"MPF\x00\xff\xd8\xff\xe1secondary image\xff\xd9"
+
+
+def _jpeg(**options: object) -> bytes:
+    rng = np.random.default_rng(0)
+    image = PIL.Image.fromarray(rng.integers(0, 256, (120, 160, 3), dtype=np.uint8))
+    encoded = io.BytesIO()
+    exif = PIL.Image.Exif()
+    exif[0x010F] = "camera"
+    image.save(
+        encoded,
+        format="JPEG",
+        exif=exif.tobytes(),
+        comment=b"comment",
+        **options,
+    )
+    return encoded.getvalue()
+
+
+def _pixels(data: bytes) -> np.ndarray:
+    with PIL.Image.open(io.BytesIO(data)) as image:
+        return np.asarray(image)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"progressive": True}, {"restart_marker_blocks": 4}],
+    ids=["baseline", "progressive", "restart_markers"],
+)
+def test_strip_drops_metadata_and_trailer(options: dict[str, object]) -> None:
+    original = _jpeg(**options)
+
+    stripped = jpeg.strip_metadata(original + TRAILER)
+
+    assert stripped == jpeg.strip_metadata(original)
+    assert stripped.endswith(b"\xff\xd9") and TRAILER not in stripped
+    assert b"Exif" not in stripped and b"comment" not in stripped
+    assert np.array_equal(_pixels(stripped), _pixels(original))
@@ -0,0 +1,93 @@
+"""
+Fast path mediator reuses query handlers only within one container generation
+and keeps the configured middlewares.
+"""
+
+import dataclasses
+import itertools
+import typing
+
+import cqrs
+import di
+import pytest
+from cqrs.middlewares import base as middlewares
+from cqrs.requests import map as request_map
+
+from infrastructure import dependencies
+from presentation import mediator
+
+pytestmark = pytest.mark.anyio
+
+
+@dataclasses.dataclass
+class Query(cqrs.DCRequest):
+    value: int
+
+
+@dataclasses.dataclass
+class Answer(cqrs.DCResponse):
+    value: int
+    handler_number: int
+
+
+class QueryHandler(cqrs.RequestHandler[Query, Answer]):
+    created = itertools.count()
+
+    def __init__(self) -> None:
+        self.number = next(self.created)
+
+    @property
+    def events(self) -> list:
+        return []
+
+    async def handle(self, request: Query) -> Answer:
+        return Answer(value=request.value, handler_number=self.number)
+
+
+class RecordingMiddleware(middlewares.Middleware):
+    def __init__(self) -> None:
+        self.requests: list[Query] = []
+
+    async def __call__(self, request: cqrs.IRequest, handle: middlewares.HandleType):
+        self.requests.append(typing.cast(Query, request))
+        return await handle(request)
+
+
+def _mediator(
+    container: dependencies.CompiledContainer,
+    middleware: RecordingMiddleware,
+) -> mediator.QueriesFastPathMediator:
+    queries = request_map.RequestMap()
+    queries.bind(Query, QueryHandler)
+    chain = middlewares.MiddlewareChain()
+    chain.add(middleware)
+    return mediator.QueriesFastPathMediator(
+        request_map=queries,
+        queries_map=queries,
+        container=container,
+        middleware_chain=chain,
+    )
+
+
+async def test_handlers_reused_within_container_generation() -> None:
+    container = dependencies.CompiledContainer(di.Container())
+    fast_path = _mediator(container, RecordingMiddleware())
+
+    first = await fast_path.send(Query(value=1))
+    second = await fast_path.send(Query(value=2))
+    container.close()
+    after_close = await fast_path.send(Query(value=3))
+
+    assert (first.value, second.value, after_close.value) == (1, 2, 3)
+    assert first.handler_number == second.handler_number
+    assert after_close.handler_number != first.handler_number
+
+
+async def test_middlewares_applied() -> None:
+    middleware = RecordingMiddleware()
+    fast_path = _mediator(dependencies.CompiledContainer(di.Container()), middleware)
+
+    await fast_path.send(Query(value=1))
+    await fast_path.send(Query(value=2))
+
+    assert [request.value for request in middleware.requests] == [1, 2]
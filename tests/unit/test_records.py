@@ -0,0 +1,82 @@
+"""
+Record-backed read entities must expose every field of the entities they replace.
+"""
+
+import dataclasses
+import datetime
+import uuid
+
+import pytest
+
+from domain.entities import feed as feed_entity, images as images_entity
+from infrastructure.persistent.postgres import columns, records
+from infrastructure.persistent.postgres.repositories import feeds as feeds_repository
+
+_UTC = datetime.timezone.utc
+
+# Columns of feeds repository image selects
+IMAGE_ROW = (
+    uuid.UUID("6b0f5c3e-1a44-4d70-9d0e-3a7f1f0b6c11"),
+    uuid.UUID("3f1d2c4b-5a6e-4f70-8b9c-0d1e2f3a4b5c"),
+    "account",
+    "https://storage/a.jpg",
+    "LEHV6nWB2yk8pyo0adR*.7kCMdnj",
+    datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=_UTC),
+    2,
+    columns.dump_variants(
+        (images_entity.ImageVariant(width=320, url="https://storage/a_320.jpg"),),
+    ),
+    columns.dump_encodings(
+        (images_entity.ImageEncoding(format="webp", url="https://storage/a.webp"),),
+    ),
+    False,
+)
+
+# Columns of feeds repository feed selects
+FEED_ROW = (
+    uuid.UUID("3f1d2c4b-5a6e-4f70-8b9c-0d1e2f3a4b5c"),
+    "account",
+    datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=_UTC),
+    None,
+    "text",
+    3,
+    4,
+    True,
+    False,
+)
+
+
+def _fields(entity: images_entity.Image | feed_entity.Feed) -> dict:
+    return {
+        field.name: getattr(entity, field.name) for field in dataclasses.fields(entity)
+    }
+
+
+def test_record_image_has_every_image_field() -> None:
+    record = records.RecordImage(IMAGE_ROW)  # type: ignore[arg-type]
+
+    assert _fields(record) == _fields(feeds_repository._row_to_image(IMAGE_ROW))
+
+
+@pytest.mark.parametrize("copy", ["bound_to_feed", "repr"])
+def test_record_image_copies(copy: str) -> None:
+    row = (IMAGE_ROW[0], None, *IMAGE_ROW[2:])
+    record = records.RecordImage(row)  # type: ignore[arg-type]
+    image = feeds_repository._row_to_image(row)
+
+    if copy == "repr":
+        assert repr(record).removeprefix("Record") == repr(image)
+    else:
+        feed_id = uuid.uuid4()
+        assert record.bound_to_feed(feed_id) == image.bound_to_feed(feed_id)
+
+
+def test_record_feed_has_every_feed_field() -> None:
+    images: list[images_entity.Image] = [records.RecordImage(IMAGE_ROW)]  # type: ignore[arg-type]
+    record = records.RecordFeed(FEED_ROW, images)  # type: ignore[arg-type]
+
+    expected = _fields(feeds_repository._row_to_feed(FEED_ROW, images))
+    assert _fields(record) == expected
+    assert set(expected) == {
+        field.name for field in dataclasses.fields(feed_entity.Feed)
+    }
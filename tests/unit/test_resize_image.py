@@ -0,0 +1,40 @@
+"""
+Images resized on demand are exactly as wide as requested, full size only when not wider.
+"""
+
+import io
+
+import PIL.Image
+import pytest
+
+from service.helpers.image import process
+
+
+def _jpeg(width: int, height: int) -> bytes:
+    encoded = io.BytesIO()
+    PIL.Image.linear_gradient("L").resize((width, height)).convert("RGB").save(
+        encoded,
+        format="JPEG",
+    )
+    return encoded.getvalue()
+
+
+def _size(data: bytes) -> tuple[int, int]:
+    with PIL.Image.open(io.BytesIO(data)) as image:
+        return image.size
+
+
+@pytest.mark.parametrize("width", [320, 640, 1000])
+@pytest.mark.parametrize("image_format", [None, "WEBP"])
+def test_resize_image_to_requested_width(width: int, image_format: str | None) -> None:
+    resized = process.resize_image(_jpeg(2560, 1280), width, image_format)
+
+    assert _size(resized) == (width, width // 2)
+
+
+@pytest.mark.parametrize("width", [None, 2560, 4000])
+def test_resize_image_returns_original_when_not_wider(width: int | None) -> None:
+    image = _jpeg(2560, 1280)
+
+    assert process.resize_image(image, width) == image
+    assert _size(process.resize_image(image, width, "WEBP")) == (2560, 1280)
@@ -0,0 +1,195 @@
+"""
+A failed batch upload cancels processing of the other images and deletes the files
+it has stored, except files of the same content another upload has committed.
+"""
+
+import asyncio
+import typing
+
+import pytest
+
+from domain.entities import images as images_entity
+from service.handlers.commands.images import upload_images as upload_images_handler
+from service.helpers.image import dedup
+from service.interfaces import unit_of_work
+from service.interfaces.services import image_processor
+from service.interfaces.storages import images_storage
+from service.models.commands.images import upload_images
+
+pytestmark = pytest.mark.anyio
+
+
+class ProcessingFailed(Exception):
+    pass
+
+
+class Processor(image_processor.ImageProcessor):
+    def __init__(self, failing: bytes | None = None, slow: bytes | None = None) -> None:
+        self.failing = failing
+        self.slow = slow
+        self.processing = 0
+        self.max_processing = 0
+        self.cancelled = 0
+
+    async def process(self, image: bytes) -> image_processor.ProcessedImage:
+        self.processing += 1
+        self.max_processing = max(self.max_processing, self.processing)
+        try:
+            if image == self.failing:
+                await asyncio.sleep(0.01)
+                raise ProcessingFailed
+            await asyncio.sleep(1 if image == self.slow else 0)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.processing -= 1
+        return image_processor.ProcessedImage(
+            image=image,
+            blurhash="blurhash",
+            variants={320: image},
+        )
+
+    async def resize(
+        self,
+        image: bytes,
+        width: int | None,
+        image_format: str | None = None,
+    ) -> bytes:
+        raise NotImplementedError
+
+    async def hashes(self, image: bytes) -> tuple[str, int]:
+        raise NotImplementedError
+
+
+class Storage(images_storage.ImagesStorage):
+    def __init__(self) -> None:
+        self.files: dict[str, bytes] = {}
+
+    async def upload(self, *images: images_storage.Image) -> list[str]:
+        for image in images:
+            self.files[image.filename] = image.image
+        return [self.get_url(image.filename) for image in images]
+
+    def get_url(self, filename: str) -> str:
+        return f"https://storage/{filename}"
+
+    async def presign_upload(
+        self,
+        filename: str,
+        max_bytes: int,
+    ) -> images_storage.PresignedUpload:
+        raise NotImplementedError
+
+    async def size(self, filename: str) -> int | None:
+        file = self.files.get(filename)
+        return None if file is None else len(file)
+
+    async def download(self, filename: str) -> bytes | None:
+        return self.files.get(filename)
+
+    async def delete(self, filename: str) -> None:
+        self.files.pop(filename, None)
+
+
+class Repository:
+    def __init__(self) -> None:
+        self.images: list[images_entity.Image] = []
+        # Committed by another upload right before add_many fails
+        self.committed_before_failure: list[images_entity.Image] | None = None
+
+    async def get_by_content_hashes(
+        self,
+        *content_hash: str,
+    ) -> dict[str, images_entity.Image]:
+        return {
+            image.content_hash: image
+            for image in self.images
+            if image.content_hash in content_hash
+        }
+
+    async def add_many(self, *image: images_entity.Image) -> None:
+        if self.committed_before_failure is not None:
+            self.images.extend(self.committed_before_failure)
+            raise ProcessingFailed
+        self.images.extend(image)
+
+
+class UoW:
+    def __init__(self, repository: Repository):
+        self.images_repository = repository
+
+    async def __aenter__(self) -> typing.Self:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+    async def commit(self) -> None:
+        pass
+
+
+def _handler(
+    processor: Processor,
+    storage: Storage,
+    repository: Repository,
+) -> upload_images_handler.UploadImagesHandler:
+    return upload_images_handler.UploadImagesHandler(
+        image_storage=storage,
+        uow_factory=typing.cast(unit_of_work.UoWFactory, lambda: UoW(repository)),
+        image_processor=processor,
+    )
+
+
+async def test_uploads_batch_at_most_concurrency_at_once() -> None:
+    processor, storage, repository = Processor(), Storage(), Repository()
+    images = [bytes([index]) * 10 for index in range(10)] + [bytes([0]) * 10]
+
+    response = await _handler(processor, storage, repository).handle(
+        upload_images.UploadImages(uploader="account", images=images, concurrency=3),
+    )
+
+    assert processor.max_processing == 3
+    assert [image.content_hash for image in response.images] == list(
+        map(dedup.content_hash, images),
+    )
+    # Image and its variant of every distinct content
+    assert len(storage.files) == 2 * 10
+    assert len(repository.images) == 11
+
+
+async def test_failed_upload_cancels_others_and_deletes_stored_files() -> None:
+    storage, repository = Storage(), Repository()
+    await _handler(Processor(), storage, repository).handle(
+        upload_images.UploadImages(uploader="other", images=[b"committed"]),
+    )
+    committed_files = dict(storage.files)
+    processor = Processor(failing=b"failing", slow=b"slow")
+
+    with pytest.raises(ProcessingFailed):
+        await _handler(processor, storage, repository).handle(
+            upload_images.UploadImages(
+                uploader="account",
+                images=[b"stored", b"slow", b"failing"],
+            ),
+        )
+
+    assert processor.cancelled == 1
+    assert storage.files == committed_files
+    assert len(repository.images) == 1
+
+
+async def test_failed_commit_keeps_files_another_upload_committed() -> None:
+    storage, repository = Storage(), Repository()
+    other = await _handler(Processor(), storage, Repository()).handle(
+        upload_images.UploadImages(uploader="other", images=[b"same"]),
+    )
+    committed_files = dict(storage.files)
+    repository.committed_before_failure = other.images
+
+    with pytest.raises(ProcessingFailed):
+        await _handler(Processor(), storage, repository).handle(
+            upload_images.UploadImages(uploader="account", images=[b"new", b"same"]),
+        )
+
+    assert storage.files == committed_files
@@ -0,0 +1,51 @@
+"""
+Width variants cover every width below the image, also the ones DCT scaling decodes exactly.
+"""
+
+import io
+
+import PIL.Image
+import pytest
+
+from service.helpers.image import variants
+
+WIDTHS = (320, 640, 1080)
+
+
+def _jpeg(width: int, height: int) -> bytes:
+    encoded = io.BytesIO()
+    PIL.Image.linear_gradient("L").resize((width, height)).convert("RGB").save(
+        encoded,
+        format="JPEG",
+    )
+    return encoded.getvalue()
+
+
+@pytest.mark.parametrize(
+    ("width", "widths", "expected"),
+    [
+        (2160, WIDTHS, WIDTHS),
+        (2560, (320,), (320,)),
+        (1280, WIDTHS, WIDTHS),
+        (1080, WIDTHS, (320, 640)),
+    ],
+    ids=["half_is_widest", "eighth_is_only", "wider", "as_wide"],
+)
+def test_resize_jpeg_keeps_widths_equal_to_scaled_image(
+    width: int,
+    widths: tuple[int, ...],
+    expected: tuple[int, ...],
+) -> None:
+    resized = variants.resize_jpeg(_jpeg(width, width // 2), widths)
+
+    assert tuple(resized) == expected
+    for variant_width, variant in resized.items():
+        assert variant.size == (variant_width, variant_width // 2)
+
+
+def test_resize_keeps_widths_below_image() -> None:
+    image = PIL.Image.new("RGB", (1080, 540))
+
+    resized = variants.resize(image, (*WIDTHS, 2048))
+
+    assert tuple(resized) == (320, 640)